@@ -0,0 +1,104 @@
+# catalog.py
+
+
+def _is_blank(text):
+    return not text or text.lower() == "nan"
+
+
+def _connections(value):
+    """Connection list of a cell, split the way the widgets expect ("nan" for an empty cell)."""
+    return str(value).split(",")
+
+
+def _listing(df):
+    """(Tool Name, Category) of every tool, once each, in database order."""
+    return df[["Tool Name", "Category"]].drop_duplicates()
+
+
+class Catalog:
+    """
+    Tool and PCE databases indexed by tool name.
+
+    Built once from the database frames in a single pass over the rows;
+    after that, everything a tool widget or a drop-down needs is a dict
+    lookup. The returned structures are shared, so callers must not modify
+    them.
+    """
+
+    __slots__ = ("tool_listing", "pce_listing", "tools", "pce", "tool_categories", "pce_categories")
+
+    def __init__(self, tool_df, pce_df):
+        self.tool_listing = _listing(tool_df)
+        self.pce_listing = _listing(pce_df)
+        self.tool_categories = self.tool_listing["Category"].unique().tolist()
+        self.pce_categories = self.pce_listing["Category"].unique().tolist()
+        self.tools = self._index_tools(tool_df)
+        self.pce = self._index_pce(pce_df)
+
+    @staticmethod
+    def _index_tools(df):
+        """{tool name: {"Nominal Sizes": [...], "Sizes": {size: dimensions and connections}}}"""
+        tools = {}
+        for row in df.to_dict("records"):
+            info = tools.setdefault(row["Tool Name"], {"Nominal Sizes": [], "Sizes": {}})
+            size = row["Nominal Size"]
+            if size not in info["Sizes"]:
+                info["Nominal Sizes"].append(size)
+            info["Sizes"][size] = {
+                "OD": row["OD (Inches)"],
+                "Length": row["Length (ft)"],
+                "Weight": row["Weight (lbs)"],
+                "Top Connections": _connections(row["Top Connection"]),
+                "Lower Connections": _connections(row["Lower Connection"]),
+            }
+        return tools
+
+    @staticmethod
+    def _index_pce(df):
+        """
+        {tool name: {"brands", "sizes_by_brand", "services_by_brand_size",
+        "records"}}, with records keyed by (brand, size, service).
+        """
+        grouped = {}
+        for row in df.to_dict("records"):
+            brand = str(row.get("Brand", ""))
+            size = str(row.get("Nominal Size", ""))
+            service = str(row.get("Service", ""))
+            entry = grouped.setdefault(row["Tool Name"], {"services": {}, "records": {}})
+            entry["services"].setdefault(brand, {}).setdefault(size, set()).add(service)
+            entry["records"][(brand, size, service)] = {
+                "ID": row.get("Bore ID", 0),
+                "OD": row.get("OD (Inches)", 0),
+                "Length": row.get("Length (ft)", 0),
+                "Weight": row.get("Weight (kg)", 0),
+                "Working Pressure": row.get("Working Pressure", 0),
+                "Top Connections": _connections(row.get("Top Connection", "")),
+                "Lower Connections": _connections(row.get("Lower Connection", "")),
+            }
+
+        pce = {}
+        for name, entry in grouped.items():
+            brands = sorted(b for b in entry["services"] if not _is_blank(b))
+            sizes_by_brand = {
+                b: sorted(s for s in entry["services"][b] if not _is_blank(s)) for b in brands
+            }
+            services_by_brand_size = {
+                b: {s: sorted(x for x in entry["services"][b][s] if not _is_blank(x)) for s in sizes_by_brand[b]}
+                for b in brands
+            }
+            pce[name] = {
+                "brands": brands,
+                "sizes_by_brand": sizes_by_brand,
+                "services_by_brand_size": services_by_brand_size,
+                "records": entry["records"],
+            }
+        return pce
+
+    def tool(self, tool_name):
+        """Sizes and dimensions of a tool, or None if it is not in the database."""
+        return self.tools.get(tool_name)
+
+    def pce_tool(self, tool_name):
+        """Brands, sizes, services and records of a PCE item, or None if it is not in the database."""
+        return self.pce.get(tool_name)
+
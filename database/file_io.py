@@ -1,9 +1,9 @@
-import json
 import os
 
 from PyQt6.QtWidgets import QFileDialog
 
 from features.editors.logic_image_processing import expand_and_center_images
+from features.toolstring.bha_file import read_bha, write_bha
 from ui.components.toolstring_editor.tool_widget import ToolWidget
 from ui.windows.ui_messagebox_window import MessageBoxWindow
 
@@ -24,8 +24,7 @@ def save_configuration(main_window):
 
         main_window.current_file_name = file_name
 
-        drop_zone = main_window.drop_zone
-        config = {
+        details = {
             "client_name": main_window.client_name.text(),
             "location": main_window.location.text(),
             "well_no": main_window.well_no.text(),
@@ -33,22 +32,8 @@ def save_configuration(main_window):
             "well_type": main_window.well_type.currentText(),
             "operation_details": main_window.operation_details.text(),
             "comments": main_window.comments.toPlainText(),
-            "tools": []
         }
-
-        for tool in drop_zone.tool_widgets:
-            config["tools"].append({
-                "name": tool.tool_name,
-                "nominal_size": tool.nominal_size_selector.currentText(),
-                "od": tool.od_label.text(),
-                "length": tool.length_label.text(),
-                "weight": tool.weight_label.text(),
-                "top_connection": tool.top_connection_label.text(),
-                "lower_connection": tool.lower_connection_label.currentText()
-            })
-
-        with open(file_name, "w") as f:
-            json.dump(config, f, indent=4)
+        write_bha(file_name, details, main_window.drop_zone.tool_string)
 
         main_window.setWindowTitle(f"Deleum Tool String Editor - {os.path.basename(file_name)}")
         MessageBoxWindow.message_simple(main_window, "Save Successful", "Tool string saved successfully!", "save_black")
@@ -69,36 +54,30 @@ def load_configuration(main_window):
         drop_zone = main_window.drop_zone
         summary_widget = main_window.summary_widget
 
-        with open(file_name, "r") as f:
-            config = json.load(f)
+        details, tool_string = read_bha(file_name)
 
         # Restore fields
-        main_window.client_name.setText(config.get("client_name", ""))
-        main_window.location.setText(config.get("location", ""))
-        main_window.well_no.setText(config.get("well_no", ""))
-        main_window.max_angle.setText(config.get("max_angle", ""))
-        main_window.well_type.setCurrentText(config.get("well_type", "Oil Producer"))
-        main_window.operation_details.setText(config.get("operation_details", ""))
-        main_window.comments.setPlainText(config.get("comments", ""))
+        main_window.client_name.setText(details["client_name"])
+        main_window.location.setText(details["location"])
+        main_window.well_no.setText(details["well_no"])
+        main_window.max_angle.setText(details["max_angle"])
+        main_window.well_type.setCurrentText(details["well_type"] or "Oil Producer")
+        main_window.operation_details.setText(details["operation_details"])
+        main_window.comments.setPlainText(details["comments"])
 
         drop_zone.clear_tools()
 
-        for tool_data in config.get("tools", []):
-            new_tool = ToolWidget(tool_data["name"], drop_zone, summary_widget)
-            new_tool.nominal_size_selector.setCurrentText(tool_data["nominal_size"])
-            new_tool.od_label.setText(tool_data["od"])
-            new_tool.length_label.setText(tool_data["length"])
-            new_tool.weight_label.setText(tool_data["weight"])
-            new_tool.top_connection_label.setText(tool_data["top_connection"])
-            new_tool.lower_connection_label.setCurrentText(tool_data["lower_connection"])
-
-            drop_zone.tool_widgets.append(new_tool)
-            drop_zone.layout.addWidget(new_tool)
+        for entry in tool_string:
+            new_tool = ToolWidget(entry.name, drop_zone, summary_widget)
+            if not new_tool.tool_data:
+                new_tool.deleteLater()
+                continue
+            new_tool.restore(entry)
+            drop_zone.attach_tool(new_tool)
 
         expand_and_center_images(drop_zone.tool_widgets, drop_zone.diagram_width)
         drop_zone.update()
         drop_zone.repaint()
         drop_zone.update_placeholder()
-        summary_widget.update_summary()
 
         main_window.setWindowTitle(f"Deleum Tool String Editor - {os.path.basename(file_name)}")
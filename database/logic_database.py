@@ -1,18 +1,163 @@
-import pandas as pd
 import os
-
-from utils.path_finder import get_path, get_resource_path  # ✅ Import helper function
+import pickle
+import sqlite3
+import threading
+
+from database.catalog import Catalog
+from database.search_index import ToolSearchIndex
+from database.tool_store import DATABASE_PATH_VARIABLE, file_stamp, get_tool_store
+from utils.path_finder import get_cache_dir, get_path, get_resource_path  # ✅ Import helper function
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem
 
 csv_files = {"Tool": "tool_database.csv",
              "PCE": "pce_database.csv"}
-data_df = {}
+# Columns of an empty database, used when a file is missing
+csv_columns = {
+    "Tool": ["Category", "Tool Name", "Nominal Size", "OD (Inches)", "Top Connection", "Lower Connection",
+             "Length (ft)", "Weight (lbs)", "Picture", "Verified by", "Description"],
+    "PCE": ["Category", "Brand", "Tool Name", "Nominal Size", "Bore ID", "Service", "Working Pressure",
+            "Top Connection", "Lower Connection", "Length (ft)", "Weight (kg)", "Picture", "Verified by",
+            "Description"],
+}
+data_df = {}  # Loaded on first use
+_catalog = None
+_search_indexes = {}
+_lock = threading.RLock()
+_warm_up_thread = None
+
+
+def _snapshot_path(data_type):
+    return os.path.join(get_cache_dir("database"), f"{data_type.lower()}_database.pkl")
+
+
+def _sync_store(store, data_type):
+    """
+    Import the bundled CSV into the store when that database is empty, or,
+    for a store of the user's own, when the CSV has changed since. A
+    shared store (WIREHUB_DATABASE) is never overwritten once filled.
+    """
+    csv_path = get_resource_path(csv_files[data_type])
+    if not os.path.exists(csv_path):
+        return
+    shared = bool(os.environ.get(DATABASE_PATH_VARIABLE))
+    if store.count(data_type) == 0 or (not shared and store.source_stamp(data_type) != file_stamp(csv_path)):
+        rows = store.import_csv(data_type, csv_path)
+        print(f"Imported {rows} rows into the {data_type} database")
+
+
+def _read_database(data_type):
+    """One database as a DataFrame: from the SQLite store, or straight from the CSV if the store is unavailable."""
+    store = get_tool_store()
+    if store is not None:
+        try:
+            _sync_store(store, data_type)
+            return store.frame(data_type)
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ Tool database unavailable, reading the CSV instead: {e}")
+    return _read_csv(data_type)
+
+
+def _read_csv(data_type):
+    """
+    One database as a DataFrame. A pickled snapshot of the parsed CSV is
+    kept in the user cache and used until the CSV (or pandas) changes. A
+    missing or unreadable file gives an empty database instead of an error.
+    """
+    import pandas as pd
 
-for data_type in ["Tool", "PCE"]:
     csv_path = get_resource_path(csv_files[data_type])
     if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"Database file not found: {csv_path}")
-    data_df[data_type] = pd.read_csv(csv_path)
+        print(f"⚠️ Database file not found: {csv_path}")
+        return pd.DataFrame(columns=csv_columns[data_type])
+
+    stat = os.stat(csv_path)
+    source = (csv_path, stat.st_mtime_ns, stat.st_size, pd.__version__)
+    snapshot_path = _snapshot_path(data_type)
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+        if snapshot["source"] == source:
+            return snapshot["frame"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Ignoring database snapshot {snapshot_path}: {e}")
+
+    try:
+        frame = pd.read_csv(csv_path)
+    except Exception as e:
+        print(f"⚠️ Could not read database file {csv_path}: {e}")
+        return pd.DataFrame(columns=csv_columns[data_type])
+
+    try:
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"source": source, "frame": frame}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+    except OSError as e:
+        print(f"⚠️ Could not write database snapshot: {e}")
+    return frame
+
+
+def get_database(data_type):
+    """The "Tool" or "PCE" database, loaded on first use."""
+    with _lock:
+        if data_type not in data_df:
+            data_df[data_type] = _read_database(data_type)
+        return data_df[data_type]
+
+
+def list_tools(data_type, category=None, search=None):
+    """
+    (tool name, category, description) of every tool in `category` (None
+    for all) whose name contains `search`, once each, in database order.
+    """
+    store = get_tool_store()
+    if store is not None:
+        try:
+            get_database(data_type)  # Makes sure the store has been filled
+            return store.tool_list(data_type, category, search or None)
+        except sqlite3.Error as e:
+            print(f"⚠️ Tool database query failed: {e}")
+
+    frame = get_database(data_type)
+    if category is not None:
+        frame = frame[frame["Category"] == category]
+    if search:
+        frame = frame[frame["Tool Name"].str.contains(search, case=False, na=False, regex=False)]
+    tools = []
+    for tool_name, rows in frame.groupby("Tool Name", sort=False):
+        descriptions = rows["Description"].dropna()
+        tools.append((tool_name, rows["Category"].iloc[0], descriptions.iloc[0] if not descriptions.empty else None))
+    return tools
+
+
+def get_search_index(data_type):
+    """Search index over every tool of the "Tool" or "PCE" database, built on first use."""
+    with _lock:
+        if data_type not in _search_indexes:
+            _search_indexes[data_type] = ToolSearchIndex(list_tools(data_type))
+        return _search_indexes[data_type]
+
+
+def warm_up():
+    """Load both databases and build the catalog in a background thread (e.g. while the splash is shown)."""
+    global _warm_up_thread
+    with _lock:
+        if _catalog is not None or (_warm_up_thread is not None and _warm_up_thread.is_alive()):
+            return _warm_up_thread
+        _warm_up_thread = threading.Thread(target=get_catalog, name="database-warm-up", daemon=True)
+        _warm_up_thread.start()
+        return _warm_up_thread
+
+
+def get_catalog():
+    """The tool and PCE catalog, indexed once on first use."""
+    global _catalog
+    with _lock:
+        if _catalog is None:
+            _catalog = Catalog(get_database("Tool"), get_database("PCE"))
+        return _catalog
 
 
 def get_tool_data(tool_name=None):
@@ -23,35 +168,13 @@ def get_tool_data(tool_name=None):
     - If `tool_name` is **provided**, returns detailed info for that specific tool.
     """
     if tool_name is None:
-        return data_df["Tool"][["Tool Name", "Category"]].drop_duplicates()  # ✅ Returns all tools
-
-    filtered_tools = data_df["Tool"][data_df["Tool"]["Tool Name"] == tool_name]
-
-    if filtered_tools.empty:
-        return None  # No data found
-
-    tool_info = {
-        "Nominal Sizes": filtered_tools["Nominal Size"].unique().tolist(),
-        "Sizes": {}
-    }
+        return get_catalog().tool_listing  # ✅ Returns all tools
 
-    for _, row in filtered_tools.iterrows():
-
-        size = row["Nominal Size"]
-
-        tool_info["Sizes"][size] = {
-            "OD": row["OD (Inches)"],
-            "Length": row["Length (ft)"],
-            "Weight": row["Weight (lbs)"],
-            "Top Connections": str(row["Top Connection"]).split(","),
-            "Lower Connections": str(row["Lower Connection"]).split(",")
-        }
-
-    return tool_info
+    return get_catalog().tool(tool_name)
 
 def get_full_tool_database():
     """Returns the full tool database."""
-    return data_df["Tool"]  # ✅ Just return the global dataframe
+    return get_database("Tool")
 
 def isNaN(value):
     return value != value
@@ -67,60 +190,11 @@ def get_pce_data(tool_name=None):
       - records: {(brand, size, service): {OD, Length, Weight, Top Connections, Lower Connections}}
     """
     if tool_name is None:
-        return data_df["PCE"][["Tool Name", "Category"]].drop_duplicates()
-
-    df = data_df["PCE"][data_df["PCE"]["Tool Name"] == tool_name].copy()
-    if df.empty:
-        return None
-
-    # Normalize types/strings
-    for col in ["Brand", "Service", "Top Connection", "Lower Connection"]:
-        if col in df.columns:
-            df[col] = df[col].astype(str)
-
-    df["Nominal Size"] = df["Nominal Size"].astype(str)
-
-    # Build lists/maps
-    brands = sorted({b for b in df.get("Brand", pd.Series(dtype=str)).unique() if b and b.lower() != "nan"})
-
-    sizes_by_brand = {}
-    for b in brands:
-        sizes = df.loc[df["Brand"] == b, "Nominal Size"].astype(str).unique().tolist()
-        sizes_by_brand[b] = sorted([s for s in sizes if s and s.lower() != "nan"])
-
-    services_by_brand_size = {}
-    for b in brands:
-        services_by_brand_size[b] = {}
-        for s in sizes_by_brand[b]:
-            sub = df[(df["Brand"] == b) & (df["Nominal Size"].astype(str) == s)]
-            svcs = sub.get("Service", pd.Series(dtype=str)).astype(str).unique().tolist()
-            services_by_brand_size[b][s] = sorted([x for x in svcs if x and x.lower() != "nan"])
-
-    # Detailed records
-    records = {}
-    for _, row in df.iterrows():
-        b = row.get("Brand", "")
-        s = str(row.get("Nominal Size", ""))
-        svc = row.get("Service", "")
-
-        records[(b, s, svc)] = {
-            "ID": row.get("Bore ID", 0),
-            "OD": row.get("OD (Inches)", 0),
-            "Length": row.get("Length (ft)", 0),
-            "Weight": row.get("Weight (kg)", 0),
-            "Working Pressure": row.get("Working Pressure", 0),
-            "Top Connections": str(row.get("Top Connection", "")).split(","),
-            "Lower Connections": str(row.get("Lower Connection", "")).split(","),
-        }
-
-    return {
-        "brands": brands,
-        "sizes_by_brand": sizes_by_brand,
-        "services_by_brand_size": services_by_brand_size,
-        "records": records,
-    }
+        return get_catalog().pce_listing
+
+    return get_catalog().pce_tool(tool_name)
 
 
 def get_full_pce_database():
     """Returns the full tool database."""
-    return data_df["PCE"]  # ✅ Just return the global dataframe
+    return get_database("PCE")
@@ -0,0 +1,96 @@
+# search_index.py
+import re
+from collections import Counter
+
+FUZZY_THRESHOLD = 0.3  # Trigram similarity a misspelt name needs to be listed
+
+# Match tiers, best first
+NAME_PREFIX, WORD_PREFIX, NAME_CONTAINS, OTHER_FIELDS, FUZZY = range(5)
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _compact(text):
+    """Letters and digits only: 'x-over (2")' -> 'xover2', so shorthand without the punctuation still matches."""
+    return re.sub(r"[^a-z0-9]+", "", text)
+
+
+class ToolSearchIndex:
+    """
+    Search over tool names, categories and descriptions, built once.
+
+    Entries are (tool name, category, description) in database order. A
+    query matches when every word of it appears in the name, category or
+    description; name matches rank first (whole-name prefix, then word
+    prefix, then anywhere in the name). Names are also matched without
+    their spaces and punctuation ("xover" finds "X-Over"). Names that only
+    resemble the query (a typo, a missing letter) are found through a
+    trigram index and listed after the exact matches, most similar first.
+    """
+
+    def __init__(self, entries):
+        self.entries = [tuple(entry) for entry in entries]
+        self._names = [(name or "").lower() for name, _, _ in self.entries]
+        self._words = [re.split(r"[\s\-/()\"']+", name) for name in self._names]
+        self._compact_names = [_compact(name) for name in self._names]
+        self._other = [f"{category or ''} {description or ''}".lower() for _, category, description in self.entries]
+        # Trigram postings of the names as written and of their compact forms, scored separately
+        self._forms = []
+        for names in (self._names, self._compact_names):
+            trigram_sets = [_trigrams(name) for name in names]
+            postings = {}
+            for position, trigrams in enumerate(trigram_sets):
+                for trigram in trigrams:
+                    postings.setdefault(trigram, []).append(position)
+            self._forms.append((trigram_sets, postings))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _tier(self, position, query, words, compact):
+        name = self._names[position]
+        if name.startswith(query):
+            return NAME_PREFIX
+        if all(any(part.startswith(word) for part in self._words[position]) for word in words):
+            return WORD_PREFIX
+        if query in name or compact and compact in self._compact_names[position]:
+            return NAME_CONTAINS
+        if all(word in name or word in self._other[position] for word in words):
+            return OTHER_FIELDS
+        return None
+
+    def _fuzzy(self, query):
+        """{position: similarity} of names sharing enough trigrams with the query."""
+        scores = {}
+        for text, (trigram_sets, postings) in zip((query, _compact(query)), self._forms):
+            query_trigrams = _trigrams(text)
+            shared = Counter(position for trigram in query_trigrams for position in postings.get(trigram, ()))
+            for position, count in shared.items():
+                similarity = count / (len(query_trigrams) + len(trigram_sets[position]) - count)
+                if similarity >= FUZZY_THRESHOLD and similarity > scores.get(position, 0.0):
+                    scores[position] = similarity
+        return scores
+
+    def search(self, query="", category=None):
+        """Matching entries, best first; every entry of `category` (None for all) when the query is empty."""
+        query = " ".join(query.lower().split())
+        positions = [position for position, entry in enumerate(self.entries)
+                     if category is None or entry[1] == category]
+        if not query:
+            return [self.entries[position] for position in positions]
+
+        words = query.split()
+        compact = _compact(query)
+        fuzzy = self._fuzzy(query)
+        ranked = []
+        for position in positions:
+            tier = self._tier(position, query, words, compact)
+            if tier is not None:
+                ranked.append((tier, 0.0, position))
+            elif position in fuzzy:
+                ranked.append((FUZZY, -fuzzy[position], position))
+        ranked.sort()
+        return [self.entries[position] for _, _, position in ranked]
@@ -0,0 +1,240 @@
+# tool_store.py
+import csv
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from utils.path_finder import get_cache_dir
+
+DATABASE_PATH_VARIABLE = "WIREHUB_DATABASE"  # Points several users at one shared store
+DATABASE_FILE = "tool_database.sqlite"
+BUSY_TIMEOUT_S = 10  # How long a writer waits for another writer before giving up
+
+# CSV header -> (SQL column, type) for each database, in CSV order
+SCHEMAS = {
+    "Tool": ("tools", [
+        ("Category", "category", "TEXT"),
+        ("Tool Name", "tool_name", "TEXT"),
+        ("Nominal Size", "nominal_size", "TEXT"),
+        ("OD (Inches)", "od", "REAL"),
+        ("Top Connection", "top_connection", "TEXT"),
+        ("Lower Connection", "lower_connection", "TEXT"),
+        ("Length (ft)", "length_ft", "REAL"),
+        ("Weight (lbs)", "weight_lbs", "REAL"),
+        ("Picture", "picture", "TEXT"),
+        ("Verified by", "verified_by", "TEXT"),
+        ("Description", "description", "TEXT"),
+    ]),
+    "PCE": ("pce", [
+        ("Category", "category", "TEXT"),
+        ("Brand", "brand", "TEXT"),
+        ("Tool Name", "tool_name", "TEXT"),
+        ("Nominal Size", "nominal_size", "TEXT"),
+        ("Bore ID", "bore_id", "REAL"),
+        ("Service", "service", "TEXT"),
+        ("Working Pressure", "working_pressure", "TEXT"),
+        ("Top Connection", "top_connection", "TEXT"),
+        ("Lower Connection", "lower_connection", "TEXT"),
+        ("Length (ft)", "length_ft", "REAL"),
+        ("Weight (kg)", "weight_kg", "REAL"),
+        ("Picture", "picture", "TEXT"),
+        ("Verified by", "verified_by", "TEXT"),
+        ("Description", "description", "TEXT"),
+    ]),
+}
+INDEXED_COLUMNS = ("tool_name", "category", "nominal_size", "brand")
+
+
+def file_stamp(path):
+    """Modification time and size of a file, to tell whether it changed since it was imported."""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _from_csv(value, sql_type):
+    """A CSV cell as stored: None for an empty cell, a float for numeric columns when it parses."""
+    if value is None or value == "":
+        return None
+    if sql_type == "REAL":
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_csv(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        text = repr(value)
+        return text[:-2] if text.endswith(".0") else text
+    return value
+
+
+class ToolStore:
+    """
+    Tool and PCE databases in one SQLite file.
+
+    A store of the user's own runs in WAL mode, so readers never wait for
+    a writer. WAL needs memory shared between the processes on one PC and
+    does not work over a network folder, so a `shared` store (one file used
+    from several PCs) keeps SQLite's rollback journal instead: a reader
+    waits up to BUSY_TIMEOUT_S while a writer commits. Writers take the
+    lock for one short transaction at a time. Tool name, category, nominal
+    size and brand are indexed, and every query is parameterised. Each
+    thread gets its own connection.
+    """
+
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared
+        self._local = threading.local()
+        with self.transaction() as db:
+            for data_type, (table, columns) in SCHEMAS.items():
+                definitions = ", ".join(f"{name} {sql_type}" for _, name, sql_type in columns)
+                db.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {definitions})")
+                for _, name, _ in columns:
+                    if name in INDEXED_COLUMNS:
+                        db.execute(f"CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({name})")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def connection(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+            if self.shared:
+                db.execute("PRAGMA journal_mode=DELETE")
+            else:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def transaction(self):
+        """One write transaction, with the write lock taken up front so it cannot deadlock halfway."""
+        db = self.connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    @staticmethod
+    def columns(data_type):
+        """CSV headers of a database, in order."""
+        return [header for header, _, _ in SCHEMAS[data_type][1]]
+
+    def _select(self, data_type):
+        table, columns = SCHEMAS[data_type]
+        return table, ", ".join(name for _, name, _ in columns)
+
+    # --------------------------------------------------
+    # Import / export
+    # --------------------------------------------------
+    def import_csv(self, data_type, csv_path):
+        """Replace a database with the rows of a CSV file. Returns the number of rows."""
+        table, columns = SCHEMAS[data_type]
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            records = list(csv.DictReader(f))
+
+        names = ", ".join(name for _, name, _ in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        with self.transaction() as db:
+            db.execute(f"DELETE FROM {table}")
+            db.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", (
+                [_from_csv(record.get(header), sql_type) for header, _, sql_type in columns] for record in records
+            ))
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                       (f"source:{data_type}", file_stamp(csv_path)))
+        return len(records)
+
+    def source_stamp(self, data_type):
+        """file_stamp() of the CSV a database was last imported from, or None."""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = ?", (f"source:{data_type}",)).fetchone()
+        return row[0] if row else None
+
+    def export_csv(self, data_type, csv_path):
+        """Write a database out in the CSV layout it was imported from."""
+        table, names = self._select(data_type)
+        rows = self.connection().execute(f"SELECT {names} FROM {table} ORDER BY id")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns(data_type))
+            for row in rows:
+                writer.writerow([_to_csv(value) for value in row])
+        return csv_path
+
+    # --------------------------------------------------
+    # Queries
+    # --------------------------------------------------
+    def count(self, data_type):
+        table = SCHEMAS[data_type][0]
+        return self.connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def fetch(self, data_type, after_id=0, limit=200):
+        """Up to `limit` rows with ids greater than `after_id`, as (id, values...) in id order."""
+        table, names = self._select(data_type)
+        return self.connection().execute(
+            f"SELECT id, {names} FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+
+    def frame(self, data_type):
+        """The whole database as a DataFrame with the CSV headers."""
+        import pandas as pd
+
+        table, names = self._select(data_type)
+        rows = self.connection().execute(f"SELECT {names} FROM {table} ORDER BY id").fetchall()
+        frame = pd.DataFrame(rows, columns=self.columns(data_type))
+        for header, _, sql_type in SCHEMAS[data_type][1]:
+            if sql_type == "REAL":
+                frame[header] = pd.to_numeric(frame[header], errors="coerce")
+        return frame
+
+    def tool_list(self, data_type, category=None, search=None):
+        """
+        (tool name, category, description) of every tool in a category
+        and/or whose name contains `search`, once each, in database order.
+        The description is the tool's first non-empty one.
+        """
+        table = SCHEMAS[data_type][0]
+        pattern = None
+        if search:
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rows = self.connection().execute(
+            f"SELECT tool_name, category, "
+            f"(SELECT description FROM {table} d WHERE d.tool_name = t.tool_name AND d.description IS NOT NULL "
+            f"ORDER BY d.id LIMIT 1), MIN(id) AS first_id "
+            f"FROM {table} t "
+            f"WHERE tool_name IS NOT NULL AND (? IS NULL OR category = ?) AND (? IS NULL OR tool_name LIKE ? ESCAPE '\\') "
+            f"GROUP BY tool_name ORDER BY first_id",
+            (category, category, pattern, pattern)
+        )
+        return [row[:3] for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_tool_store():
+    """
+    The session's tool store: the file named by the WIREHUB_DATABASE
+    environment variable (shared between users, e.g. on a network drive),
+    else one in the user cache. None if it cannot be opened.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            shared_path = os.environ.get(DATABASE_PATH_VARIABLE)
+            path = shared_path or os.path.join(get_cache_dir("database"), DATABASE_FILE)
+            try:
+                _store = ToolStore(path, shared=bool(shared_path))
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Could not open tool database {path}: {e}")
+                return None
+        return _store
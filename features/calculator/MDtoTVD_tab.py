@@ -8,7 +8,9 @@ from matplotlib.figure import Figure
 import numpy as np
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 
+from utils.depth_reference import DepthReference
 from utils.path_finder import get_icon_path
+from utils.picking import PointPicker
 
 
 class MDtoTVDTab(QWidget):
@@ -140,6 +142,7 @@ class MDtoTVDTab(QWidget):
         # Replace QChartView with matplotlib FigureCanvas
         self.figure = Figure()
         self.canvas = FigureCanvasQTAgg(self.figure)
+        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
         right_layout.addWidget(self.canvas)
 
         # Add a button to copy the plot to clipboard
@@ -305,6 +308,8 @@ class MDtoTVDTab(QWidget):
         self.survey_tvds = tvds
         self.survey_vs = vs
         self.survey_inclinations = [0] + inclinations
+        self.survey_picker = PointPicker(vs, tvds)
+        self.hover_radius = 0.05 * max(vs)  # 5% threshold
 
         # Plot main trajectory
         self.well_path_line, = ax.plot(vs, tvds, 'b-', linewidth=2, label='Well Path')
@@ -335,7 +340,6 @@ class MDtoTVDTab(QWidget):
             arrowprops=dict(arrowstyle="->")
         )
         self.hover_annotation.set_visible(False)
-        self.canvas.mpl_connect("motion_notify_event", self.on_hover)
 
         # Formatting with adjusted margins
         ax.set_xlabel('Vertical Section (ft) →', fontweight='bold')
@@ -484,15 +488,11 @@ class MDtoTVDTab(QWidget):
             self.canvas.draw_idle()
             return
 
-        if not hasattr(self, 'survey_mds'):
+        if not hasattr(self, 'survey_picker'):
             return
 
-        x, y = event.xdata, event.ydata
-        distances = np.sqrt((np.array(self.survey_vs) - x) ** 2 +
-                            (np.array(self.survey_tvds) - y) ** 2)
-        idx = np.argmin(distances)
-
-        if distances[idx] > 0.05 * max(self.survey_vs):  # 5% threshold
+        idx = self.survey_picker.nearest(event.xdata, event.ydata, max_distance=self.hover_radius)
+        if idx is None:
             self.hover_annotation.set_visible(False)
             self.canvas.draw_idle()
             return
@@ -529,12 +529,9 @@ class MDtoTVDTab(QWidget):
             if len(survey_data) < 2:
                 raise ValueError("At least 2 survey points required")
 
-            # Create interpolation function
-            survey_md = [x[0] for x in survey_data]
-            survey_tvd = [x[1] for x in survey_data]
-
-            # Interpolate TVD values
-            tvd_values = np.interp(md_values, survey_md, survey_tvd)
+            # Interpolate TVD values (depths beyond the survey take the end station's TVD)
+            survey_md, survey_tvd = zip(*survey_data)
+            tvd_values = DepthReference(survey_md, survey_tvd, extrapolate="clip").to_tvd(md_values)
 
             # Display results
             self.results_table.setRowCount(len(md_values))
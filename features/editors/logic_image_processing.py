@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from PIL import Image as PILImage
 from PIL.ImageQt import ImageQt
 from PyQt6.QtCore import QSize
@@ -6,6 +8,10 @@ from PyQt6.QtGui import QPixmap, QImage
 from utils.screen_info import get_height
 
 
+EXPANDED_CACHE_SIZE = 256  # Expanded tool images kept for relayouts
+_expanded_pixmaps = OrderedDict()  # (source image, width, scale factor, min height) -> QPixmap
+
+
 def expand_and_center_images(images, max_width, return_list=False, scale_factor=1.0):
     """
     Processes a list of images by:
@@ -13,6 +19,10 @@ def expand_and_center_images(images, max_width, return_list=False, scale_factor=
     2. Optionally resizing all images if their combined height exceeds the dropzone height.
     3. Optionally returning the processed PIL images for export or further use.
 
+    Widgets are expanded from their original tool image (`source_pixmap`),
+    and the result is cached per (image, width, scale factor), so a relayout
+    only touches widgets whose expansion changed.
+
     Args:
         images (list): List of image objects or widgets containing QPixmaps.
         max_width (int): Target background width.
@@ -24,26 +34,51 @@ def expand_and_center_images(images, max_width, return_list=False, scale_factor=
     if not images:
         return [] if return_list else None
 
-    expanded_images = []
-    dropzone_height = get_height() - 55  # Adjust for padding
-    min_height = 0
-
-    if not return_list:
-        min_height = max(img.label.height() for img in images)
-        total_height = sum(img.image_label.height() for img in images)
-        scale_factor = min(1.0, dropzone_height / total_height)
-
-    for img in images:
-        qimage = img if return_list else img.image_label.pixmap().toImage()
-        expanded = expand_image(qimage, max_width, scale_factor, min_height)
-        expanded_images.append(expanded)
+    if return_list:
+        return [expand_image(img, max_width, scale_factor) for img in images]
 
-        if not return_list:
-            updated_pixmap = QPixmap.fromImage(ImageQt(expanded))
+    dropzone_height = get_height() - 55  # Adjust for padding
+    sources = [_source_pixmap(img) for img in images]
+    min_height = max(img.label.height() for img in images)
+    total_height = sum(source.height() for source in sources)
+    scale_factor = min(1.0, dropzone_height / total_height) if total_height else 1.0
+
+    # One repaint for the whole relayout instead of one per setPixmap
+    parent = images[0].parentWidget()
+    if parent is not None:
+        parent.setUpdatesEnabled(False)
+    try:
+        for img, source in zip(images, sources):
+            key = (source.cacheKey(), max_width, scale_factor, min_height)
+            if getattr(img, "expanded_key", None) == key:
+                continue
+            updated_pixmap = _expanded_pixmap(key, source)
             img.image_label.setPixmap(updated_pixmap)
             img.image_label.setFixedSize(QSize(max_width, updated_pixmap.height()))
-
-    return expanded_images if return_list else None
+            img.expanded_key = key
+    finally:
+        if parent is not None:
+            parent.setUpdatesEnabled(True)
+
+
+def _source_pixmap(widget):
+    """The tool image a widget was built with (its current pixmap for widgets that do not keep one)."""
+    source = getattr(widget, "source_pixmap", None)
+    return source if source is not None else widget.image_label.pixmap()
+
+
+def _expanded_pixmap(key, source):
+    pixmap = _expanded_pixmaps.get(key)
+    if pixmap is not None:
+        _expanded_pixmaps.move_to_end(key)
+        return pixmap
+
+    _, width, scale_factor, min_height = key
+    pixmap = QPixmap.fromImage(ImageQt(expand_image(source, width, scale_factor, min_height)))
+    _expanded_pixmaps[key] = pixmap
+    if len(_expanded_pixmaps) > EXPANDED_CACHE_SIZE:
+        _expanded_pixmaps.popitem(last=False)
+    return pixmap
 
 
 def expand_image(img, width, scale_factor=1.0, min_height=0):
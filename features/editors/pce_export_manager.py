@@ -1,7 +1,4 @@
 import os
-import time
-import win32com.client
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QMessageBox, QFileDialog
 from openpyxl import Workbook
 
@@ -12,11 +9,13 @@ from openpyxl.utils import range_boundaries
 
 from utils.loading_worker import LoadingWorker
 from features.editors.logic_image_processing import combine_tool_images, expand_and_center_images, remove_white_background
+from features.editors.pdf_report import draw_report
 from utils.logic_utils import get_number
 from ui.components.pce_editor.tool_widget import ToolWidget
 from ui.windows.ui_messagebox_window import MessageBoxWindow
 from utils.check_file import is_file_open
-from utils.path_finder import get_icon_path, get_pce_image_path
+from utils.image_cache import get_image_cache
+from utils.path_finder import get_icon_path
 from io import BytesIO
 
 
@@ -45,18 +44,16 @@ def export_configuration(main_window):
         return  # ✅ Exit if user cancels
 
     # Before saving
-    if is_file_open(excel_path):
-        # print(f"⚠️ The file {excel_path} is open in Excel. Please close it and try again.")
-
-        print(f"Excel is currently open. Please close any Excel windows and try again.")
+    pdf_path = excel_path.replace(".xlsx", ".pdf")
+    if is_file_open(excel_path) or is_file_open(pdf_path):
+        print(f"⚠️ The export files are open in another program. Please close them and try again.")
         MessageBoxWindow.message_simple(main_window,
                                         "Export Error",
-                                        f"Excel is currently open. Please close any Excel windows and try again.",
+                                        f"The Excel or PDF file is open in another program. Please close it and try again.",
                                         QMessageBox.Icon.Warning)
 
         return  # Stop execution
 
-    pdf_path = excel_path.replace(".xlsx", ".pdf")
     final_directory = os.path.dirname(excel_path)  # ✅ Extract directory
 
     # ✅ **Start Loading Animation in a Separate Thread**
@@ -138,7 +135,7 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, date,
         # **Extract Tool Data**
         data, tool_images = extract_tool_data(drop_zone)  # ✅ Call helper function
 
-        tool_images.append(QPixmap(get_pce_image_path("Christmas Tree")).toImage())
+        tool_images.append(get_image_cache().image("PCE", "Christmas Tree"))
 
         # how tall each source image was padded to before stacking (your expand_and_center_images call)
         SOURCE_SEGMENT_PX = 150  # must match your expand_and_center_images(..., 150, ...)
@@ -182,6 +179,7 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, date,
     cell = "B7"  # align the image top with the first data row band
     have_image = False
     img = None  # so we can test later
+    pil_img = None
 
     if tool_images:
         centered_images = expand_and_center_images(tool_images, SOURCE_SEGMENT_PX, True)
@@ -321,40 +319,10 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, date,
             ws[cell4] = "Total PCE height (ft)"
 
         elif column == 'F':
-            # --- Detect key tools and compute sectional totals ---
-            stuffing_index = None
-            bop_index = None
-            for idx, row_data in enumerate(data):
-                tool_name = str(row_data[2]).lower()
-                if any(x in tool_name for x in ["stuffing box", "parasheave"]) and stuffing_index is None:
-                    stuffing_index = idx
-                if "bop" in tool_name and bop_index is None:
-                    bop_index = idx
-
-            # Default to total length if key tools not found
-            if stuffing_index is None or bop_index is None or bop_index <= stuffing_index:
-                ws[cell1] = total_length
-                ws[cell2] = total_length
-            else:
-                # Compute total length between Stuffing Box/Parasheave and BOP
-                length_between = 0.0
-                for row_data in data[stuffing_index + 1:bop_index]:
-                    length_between += get_number(row_data[5])
-
-                # Compute total length below BOP
-                length_below = 0.0
-                for row_data in data[bop_index + 1:]:
-                    length_below += get_number(row_data[5])
-
-                # Compute total length below BOP
-                length_capacity = 0.0
-                for row_data in data[stuffing_index + 1:]:
-                    length_capacity += get_number(row_data[5])
-
-                ws[cell1] = round(length_between, 2)
-                ws[cell2] = round(length_below, 2)
-                ws[cell3] = round(length_capacity, 2)
-
+            length_between, length_below, length_capacity = section_lengths(data, total_length)
+            ws[cell1] = length_between
+            ws[cell2] = length_below
+            ws[cell3] = length_capacity
             ws[cell4] = total_length
 
         elif column == 'G':
@@ -458,24 +426,14 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, date,
                     continue
                 cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
 
-        # --- Compute Minimum ID (remove " and ignore non-numeric) ---
-        id_values = []
-        for r in range(7, 45):  # D7:D44
-            val = ws.cell(row=r, column=4).value
-            if val:
-                try:
-                    if val != 'nan"':
-                        numeric_val = float(str(val).replace('"', '').strip())
-                        id_values.append(numeric_val)
-                except ValueError:
-                    pass
-
-        if id_values:
-            ws["D45"] = min(id_values)
+        # --- Minimum and maximum ID ---
+        min_id, max_id = id_range(data)
+        if min_id is not None:
+            ws["D45"] = min_id
             ws["D45"].font = Font(bold=True)
             ws["D45"].alignment = Alignment(horizontal="center", vertical="center")
 
-            ws["D47"] = max(id_values)
+            ws["D47"] = max_id
             ws["D47"].font = Font(bold=True)
             ws["D47"].alignment = Alignment(horizontal="center", vertical="center")
         else:
@@ -496,6 +454,47 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, date,
     # === Save Excel File ===
     wb.save(excel_path)
 
+    export_to_pdf(pdf_path, client_name, location, well_no, date, operation_details, comments,
+                  data, pil_img, total_length, total_weight)
+
+
+def section_lengths(data, total_length):
+    """
+    (Stuffing box/parasheave to BOP, BOP to tree, stuffing box to tree) lengths
+    in ft from the PCE rows; the total length when those tools are not found.
+    """
+    stuffing_index = None
+    bop_index = None
+    for idx, row_data in enumerate(data):
+        tool_name = str(row_data[2]).lower()
+        if any(x in tool_name for x in ["stuffing box", "parasheave"]) and stuffing_index is None:
+            stuffing_index = idx
+        if "bop" in tool_name and bop_index is None:
+            bop_index = idx
+
+    # Default to total length if key tools not found
+    if stuffing_index is None or bop_index is None or bop_index <= stuffing_index:
+        return total_length, total_length, None
+
+    length_between = sum(get_number(row_data[5]) for row_data in data[stuffing_index + 1:bop_index])
+    length_below = sum(get_number(row_data[5]) for row_data in data[bop_index + 1:])
+    length_capacity = sum(get_number(row_data[5]) for row_data in data[stuffing_index + 1:])
+    return round(length_between, 2), round(length_below, 2), round(length_capacity, 2)
+
+
+def id_range(data):
+    """(Minimum, maximum) ID in inches of the PCE rows, ignoring IDs that are not numbers; (None, None) if none are."""
+    id_values = []
+    for row_data in data:
+        try:
+            id_values.append(float(str(row_data[3]).replace('"', '').strip()))
+        except ValueError:
+            pass
+    id_values = [value for value in id_values if value == value]  # Drop NaN
+    if not id_values:
+        return None, None
+    return min(id_values), max(id_values)
+
 def safe_merge(ws, cell_range):
     """Safely merge only if no overlap with existing merged cells."""
     new_min_col, new_min_row, new_max_col, new_max_row = range_boundaries(cell_range)
@@ -508,44 +507,43 @@ def safe_merge(ws, cell_range):
             return
     ws.merge_cells(cell_range)
 
-def export_to_pdf(excel_path, pdf_path):
-    """Converts an Excel file to PDF and ensures Excel closes properly."""
+def export_to_pdf(pdf_path, client_name, location, well_no, date, operation_details, comments, data, tool_image,
+                  total_length, total_weight):
+    """Draws the PCE stack-up report (same layout as the Excel sheet) straight to PDF."""
+    length_between, length_below, length_capacity = section_lengths(data, total_length)
+    min_id, max_id = id_range(data)
+    summary_rows = [
+        ["Minimum ID (in)", min_id, "Bott. of Stuffing Box to Top of BOP (ft)", length_between,
+         "Total Weight (kg)", None, total_weight],
+        ["", "", "Bott. of BOP to Top of Tree (ft)", length_below, "", None, ""],
+        ["Maximum ID (in)", max_id, "Maximum tool string capacity (ft)", length_capacity,
+         "Total Weight (MT)", None, round(total_weight / 1000, 1)],
+        ["", "", "Total PCE height (ft)", total_length, "", None, ""],
+    ]
+    # Each row beside its tool: the diagram is one equal segment per tool plus the Christmas tree
+    segments = len(data) + 1
+    row_centres = [(index + 0.5) / segments for index in range(len(data))] if tool_image is not None else None
+    rows = []
+    for row_data in data:
+        row = list(row_data[2:])
+        top, _, bottom = str(row[2]).partition("\n")
+        row[2] = bottom if top == "-" else str(row[2])
+        rows.append(row)
     try:
-        excel = win32com.client.DispatchEx("Excel.Application")
-        excel.Visible = False
-        excel.DisplayAlerts = False
-
-        # ✅ **Use absolute paths to prevent directory issues**
-        excel_path = os.path.abspath(excel_path)
-        pdf_path = os.path.abspath(pdf_path)
-
-        wb = excel.Workbooks.Open(excel_path)
-        ws = wb.Sheets(1)
-
-        ws.PageSetup.Zoom = False
-        ws.PageSetup.FitToPagesWide = 1
-        ws.PageSetup.FitToPagesTall = False
-        ws.PageSetup.PaperSize = 9
-        ws.PageSetup.Orientation = 1
-
-        # ✅ **Ensure the file is closed before exporting to PDF**
-        time.sleep(2)
-        
-        wb.ExportAsFixedFormat(0, pdf_path)
+        draw_report(
+            pdf_path, "PCE STACK-UP",
+            [("Client Name", client_name), ("Location", location), ("Well No.", well_no), ("Date", date)],
+            operation_details,
+            ["Description", "ID (in)", "Connections", "Length (ft)", "Service", "WP (psi)", "Weight (kg)"],
+            rows, tool_image, summary_rows, comments,
+            "This report was computer generated using Deleum PCE Editor",
+            row_centres,
+        )
         print(f"✅ Successfully exported PDF: {pdf_path}")
-
     except Exception as e:
         print(f"❌ Failed to export PDF: {e}")
-    finally:
-        try:
-            wb.Close(SaveChanges=False)
-            excel.Quit()
-            print("✅ Excel closed successfully.")
-        except:
-            print("⚠️ Excel instance may still be running.")
 
-    print(f"Excel Path: {excel_path}")
-    print(f"PDF Path: {pdf_path}")
+
 def extract_tool_data(drop_zone):
     """Extracts tool details and images from the drop zone."""
     data = []
@@ -587,11 +585,8 @@ def extract_tool_data(drop_zone):
             ])
 
         # **Retrieve Tool Image**
-        image_path = get_pce_image_path(tool_name)
-        pixmap = QPixmap(image_path)
-
         if widget.image_label.pixmap() and not widget.image_label.pixmap().isNull():
-            tool_images.append(pixmap.toImage())
+            tool_images.append(get_image_cache().image("PCE", tool_name))
 
     return data, tool_images
 
@@ -0,0 +1,194 @@
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from utils.path_finder import get_icon_path
+
+MARGIN = 30
+LINE = 14  # Height of a header/summary row (pt)
+FONT = "Helvetica"
+BOLD = "Helvetica-Bold"
+FONT_SIZE = 8
+MIN_FONT_SIZE = 5  # Cell text shrinks to this before it is cut short
+MAX_DIAGRAM_WIDTH = 110
+REMARKS_HEIGHT = 60
+MAX_DETAIL_LINES = 4  # Operation details wrap onto at most this many lines
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def _fit(text, font, size, width):
+    """(text, font size) that fits in `width`: shrunk down to MIN_FONT_SIZE, then cut short with an ellipsis."""
+    while size > MIN_FONT_SIZE and stringWidth(text, font, size) > width:
+        size -= 0.5
+    if stringWidth(text, font, size) > width:
+        while text and stringWidth(text + "…", font, size) > width:
+            text = text[:-1]
+        text += "…"
+    return text, size
+
+
+def _draw_centred(c, x, y, width, text, font, size):
+    """Text centred on x + width / 2, fitted to the cell width."""
+    text, size = _fit(text, font, size, width - 4)
+    c.setFont(font, size)
+    c.drawCentredString(x + width / 2, y, text)
+
+
+def _draw_wrapped(c, x, y, width, text, max_lines):
+    """Bordered full-width cell with `text` wrapped onto centred lines; returns the y of its bottom edge."""
+    lines = []
+    for paragraph in _text(text).split("\n"):
+        lines.extend(simpleSplit(paragraph, FONT, FONT_SIZE, width - 8) or [""])
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1], _ = _fit(lines[-1] + "…", FONT, FONT_SIZE, width - 8)
+    leading = FONT_SIZE * 1.2
+    height = max(LINE, len(lines) * leading + 4)
+    c.rect(x, y - height, width, height)
+    c.setFont(FONT, FONT_SIZE)
+    first = y - height / 2 + (len(lines) - 1) * leading / 2 - FONT_SIZE / 3
+    for number, line in enumerate(lines):
+        c.drawCentredString(x + width / 2, first - number * leading, line)
+    return y - height
+
+
+def _draw_cells(c, x, y, widths, values, bold=False, height=LINE):
+    """One bordered row of cells whose top edge is at `y`; a None value widens the cell to its left."""
+    spans = []
+    for width, value in zip(widths, values):
+        if value is None and spans:
+            spans[-1][1] += width
+        else:
+            spans.append([value, width])
+
+    for value, width in spans:
+        c.rect(x, y - height, width, height)
+        _draw_centred(c, x, y - height / 2 - FONT_SIZE / 3, width, _text(value), BOLD if bold else FONT, FONT_SIZE)
+        x += width
+    return y - height
+
+
+def _column_widths(headers, rows, summary_rows, total_width):
+    """Widths proportional to each column's longest text (as the Excel sheet's auto width), filling `total_width`."""
+    widths = []
+    for col, header in enumerate(headers):
+        texts = [header] + [line for row in rows for line in _text(row[col]).split("\n")]
+        # Summary cells merged with the next column do not set this column's width
+        texts += [_text(row[col]) for row in summary_rows if col + 1 == len(row) or row[col + 1] is not None]
+        widths.append(max(stringWidth(text, BOLD, FONT_SIZE) for text in texts) + 8)
+    scale = total_width / sum(widths)
+    return [width * scale for width in widths]
+
+
+def draw_report(pdf_path, title, info, operation_details, headers, rows, diagram, summary_rows, comments,
+                footer, row_centres=None):
+    """
+    Draws a one-page A4 report in the layout of the exported Excel sheets:
+    logo and title, job details, operation details, the tool table beside the
+    string diagram, summary rows and remarks.
+
+    `info` is a list of (label, value). `headers` and each row of `rows` and
+    `summary_rows` are the table's columns after the diagram (tool rows may
+    hold two lines split by a newline; None in a summary row merges the cell
+    with the one to its left). `diagram` is a PIL image or None.
+    `row_centres` places each tool row at that fraction of the diagram's
+    height (e.g. next to its tool); by default rows are listed top-down.
+    """
+    c = canvas.Canvas(pdf_path, pagesize=A4)
+    page_width, page_height = A4
+    width = page_width - 2 * MARGIN
+    left = MARGIN
+    y = page_height - MARGIN
+
+    # --- Logo and title ---
+    title_height = 45
+    logo = ImageReader(get_icon_path('logo_report'))
+    logo_width, logo_height = logo.getSize()
+    scale = min(1, (title_height - 6) / logo_height, 120 / logo_width)
+    c.drawImage(logo, left + 3, y - title_height + 3, logo_width * scale, logo_height * scale, mask='auto')
+    c.setFont(BOLD, 14)
+    c.drawCentredString(page_width / 2, y - title_height / 2 - 5, title)
+    c.rect(left, y - title_height, width, title_height)
+    y -= title_height
+
+    # --- Job details ---
+    info_widths = [width / len(info)] * len(info)
+    y = _draw_cells(c, left, y, info_widths, [label for label, _ in info], bold=True)
+    y = _draw_cells(c, left, y, info_widths, [value for _, value in info])
+    y = _draw_cells(c, left, y, [width], ["Operation Details"], bold=True)
+    y = _draw_wrapped(c, left, y, width, operation_details, MAX_DETAIL_LINES)
+
+    # --- Space left for the table body ---
+    summary_height = LINE * len(summary_rows)
+    body_top = y - LINE
+    body_bottom = MARGIN + 12 + REMARKS_HEIGHT + LINE + summary_height
+    body_height = body_top - body_bottom
+
+    diagram_width = 60
+    if diagram is not None:
+        image = ImageReader(diagram)
+        image_width, image_height = image.getSize()
+        scale = min((body_height - 10) / image_height, MAX_DIAGRAM_WIDTH / image_width)
+        diagram_width = max(diagram_width, image_width * scale + 10)
+
+    widths = _column_widths(headers, rows, summary_rows, width - diagram_width)
+    table_left = left + diagram_width
+
+    # --- Table header ---
+    _draw_cells(c, left, y, [diagram_width], ["Diagram"], bold=True)
+    y = _draw_cells(c, table_left, y, widths, headers, bold=True)
+
+    # --- Diagram and tool rows ---
+    c.rect(left, body_bottom - summary_height - LINE - REMARKS_HEIGHT, diagram_width,
+           body_height + summary_height + LINE + REMARKS_HEIGHT)
+    x = table_left
+    for column_width in widths:
+        c.rect(x, body_bottom, column_width, body_height)
+        x += column_width
+
+    drawn_height = body_height - 10
+    if diagram is not None:
+        drawn_width, drawn_height = image_width * scale, image_height * scale
+        c.drawImage(image, left + (diagram_width - drawn_width) / 2, body_top - 5 - drawn_height,
+                    drawn_width, drawn_height, mask='auto')
+
+    if rows:
+        if row_centres is None:
+            pitch = min(2 * LINE, body_height / (len(rows) + 1))
+            centres_y = [body_top - pitch * (index + 1) for index in range(len(rows))]
+        else:
+            centres_y = [body_top - 5 - drawn_height * fraction for fraction in row_centres]
+        font_size = FONT_SIZE if body_height / len(rows) >= 2 * FONT_SIZE else FONT_SIZE - 2
+        for row, centre in zip(rows, centres_y):
+            x = table_left
+            for column_width, value in zip(widths, row):
+                lines = _text(value).split("\n")
+                top = centre + (len(lines) - 1) * font_size / 2 - font_size / 3
+                for number, line in enumerate(lines):
+                    _draw_centred(c, x, top - number * font_size, column_width, line, FONT, font_size)
+                x += column_width
+
+    # --- Summary and remarks ---
+    y = body_bottom
+    for summary_row in summary_rows:
+        y = _draw_cells(c, table_left, y, widths, summary_row, bold=True)
+    y = _draw_cells(c, table_left, y, [sum(widths)], ["Remarks"], bold=True)
+    c.rect(table_left, y - REMARKS_HEIGHT, sum(widths), REMARKS_HEIGHT)
+    lines = []
+    for paragraph in _text(comments).split("\n"):
+        lines.extend(simpleSplit(paragraph, FONT, FONT_SIZE, sum(widths) - 8) or [""])
+    text = c.beginText(table_left + 4, y - FONT_SIZE - 3)
+    text.setFont(FONT, FONT_SIZE)
+    for line in lines[:int((REMARKS_HEIGHT - 4) // (FONT_SIZE * 1.2))]:  # What fits in the box
+        text.textLine(line)
+    c.drawText(text)
+
+    c.setFont(FONT, FONT_SIZE)
+    c.drawRightString(left + width, MARGIN, footer)
+
+    c.showPage()
+    c.save()
@@ -1,7 +1,4 @@
 import os
-import time
-import win32com.client
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QMessageBox, QFileDialog
 from openpyxl import Workbook
 from openpyxl.drawing.image import Image as ExcelImage
@@ -10,11 +7,11 @@ from PIL import Image as PILImage
 
 from utils.loading_worker import LoadingWorker
 from features.editors.logic_image_processing import combine_tool_images, expand_and_center_images, remove_white_background
-from utils.logic_utils import get_number
-from ui.components.toolstring_editor.tool_widget import ToolWidget
+from features.editors.pdf_report import draw_report
 from ui.windows.ui_messagebox_window import MessageBoxWindow
 from utils.check_file import is_file_open
-from utils.path_finder import get_icon_path, get_tool_image_path
+from utils.image_cache import get_image_cache
+from utils.path_finder import get_icon_path
 from io import BytesIO
 
 
@@ -43,18 +40,16 @@ def export_configuration(main_window):
         return  # ✅ Exit if user cancels
 
     # Before saving
-    if is_file_open(excel_path):
-        # print(f"⚠️ The file {excel_path} is open in Excel. Please close it and try again.")
-
-        print(f"Excel is currently open. Please close any Excel windows and try again.")
+    pdf_path = excel_path.replace(".xlsx", ".pdf")
+    if is_file_open(excel_path) or is_file_open(pdf_path):
+        print(f"⚠️ The export files are open in another program. Please close them and try again.")
         MessageBoxWindow.message_simple(main_window,
                                         "Export Error",
-                                        f"Excel is currently open. Please close any Excel windows and try again.",
+                                        f"The Excel or PDF file is open in another program. Please close it and try again.",
                                         QMessageBox.Icon.Warning)
 
         return  # Stop execution
 
-    pdf_path = excel_path.replace(".xlsx", ".pdf")
     final_directory = os.path.dirname(excel_path)  # ✅ Extract directory
 
     # ✅ **Start Loading Animation in a Separate Thread**
@@ -134,19 +129,15 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, max_an
         cell.border = thin_border
         cell.alignment = Alignment(horizontal="center", vertical="center")
 
-    total_length = 0.0
-    total_weight = 0.0
-    od_list = []
-
     for row_data in data:
         if len(data) < 19:
             ws.append([])
         ws.append(row_data)
-        od_list.append(row_data[3])
-        total_length += get_number(row_data[6])
-        total_weight += row_data[7]
 
-    max_od = max(od_list)
+    tool_string = drop_zone.tool_string
+    max_od = tool_string.max_od
+    total_length = round(tool_string.total_length, 3)
+    total_weight = round(tool_string.total_weight, 3)
     cell_remarks_title = 'C' + str(last_row - 5)
     cell_remarks_content = 'C' + str(last_row - 4)
     ws[cell_remarks_title] = "Remarks"
@@ -233,6 +224,7 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, max_an
 
     # --- Insert Image ---
     cell = "B8"
+    pil_img = None
     if tool_images:
         centered_images = expand_and_center_images(tool_images, 80, True)
         tool_image = combine_tool_images(centered_images)
@@ -280,78 +272,41 @@ def export_to_excel(excel_path, pdf_path, client_name, location, well_no, max_an
     wb.save(excel_path)
     print(f"✅ Excel export successful: {excel_path}")
 
-
-def export_to_pdf(excel_path, pdf_path):
-    """Converts an Excel file to PDF and ensures Excel closes properly."""
+    export_to_pdf(pdf_path, client_name, location, well_no, max_angle, well_type, date, operation_details, comments,
+                  tool_string, pil_img)
+
+
+def export_to_pdf(pdf_path, client_name, location, well_no, max_angle, well_type, date, operation_details, comments,
+                  tool_string, tool_image):
+    """Draws the tool string report (same layout as the Excel sheet) straight to PDF."""
+    max_od = tool_string.max_od
+    total_length = round(tool_string.total_length, 3)
+    total_weight = round(tool_string.total_weight, 3)
+    rows = [row[2:] for row in tool_string.export_rows()]
+    summary_rows = [
+        ["Max OD (in)", max_od, "Total Length (ft) & Weight (lbs)", None, total_length, total_weight],
+        ["Max OD (mm)", round(max_od * 25.4, 1), "Total Length (m) & Weight (kg)", None,
+         round(total_length * 0.3048, 1), round(total_weight * 0.453592, 1)],
+    ]
     try:
-        excel = win32com.client.DispatchEx("Excel.Application")
-        excel.Visible = False
-        excel.DisplayAlerts = False
-
-        # ✅ **Use absolute paths to prevent directory issues**
-        excel_path = os.path.abspath(excel_path)
-        pdf_path = os.path.abspath(pdf_path)
-
-        wb = excel.Workbooks.Open(excel_path)
-        ws = wb.Sheets(1)
-
-        ws.PageSetup.Zoom = False
-        ws.PageSetup.FitToPagesWide = 1
-        ws.PageSetup.FitToPagesTall = False
-        ws.PageSetup.PaperSize = 9
-        ws.PageSetup.Orientation = 1
-
-        # ✅ **Ensure the file is closed before exporting to PDF**
-        time.sleep(2)
-        
-        wb.ExportAsFixedFormat(0, pdf_path)
+        draw_report(
+            pdf_path, "TOOL STRING SCHEMATIC",
+            [("Client Name", client_name), ("Location", location), ("Well No.", well_no),
+             ("Well Type", well_type), ("Max Angle", max_angle), ("Date", date)],
+            operation_details,
+            ["Description", "OD (in)", "Top Connection", "Bottom Connection", "Length (ft)", "Weight (lbs)"],
+            rows, tool_image, summary_rows, comments,
+            "This report was computer generated using Deleum Tool String Editor",
+        )
         print(f"✅ Successfully exported PDF: {pdf_path}")
-
     except Exception as e:
         print(f"❌ Failed to export PDF: {e}")
-    finally:
-        try:
-            wb.Close(SaveChanges=False)
-            excel.Quit()
-            print("✅ Excel closed successfully.")
-        except:
-            print("⚠️ Excel instance may still be running.")
 
-    print(f"Excel Path: {excel_path}")
-    print(f"PDF Path: {pdf_path}")
 
 def extract_tool_data(drop_zone):
-    """Extracts tool details and images from the drop zone."""
-    data = []
-    tool_images = []
-
-    for i in range(drop_zone.layout.count()):
-        widget = drop_zone.layout.itemAt(i).widget()
-
-        # ✅ Ensure the widget is a ToolWidget
-        if not isinstance(widget, ToolWidget):
-            continue
-
-        # **Extract Tool Information**
-        tool_name = widget.tool_name
-        size = widget.nominal_size_selector.currentText()
-        od = get_number(widget.od_label.text())  # Ensure OD is numeric
-        top_connection = widget.top_connection_label.text()
-        lower_connection = widget.lower_connection_label.currentText()
-        length = widget.length_label.text()
-        weight = get_number(widget.weight_label.text())  # Ensure weight is numeric
-
-        # **Append tool details to the list**
-        data.append(["", "", f"{tool_name} ({size})", od, top_connection, lower_connection, length, weight])
-
-        # **Retrieve Tool Image**
-
-        image_path = get_tool_image_path(tool_name)
-        pixmap = QPixmap(image_path)
-
-        # **Store tool image only if it's valid**
-        if widget.image_label.pixmap() and not widget.image_label.pixmap().isNull():
-            tool_images.append(pixmap.toImage())
-
+    """Extracts tool details and images from the drop zone's tool string."""
+    tool_string = drop_zone.tool_string
+    image_cache = get_image_cache()
+    data = tool_string.export_rows()
+    tool_images = [image_cache.image("Tool", entry.name) for entry in tool_string]
     return data, tool_images
-
@@ -2,6 +2,8 @@
 import math
 import numpy as np
 
+from utils.depth_reference import inclinations_from_tvd, minimum_curvature
+
 
 def calculate_effective_weight(params, depth, use_metric=False):
     tool_weight = params['tool_weight']
@@ -146,41 +148,14 @@ def calculate_dls(trajectory_data, use_metric=False):
 
 
 def calculate_tvd(mds, incl_data):
-    """Calculate TVD from MD and Inclination data"""
-    if len(mds) != len(incl_data):
-        raise ValueError("MD and Inclination data must be the same length")
-
-    tvd = [mds[0] * np.cos(np.radians(incl_data[0]))]  # Initial TVD
-
-    for i in range(1, len(mds)):
-        delta_md = mds[i] - mds[i - 1]
-        avg_incl = np.radians(incl_data[i - 1])  # Use previous inclination
-        delta_tvd = delta_md * np.cos(avg_incl)
-        tvd.append(tvd[i - 1] + delta_tvd)
-    return tvd
+    """Calculate TVD from MD and Inclination data (minimum curvature)"""
+    return minimum_curvature(mds, incl_data)[2].tolist()
 
 def calculate_inclinations(mds, tvds):
     """Calculate inclinations from MD and TVD data"""
-    incl = [0.0]
-    for i in range(1, len(mds)):
-        delta_md = mds[i] - mds[i-1]
-        delta_tvd = tvds[i] - tvds[i-1]
-        if delta_md == 0:
-            incl.append(0.0)
-        else:
-            ratio = delta_tvd / delta_md
-            clamped = max(min(ratio, 1), -1)  # Clamp between -1 and 1
-            angle = np.degrees(np.arccos(clamped))
-            incl.append(angle)
-    return incl
+    return inclinations_from_tvd(mds, tvds).tolist()
 
 def calculate_north_east(mds, inclinations, azimuths):
-    incl = np.radians(inclinations)
-    azim = np.radians(azimuths)
-    north = [0.0]
-    east = [0.0]
-    for i in range(1, len(mds)):
-        delta_md = mds[i] - mds[i-1]
-        north.append(north[i-1] + np.sin(incl[i]) * np.cos(azim[i]) * delta_md)
-        east.append(east[i-1] + np.sin(incl[i]) * np.sin(azim[i]) * delta_md)
-    return north, east
\ No newline at end of file
+    """North and east offsets of each station (minimum curvature)"""
+    north, east, _ = minimum_curvature(mds, inclinations, azimuths)
+    return north.tolist(), east.tolist()
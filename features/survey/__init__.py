@@ -0,0 +1,54 @@
+# Expose key components from each module
+from .gauge_data import (
+    GaugeSeries,
+    parse_gauge_txt,
+    load_gauge_file,
+    to_datetime,
+    to_plot_seconds,
+    from_plot_seconds
+)
+
+from .gauge_cache import GaugeCache, get_gauge_cache
+
+from .survey_file import (
+    SurveyFileError,
+    write_survey,
+    read_survey,
+    read_manifest,
+    is_legacy_survey,
+    read_legacy_survey,
+    convert_legacy_survey
+)
+
+from .as2_writer import as2_output_path, write_as2_file, write_as2_files
+
+from .station_detection import find_plateaus, detect_stations, detect_swab_valve_opening
+
+from .alignment import estimate_clock_offset, apply_clock_correction
+
+from .gauge_ingest import stream_gauge_txt, plot_envelope, plot_arrays
+
+from .gauge_tail import GaugeTail, find_data_offset
+
+from .survey_report import (
+    calculate_ahd_tvd,
+    station_result_rows,
+    generate_events,
+    fill_interpretation_template,
+    fill_tvd_workbook
+)
+
+from .resample import resample, time_bins, aggregate, write_resampled_csv
+
+from .quality import check_gauge_quality, format_quality_report, find_spikes, despike
+
+from .comparison import ComparisonSurvey
+
+from .gradients import (
+    station_profile,
+    interval_gradients,
+    fit_segments,
+    find_contacts,
+    analyse_gradients,
+    format_gradient_summary
+)
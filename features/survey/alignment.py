@@ -0,0 +1,150 @@
+# alignment.py
+import numpy as np
+
+from features.survey.gauge_data import EPOCH, GaugeSeries, to_datetime
+
+RESAMPLE_SECONDS = 1.0      # Common grid both gauges are interpolated onto
+MAX_LAG_SECONDS = 3600      # Clock offsets beyond an hour are treated as a setup error
+DRIFT_SEGMENTS = 8          # Overlap is split into this many pieces to fit a linear drift
+MIN_SEGMENT_CORRELATION = 0.5
+
+
+def _ordered_seconds(series):
+    series = series.ordered()
+    return (series.times - EPOCH).astype(np.float64), series.pressures
+
+
+def _detrend(values):
+    """
+    Rate of change of the resampled pressure. Differencing removes the
+    level and any linear trend, leaving only the steps (RIH, POOH, valve
+    operations) that both gauges see at the same moment. Plateaus become
+    zero, so a zero-padded correlation is not biased towards lag 0.
+    """
+    return np.gradient(values) if len(values) > 1 else np.zeros(len(values))
+
+
+def _resample(seconds, pressures, grid):
+    """Detrended pressure on `grid`; zero outside the series' own time range."""
+    inside = (grid >= seconds[0]) & (grid <= seconds[-1])
+    out = np.zeros(len(grid))
+    if inside.sum() > 1:
+        out[inside] = _detrend(np.interp(grid[inside], seconds, pressures))
+    return out
+
+
+def _cross_correlation_lag(reference, other, max_lag):
+    """
+    Lag (in samples, sub-sample by parabolic fit) that best maps `other`
+    onto `reference`, and the normalised correlation at that lag.
+
+    Computed for every lag at once with a zero-padded FFT, so the cost is
+    O(n log n) instead of one dot product per candidate lag.
+    """
+    n = len(reference)
+    energy = np.sqrt(np.dot(reference, reference) * np.dot(other, other))
+    if n < 2 or energy == 0:
+        return 0.0, 0.0
+
+    size = 1 << int(2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(reference, size) * np.conj(np.fft.rfft(other, size))
+    correlation = np.fft.irfft(spectrum, size)
+
+    # correlation[k] = sum(reference[i] * other[i - k]); negative lags wrap around
+    max_lag = int(min(max_lag, n - 1))
+    lags = np.arange(-max_lag, max_lag + 1)
+    values = correlation[lags % size]
+    best = int(np.argmax(values))
+
+    shift = 0.0
+    if 0 < best < len(values) - 1:
+        left, centre, right = values[best - 1], values[best], values[best + 1]
+        denominator = left - 2 * centre + right
+        if denominator != 0:
+            shift = 0.5 * (left - right) / denominator
+    return float(lags[best] + shift), float(values[best] / energy)
+
+
+def estimate_clock_offset(reference, other, fit_drift=False, resample_seconds=RESAMPLE_SECONDS,
+                          max_lag_seconds=MAX_LAG_SECONDS, segments=DRIFT_SEGMENTS):
+    """
+    Estimate how far the clock of `other` is from the clock of `reference`.
+
+    Both pressure traces are interpolated onto a shared uniform grid,
+    detrended and cross-correlated with an FFT. With `fit_drift`, the
+    overlap is split into `segments` pieces whose residual offsets are fitted
+    with a straight line (pieces without pressure changes are skipped).
+
+    Returns a dict:
+    - `offset`: seconds to add to `other` at `reference_time`
+    - `drift`: extra seconds to add per second after `reference_time`
+    - `reference_time`: datetime the offset refers to
+    - `correlation`: peak normalised correlation (0..1, higher is better)
+    - `segments_used`: how many pieces supported the drift fit
+    """
+    if len(reference) < 2 or len(other) < 2:
+        raise ValueError("Both gauges need readings to estimate a clock offset")
+
+    ref_seconds, ref_pressures = _ordered_seconds(reference)
+    other_seconds, other_pressures = _ordered_seconds(other)
+
+    start = min(ref_seconds[0], other_seconds[0])
+    stop = max(ref_seconds[-1], other_seconds[-1])
+    grid = np.arange(start, stop + resample_seconds, resample_seconds)
+
+    lag, correlation = _cross_correlation_lag(
+        _resample(ref_seconds, ref_pressures, grid),
+        _resample(other_seconds, other_pressures, grid),
+        max_lag_seconds / resample_seconds,
+    )
+    offset = lag * resample_seconds
+    result = {
+        "offset": offset,
+        "drift": 0.0,
+        "reference_time": to_datetime(EPOCH + int(ref_seconds[0])),
+        "correlation": correlation,
+        "segments_used": 0,
+    }
+    if not fit_drift:
+        return result
+
+    # Residual offset per piece of the overlap, after removing the global offset
+    lo = max(ref_seconds[0], other_seconds[0] + offset)
+    hi = min(ref_seconds[-1], other_seconds[-1] + offset)
+    if hi - lo < segments * 60:
+        return result
+
+    centres, residuals, weights = [], [], []
+    edges = np.linspace(lo, hi, segments + 1)
+    for seg_lo, seg_hi in zip(edges[:-1], edges[1:]):
+        seg_grid = np.arange(seg_lo, seg_hi, resample_seconds)
+        ref_part = _detrend(np.interp(seg_grid, ref_seconds, ref_pressures))
+        other_part = _detrend(np.interp(seg_grid - offset, other_seconds, other_pressures))
+        if np.std(ref_part) < 1e-6 or np.std(other_part) < 1e-6:
+            continue  # Flat piece: no features to line up
+        seg_lag, seg_corr = _cross_correlation_lag(ref_part, other_part, len(seg_grid) // 4)
+        if seg_corr < MIN_SEGMENT_CORRELATION:
+            continue
+        centres.append(0.5 * (seg_lo + seg_hi) - ref_seconds[0])
+        residuals.append(seg_lag * resample_seconds)
+        weights.append(seg_corr)
+
+    if len(centres) >= 3:
+        drift, intercept = np.polyfit(centres, residuals, 1, w=weights)
+        result.update(offset=offset + float(intercept), drift=float(drift), segments_used=len(centres))
+    return result
+
+
+def apply_clock_correction(series, offset, drift=0.0, reference_time=None):
+    """
+    New GaugeSeries with `offset + drift * (t - reference_time)` seconds
+    added to every timestamp (rounded to whole seconds, like the gauge files).
+    """
+    if len(series) == 0:
+        return series
+    seconds = (series.times - EPOCH).astype(np.float64)
+    reference = seconds[0] if reference_time is None else \
+        float((np.datetime64(reference_time, "s") - EPOCH).astype(np.float64))
+    shifted = seconds + offset + drift * (seconds - reference)
+    times = EPOCH + np.rint(shifted).astype(np.int64)
+    return GaugeSeries(times, series.pressures, series.temperatures)
@@ -0,0 +1,254 @@
+# as2_writer.py
+import locale
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from features.survey.gauge_data import EPOCH, GaugeSeries, to_datetime
+
+CHUNK_ROWS = 262144  # Rows formatted and written per block
+SECONDS_PER_DAY = 86400
+
+# Layout of one AS2 row (matches the original line-by-line writer):
+# "{dd/mm/YYYY}  {HH:MM:SS}    {temp:.2f, right-aligned}     {pressure:.3f, right-aligned}  {event}\n"
+TEMP_DECIMALS = 2
+PRESSURE_DECIMALS = 3
+
+_time_of_day_table = None
+
+
+def _time_of_day_bytes():
+    """'HH:MM:SS' for every second of the day as an (86400, 8) uint8 table (built once)."""
+    global _time_of_day_table
+    if _time_of_day_table is None:
+        seconds = np.arange(SECONDS_PER_DAY)
+        parts = np.stack([seconds // 3600, seconds // 60 % 60, seconds % 60], axis=1)
+        table = np.full((SECONDS_PER_DAY, 8), ord(":"), dtype=np.uint8)
+        for i, column in enumerate((0, 3, 6)):
+            table[:, column] = ord("0") + parts[:, i] // 10
+            table[:, column + 1] = ord("0") + parts[:, i] % 10
+        _time_of_day_table = table
+    return _time_of_day_table
+
+
+def _max_formatted_length(values, decimals):
+    """
+    max(len(f"{v:.{decimals}f}")) without formatting every value.
+
+    The length of a fixed-point string only grows with |v|, so it is
+    enough to format the extremes (plus any inf/nan spellings).
+    """
+    candidates = []
+    for start in range(0, len(values), CHUNK_ROWS):  # Blockwise, so memory-mapped columns stay on disk
+        block = values[start:start + CHUNK_ROWS]
+        finite = np.isfinite(block)
+        if finite.any():
+            candidates += [f"{v:.{decimals}f}" for v in (block[finite].min(), block[finite].max())]
+        if not finite.all():
+            candidates += [f"{v:.{decimals}f}" for v in np.unique(block[~finite])]
+    return max(len(c) for c in candidates)
+
+
+def _format_fixed(values, decimals, width):
+    """
+    Right-aligned f"{v:.{decimals}f}" strings as an (n, width) uint8 matrix,
+    plus the unpadded length of each string.
+
+    Digits are produced with integer arithmetic on the rounded, scaled
+    value. Values whose rounding could differ from Python's exact decimal
+    rounding (near-ties, inf/nan, huge magnitudes) are formatted by Python.
+    """
+    n = len(values)
+    out = np.full((n, width), ord(" "), dtype=np.uint8)
+    if n == 0:
+        return out, np.zeros(0, dtype=np.int64)
+
+    scale = 10 ** decimals
+    scaled = values * scale
+    rounded = np.rint(scaled)
+    with np.errstate(invalid="ignore"):
+        tie_distance = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5)
+        exact = np.isfinite(scaled) & (np.abs(rounded) < 2 ** 52) & \
+            (tie_distance > 1e-6 + 8 * np.finfo(np.float64).eps * np.abs(scaled))
+
+    magnitude = np.where(exact, np.abs(rounded), 0).astype(np.int64)
+    int_part = magnitude // scale
+    frac_part = magnitude % scale
+
+    digits = np.ones(n, dtype=np.int64)
+    limit = 10
+    while True:
+        more = int_part >= limit
+        if not more.any():
+            break
+        digits += more
+        limit *= 10
+
+    # Fraction digits and decimal point, from the right-hand edge
+    column = width - 1
+    for _ in range(decimals):
+        out[:, column] = ord("0") + frac_part % 10
+        frac_part //= 10
+        column -= 1
+    out[:, column] = ord(".")
+    column -= 1
+
+    # Integer digits (variable count per row)
+    rows = np.arange(n)
+    for k in range(int(digits.max())):
+        active = digits > k
+        out[rows[active], column - k] = ord("0") + int_part[active] % 10
+        int_part //= 10
+
+    negative = np.signbit(values) & exact
+    if negative.any():
+        out[rows[negative], column - digits[negative]] = ord("-")
+
+    lengths = digits + 1 + decimals + negative
+    for i in np.flatnonzero(~exact):
+        text = f"{values[i]:.{decimals}f}"
+        out[i, :] = np.frombuffer(text.rjust(width).encode("ascii"), dtype=np.uint8)
+        lengths[i] = len(text)
+    return out, lengths
+
+
+def _date_bytes(days):
+    """'dd/mm/YYYY' for each day number, formatting each distinct day once."""
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    table = np.empty((len(unique_days), 10), dtype=np.uint8)
+    for i, day in enumerate(unique_days):
+        text = to_datetime(EPOCH + np.int64(day) * SECONDS_PER_DAY).strftime("%d/%m/%Y")
+        table[i] = np.frombuffer(text.encode("ascii")[:10].ljust(10), dtype=np.uint8)
+    return table[inverse.reshape(-1)]
+
+
+def _event_lookup(events):
+    """Sorted event seconds and descriptions; later duplicates win, as with the old dict lookup."""
+    latest = {}
+    for dt, desc in events or []:
+        latest[int((np.datetime64(dt, "s") - EPOCH).astype(np.int64))] = desc
+    keys = np.array(sorted(latest), dtype=np.int64)
+    return keys, [latest[k] for k in keys]
+
+
+def _match_events(seconds, event_keys):
+    """Index into event_keys for each row, -1 where the row has no event (sorted-timestamp join)."""
+    if len(event_keys) == 0:
+        return np.full(len(seconds), -1)
+    pos = np.searchsorted(event_keys, seconds)
+    pos_clipped = np.minimum(pos, len(event_keys) - 1)
+    return np.where(event_keys[pos_clipped] == seconds, pos_clipped, -1)
+
+
+def as2_output_path(input_file_path, output_directory=None):
+    """Same naming rule as before: <name>.txt -> <name>.AS2, next to the input or in `output_directory`."""
+    if output_directory:
+        base_filename = os.path.basename(input_file_path)
+        if base_filename.endswith('.txt'):
+            output_filename = base_filename.replace('.txt', '.AS2')
+        else:
+            output_filename = base_filename + '.AS2'
+        return os.path.join(output_directory, output_filename)
+
+    if input_file_path.endswith('.txt'):
+        return input_file_path.replace('.txt', '.AS2')
+    return input_file_path + '.AS2'
+
+
+def write_as2_file(output_file_path, series, events=None, chunk_rows=CHUNK_ROWS):
+    """
+    Write one gauge as an AS2 file in large formatted blocks.
+
+    Output is byte-identical to writing each row with strftime and
+    f-strings through a text-mode file (platform newline and encoding).
+    """
+    series = GaugeSeries.from_records(series)
+    if len(series) == 0:
+        with open(output_file_path, 'w'):
+            pass
+        return output_file_path
+
+    newline = os.linesep.encode("ascii")
+    encoding = locale.getpreferredencoding(False)
+    event_keys, event_descs = _event_lookup(events)
+    encoded_descs = [desc.encode(encoding) for desc in event_descs]
+
+    # The historical writer padded temperatures to the widest "%.3f" and
+    # pressures to the widest "%.2f" while printing them with 2 and 3
+    # decimals. Temperatures therefore always fit their column, but a
+    # pressure can overflow its pad width by one character, so rows are
+    # laid out at the widest possible size and the surplus leading pad
+    # bytes are dropped per row.
+    temp_width = _max_formatted_length(series.temperatures, 3)
+    pressure_pad = _max_formatted_length(series.pressures, 2)
+    pressure_width = max(pressure_pad, _max_formatted_length(series.pressures, PRESSURE_DECIMALS))
+
+    # Column offsets inside the widest row
+    date_at, time_at = 0, 12
+    temp_at = time_at + 8 + 4
+    pressure_at = temp_at + temp_width + 5
+    fixed_width = pressure_at + pressure_width + 2
+    row_width = fixed_width + len(newline)
+    pad_columns = np.arange(pressure_width)
+
+    time_table = _time_of_day_bytes()
+
+    with open(output_file_path, 'wb', buffering=4 * 1024 * 1024) as f:
+        for start in range(0, len(series), chunk_rows):
+            stop = min(start + chunk_rows, len(series))
+            seconds = (series.times[start:stop] - EPOCH).astype(np.int64)
+
+            block = np.full((stop - start, row_width), ord(" "), dtype=np.uint8)
+            block[:, date_at:date_at + 10] = _date_bytes(seconds // SECONDS_PER_DAY)
+            block[:, time_at:time_at + 8] = time_table[seconds % SECONDS_PER_DAY]
+            block[:, temp_at:temp_at + temp_width], _ = _format_fixed(
+                series.temperatures[start:stop], TEMP_DECIMALS, temp_width)
+            block[:, pressure_at:pressure_at + pressure_width], pressure_lengths = _format_fixed(
+                series.pressures[start:stop], PRESSURE_DECIMALS, pressure_width)
+            block[:, fixed_width:] = np.frombuffer(newline, dtype=np.uint8)
+
+            # Drop the pad bytes a narrower row never had
+            surplus = pressure_width - np.maximum(pressure_pad, pressure_lengths)
+            if surplus.any():
+                keep = np.ones(block.shape, dtype=bool)
+                keep[:, pressure_at:pressure_at + pressure_width] = pad_columns[None, :] >= surplus[:, None]
+                data = block[keep]
+                row_ends = np.cumsum(row_width - surplus)
+            else:
+                data = block.reshape(-1)
+                row_ends = np.arange(1, stop - start + 1) * row_width
+            row_starts = row_ends - (row_width - surplus)
+
+            event_index = _match_events(seconds, event_keys)
+            event_rows = np.flatnonzero(event_index >= 0)
+
+            # Plain rows go out as contiguous blocks; event rows carry their description
+            previous = 0
+            for row in event_rows:
+                f.write(data[previous:row_starts[row]].tobytes())
+                f.write(data[row_starts[row]:row_ends[row] - len(newline)].tobytes())
+                f.write(encoded_descs[event_index[row]] + newline)
+                previous = row_ends[row]
+            f.write(data[previous:].tobytes())
+
+    return output_file_path
+
+
+def write_as2_files(jobs, events=None, max_workers=2):
+    """
+    Write several gauges concurrently.
+
+    `jobs` is a list of (output_file_path, series). Returns the output paths
+    in the same order, with None for any gauge that failed.
+    """
+    def run(job):
+        output_file_path, series = job
+        try:
+            return write_as2_file(output_file_path, series, events)
+        except Exception as e:
+            print(f"Error generating AS2 file: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run, jobs))
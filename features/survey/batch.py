@@ -0,0 +1,286 @@
+# batch.py
+"""
+Headless survey processing.
+
+    python -m features.survey.batch manifest.json [--workers N]
+
+The manifest is JSON with a list of jobs. Each job produces the filled
+interpretation template (with a gradient analysis sheet), the MD-to-TVD
+workbook, the two AS2 files, a data quality report and a gradient and
+fluid-contact summary, as "Process Data" does in the Survey app, but
+without Qt. The stations of every job are also collected in one
+Survey_Summary.xlsx in the manifest's output folder. A manifest looks like:
+
+    {
+      "output_dir": "out",
+      "jobs": [
+        {
+          "name": "Well-1",
+          "top_file": "top.txt", "bottom_file": "bottom.txt",
+          "location": "Field A", "well": "Well-1", "date": "2024-02-01",
+          "bdf": 50, "sea_level": 80, "gauge_type": "SGS", "spm_depths": [],
+          "stations": [
+            {"station": "ATM", "depth": 0, "start": "10:05:00", "end": "10:50:00"},
+            {"station": "SGS", "depth": 3000, "start": "12:35:00", "end": "13:05:00"}
+          ],
+          "tvd": {"ahd_values": [0, 5000], "tvd_values": [0, 4800]},
+          "resample": ["1 min"]
+        },
+        {"survey": "saved.survey"}
+      ]
+    }
+
+`resample` (optional) also writes each gauge averaged to the given
+resolutions ("1 s", "10 s", "1 min" or a number of seconds) as CSV. Every
+file a job writes starts with its name, so jobs whose gauge files share a
+name (top.txt, say) can share an output folder.
+Relative paths are resolved against the manifest's folder. A job may point
+at a saved `.survey` file instead; its stored stations, TVD table and events
+are used. Jobs run in separate processes, one per core by default.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from features.survey.as2_writer import as2_output_path, write_as2_files
+from features.survey.gauge_data import load_gauge_file
+from features.survey.gradients import analyse_gradients, format_gradient_summary
+from features.survey.quality import check_gauge_quality, format_quality_report
+from features.survey.resample import RESOLUTIONS, write_resampled_csv
+from features.survey.survey_file import read_survey
+from features.survey.survey_report import (
+    fill_interpretation_template, fill_tvd_workbook, generate_events, station_result_rows, statistics_rows,
+)
+from utils.excel_templates import stream_workbook
+
+SUMMARY_FILE = "Survey_Summary.xlsx"
+SUMMARY_HEADER = [
+    "Job", "Station", "Depth", "Start", "End", "AHD", "TVD",
+    "Top P High", "Top P Low", "Top P Median", "Top T High", "Top T Low", "Top T Median",
+    "Bottom P High", "Bottom P Low", "Bottom P Median", "Bottom T High", "Bottom T Low", "Bottom T Median",
+]
+
+
+class BatchJobError(Exception):
+    """Raised when a manifest job is incomplete or inconsistent."""
+
+
+def _parse_station_time(value, survey_date):
+    """'HH:MM[:SS]' on the survey date, or a full ISO date-time."""
+    if "T" in value or " " in value.strip():
+        return datetime.datetime.fromisoformat(value)
+    parts = [int(part) for part in value.split(":")]
+    return datetime.datetime.combine(survey_date, datetime.time(*parts))
+
+
+def station_timings(stations, survey_date):
+    """
+    Station dicts with datetimes, following the same rules as the station
+    table: an end before its start is on the next day, and a start before
+    the previous station's start means the survey ran past midnight.
+    """
+    timings = []
+    for entry in stations:
+        start = _parse_station_time(str(entry["start"]), survey_date)
+        end = _parse_station_time(str(entry["end"]), start.date())
+        if end < start:
+            end += datetime.timedelta(days=1)
+        if timings and start < timings[-1]["start"]:
+            survey_date += datetime.timedelta(days=1)
+            start += datetime.timedelta(days=1)
+            end += datetime.timedelta(days=1)
+        if end.date() > survey_date:
+            survey_date = end.date()
+
+        timings.append({
+            "station": entry["station"],
+            "depth": float(entry.get("depth", 0.0)),
+            "start": start,
+            "end": end,
+            "duration": (end - start).total_seconds() / 3600.0,
+        })
+    return timings
+
+
+def _resolve(path, base_dir):
+    return path if not path or os.path.isabs(path) else os.path.join(base_dir, path)
+
+
+def load_job(job, base_dir):
+    """Survey state for one manifest job (gauge data loaded, times resolved)."""
+    if job.get("survey"):
+        state = read_survey(_resolve(job["survey"], base_dir))
+        state.setdefault("name", os.path.splitext(os.path.basename(job["survey"]))[0])
+        state.update({key: value for key, value in job.items() if key not in ("survey",)})
+        return state
+
+    for key in ("top_file", "bottom_file", "date", "stations"):
+        if not job.get(key):
+            raise BatchJobError(f"Job is missing '{key}'")
+
+    survey_date = datetime.date.fromisoformat(job["date"])
+    top_file = _resolve(job["top_file"], base_dir)
+    bottom_file = _resolve(job["bottom_file"], base_dir)
+    tvd = job.get("tvd") or {}
+    return {
+        "name": job.get("name") or job.get("well") or os.path.splitext(os.path.basename(top_file))[0],
+        "top_file_path": top_file,
+        "bottom_file_path": bottom_file,
+        "top_data": load_gauge_file(top_file),
+        "bottom_data": load_gauge_file(bottom_file),
+        "location": job.get("location", ""),
+        "well": job.get("well", ""),
+        "date": survey_date,
+        "bdf": float(job.get("bdf", 0.0)),
+        "sea_level": float(job.get("sea_level", 0.0)),
+        "gauge_type": job.get("gauge_type", "SGS"),
+        "spm_depths": job.get("spm_depths", []) if job.get("gauge_type") == "FGS" else [],
+        "station_timings": station_timings(job["stations"], survey_date),
+        "tvd_data": {
+            "ahd_values": [float(v) for v in tvd.get("ahd_values", [])],
+            "tvd_values": [float(v) for v in tvd.get("tvd_values", [])],
+        },
+        "output_dir": job.get("output_dir"),
+        "resample": job.get("resample", []),
+    }
+
+
+def run_job(job, base_dir, output_dir):
+    """Process one job in a worker process. Returns (name, files written, seconds, station rows)."""
+    started = time.perf_counter()
+    state = load_job(job, base_dir)
+    output_dir = _resolve(state.get("output_dir"), base_dir) or output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Every file is named after the job: jobs whose gauge files share a name write to the same folder
+    def job_file(file_name):
+        return os.path.join(output_dir, f"{state['name']}_{file_name}")
+
+    top_data, bottom_data = state["top_data"], state["bottom_data"]
+    if not top_data or not bottom_data:
+        raise BatchJobError("Both gauges need readings")
+
+    # Data quality report next to the outputs
+    quality_file = job_file("QC.txt")
+    with open(quality_file, "w", encoding="utf-8") as f:
+        for label, data in (("Top Gauge", top_data), ("Bottom Gauge", bottom_data)):
+            f.write(format_quality_report(check_gauge_quality(data, state["station_timings"]), label) + "\n\n")
+
+    rows = station_result_rows(state["station_timings"], top_data, bottom_data,
+                               state["tvd_data"], state["bdf"])
+
+    analysis = analyse_gradients(state["station_timings"], {"top": top_data, "bottom": bottom_data},
+                                 state["tvd_data"], state["bdf"])
+    gradient_file = job_file("Gradients.txt")
+    with open(gradient_file, "w", encoding="utf-8") as f:
+        f.write(format_gradient_summary(analysis) + "\n")
+
+    template_file = job_file("Interpretation.xlsx")
+    fill_interpretation_template(template_file, statistics_rows(rows), state, analysis)
+
+    outputs = [template_file, quality_file, gradient_file]
+    if state["tvd_data"].get("ahd_values"):
+        outputs.append(fill_tvd_workbook(job_file("TVD.xlsx"), state))
+
+    events = state.get("events") or generate_events(top_data, bottom_data, state["station_timings"])
+    as2_paths = write_as2_files(
+        [(job_file(os.path.basename(as2_output_path(state["top_file_path"]))), top_data),
+         (job_file(os.path.basename(as2_output_path(state["bottom_file_path"]))), bottom_data)],
+        events
+    )
+    if None in as2_paths:
+        raise BatchJobError("Failed to write AS2 files")
+    outputs.extend(as2_paths)
+
+    for resolution in state.get("resample") or []:
+        interval = RESOLUTIONS.get(resolution) or int(resolution)
+        suffix = str(resolution).replace(" ", "") if resolution in RESOLUTIONS else f"{interval}s"
+        for path, data in ((state["top_file_path"], top_data), (state["bottom_file_path"], bottom_data)):
+            name = os.path.splitext(os.path.basename(path))[0]
+            outputs.append(write_resampled_csv(job_file(f"{name}_{suffix}.csv"), data, interval))
+    return state["name"], outputs, time.perf_counter() - started, rows
+
+
+def write_summary(file_path, jobs):
+    """One streamed sheet with every station of every job: [(name, station result rows), ...]."""
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    return stream_workbook(file_path, {
+        "Stations": itertools.chain(
+            [SUMMARY_HEADER],
+            ([name] + [_summary_value(value) for value in row] for name, rows in jobs for row in rows),
+        )
+    })
+
+
+def _summary_value(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+
+def run_manifest(manifest_path, workers=None):
+    """Run every job of a manifest. Returns the number of failed jobs."""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    output_dir = _resolve(manifest.get("output_dir") or ".", base_dir)
+    jobs = manifest.get("jobs", [])
+    if not jobs:
+        print("⚠️ Manifest has no jobs")
+        return 0
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    print(f"Processing {len(jobs)} survey job(s) with {workers} worker(s)")
+
+    failures = 0
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, base_dir, output_dir): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            label = jobs[index].get("name") or jobs[index].get("survey") or f"job {index + 1}"
+            try:
+                name, outputs, seconds, rows = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"⚠️ {label}: {e}")
+                continue
+            print(f"✔ {name} ({seconds:.1f} s)")
+            for path in outputs:
+                print(f"    {path}")
+            summaries[index] = (name, rows)
+
+    if summaries:
+        summary_file = write_summary(os.path.join(output_dir, SUMMARY_FILE),
+                                     [summaries[index] for index in sorted(summaries)])
+        print(f"Summary: {summary_file}")
+    print(f"Done: {len(jobs) - failures} succeeded, {failures} failed")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m features.survey.batch",
+        description="Generate interpretation templates, TVD workbooks and AS2 files for a manifest of surveys."
+    )
+    parser.add_argument("manifest", help="JSON manifest of survey jobs")
+    parser.add_argument("--workers", type=int, default=None, help="parallel jobs (default: one per CPU core)")
+    args = parser.parse_args(argv)
+
+    try:
+        failures = run_manifest(args.manifest, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read manifest: {e}")
+        return 2
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
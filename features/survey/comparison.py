@@ -0,0 +1,153 @@
+# comparison.py
+import math
+import os
+
+import numpy as np
+
+from features.survey.gauge_cache import get_gauge_cache
+from features.survey.gauge_data import EPOCH, GaugeSeries
+from features.survey.gradients import interval_gradients, station_tvds
+from features.survey.resample import resample
+from features.survey.survey_file import read_survey
+
+GAUGES = ("top", "bottom")
+VIEW_MAX_POINTS = 4000       # Points per curve for the visible range (a few per screen pixel)
+OVERVIEW_MAX_POINTS = 4000   # Points per curve for the whole survey, kept in memory
+
+
+class ComparisonSurvey:
+    """
+    A saved survey opened for comparison.
+
+    Only the metadata and station table stay in memory. Gauge columns are
+    extracted once into the gauge cache and memory-mapped, so reading the
+    visible time range touches just those pages of the file; the curves are
+    resampled to about VIEW_MAX_POINTS per viewport.
+    """
+
+    def __init__(self, file_path):
+        state = read_survey(file_path)
+        self.file_path = file_path
+        self.name = os.path.splitext(os.path.basename(file_path))[0]
+        self.location = state.get("location") or ""
+        self.well = state.get("well") or ""
+        self.date = state.get("date")
+        self.bdf = state.get("bdf") or 0.0
+        self.gauge_type = state.get("gauge_type", "SGS")
+        self.station_timings = state.get("station_timings") or []
+        self.tvd_data = state.get("tvd_data") or {}
+
+        # Lazy series from the container: nothing is decompressed until a gauge is first used
+        self._sources = {gauge: state.get(f"{gauge}_data") for gauge in GAUGES}
+        self._gauges = {}
+        self._overviews = {}
+
+    @property
+    def label(self):
+        date = self.date.strftime("%d/%m/%Y") if self.date else ""
+        return f"{self.well or self.name} {date}".strip()
+
+    def gauge(self, gauge="top"):
+        """Memory-mapped, time-ordered GaugeSeries for one gauge, or None if the survey has none."""
+        if gauge in self._gauges:
+            return self._gauges[gauge]
+
+        cache = get_gauge_cache()
+        series = cache.get(self.file_path, part=gauge)
+        if series is None:
+            source = self._sources.get(gauge)
+            if source is None or len(source) == 0:
+                return None
+            ordered = source.ordered()
+            cache.put(self.file_path, ordered, part=gauge)
+            series = cache.get(self.file_path, part=gauge) or ordered
+
+        self._sources[gauge] = None  # Let the decompressed copy go
+        self._gauges[gauge] = series
+        return series
+
+    def origin(self):
+        """Time zero for elapsed-time alignment: the first station start, else the first reading."""
+        if self.station_timings:
+            return np.datetime64(min(station["start"] for station in self.station_timings), "s")
+        series = self.gauge("top") or self.gauge("bottom")
+        return series.times[0] if series is not None and len(series) else EPOCH
+
+    def _to_hours(self, times):
+        return (times - self.origin()).astype(np.float64) / 3600.0
+
+    def overview(self, gauge="top"):
+        """(hours, pressures, temperatures) for the whole survey at a coarse, cached resolution."""
+        if gauge not in self._overviews:
+            series = self.gauge(gauge)
+            if series is None or len(series) == 0:
+                self._overviews[gauge] = None
+            else:
+                span = int((series.times[-1] - series.times[0]).astype(np.int64))
+                interval = max(1, math.ceil(span / OVERVIEW_MAX_POINTS))
+                coarse = resample(series, interval, "mean", fill_gaps=True) if len(series) > OVERVIEW_MAX_POINTS \
+                    else series
+                self._overviews[gauge] = (self._to_hours(coarse.times), np.asarray(coarse.pressures),
+                                          np.asarray(coarse.temperatures))
+        return self._overviews[gauge]
+
+    def viewport(self, gauge, start_hours, end_hours, max_points=VIEW_MAX_POINTS):
+        """
+        (hours, pressures, temperatures) for the readings between two elapsed
+        times, resampled to at most about `max_points` rows. Returns None
+        when the survey has no readings there.
+        """
+        series = self.gauge(gauge)
+        if series is None or len(series) == 0:
+            return None
+
+        origin = self.origin()
+        start = origin + np.timedelta64(int(math.floor(start_hours * 3600)), "s")
+        end = origin + np.timedelta64(int(math.ceil(end_hours * 3600)), "s")
+        lo = int(np.searchsorted(series.times, start, side="left"))
+        hi = int(np.searchsorted(series.times, end, side="right"))
+        if hi - lo < 2:
+            return None
+
+        # Views into the memory map: only the visible rows are read
+        part = GaugeSeries(series.times[lo:hi], series.pressures[lo:hi], series.temperatures[lo:hi], is_sorted=True)
+        if len(part) > max_points:
+            span = int((part.times[-1] - part.times[0]).astype(np.int64))
+            part = resample(part, max(1, math.ceil(span / max_points)), "mean", fill_gaps=True)
+        return self._to_hours(part.times), np.asarray(part.pressures), np.asarray(part.temperatures)
+
+    def station_depths(self):
+        """True vertical depth of each station when the AHD/TVD table covers it, else the wireline depth."""
+        return station_tvds(self.station_timings, self.tvd_data, self.bdf).tolist()
+
+    def station_points(self, gauge="top"):
+        """
+        One dict per station with a depth reading: station, depth (TVD where
+        known), and the median pressure and temperature over the station.
+        """
+        series = self.gauge(gauge)
+        if series is None:
+            return []
+        points = []
+        for station, depth in zip(self.station_timings, self.station_depths()):
+            if station["station"] == "ATM":
+                continue
+            stats = series.station_statistics(station["start"], station["end"])
+            if stats is None:
+                continue
+            points.append({
+                "station": station["station"],
+                "depth": depth,
+                "pressure": stats[2],
+                "temperature": stats[5],
+            })
+        return points
+
+    def gradients(self, gauge="top"):
+        """(mid depth, psi/ft) between consecutive stations ordered by depth."""
+        points = sorted(self.station_points(gauge), key=lambda point: point["depth"])
+        if len(points) < 2:
+            return []
+        mids, values = interval_gradients([point["depth"] for point in points],
+                                          [point["pressure"] for point in points])
+        return [(float(mid), float(value)) for mid, value in zip(mids, values) if np.isfinite(value)]
@@ -0,0 +1,168 @@
+# gauge_cache.py
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from features.survey.gauge_data import GaugeSeries
+from utils.path_finder import get_cache_dir
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB of parsed gauge arrays
+HASH_BLOCK_SIZE = 1024 * 1024  # Bytes sampled from head, middle and tail of the file
+COLUMNS = ("times", "pressures", "temperatures")
+
+
+def fast_content_hash(file_path, size):
+    """Hash of the file size plus three sampled blocks — cheap even for multi-GB files."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+    with open(file_path, "rb") as f:
+        for offset in sorted({0, max(size // 2 - HASH_BLOCK_SIZE // 2, 0), max(size - HASH_BLOCK_SIZE, 0)}):
+            f.seek(offset)
+            digest.update(f.read(HASH_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+class GaugeCache:
+    """
+    Sidecar cache of parsed gauge files.
+
+    Each entry is a folder of plain `.npy` columns (so they can be memory
+    mapped) plus a small `meta.json`, named after a key built from the
+    source path, size, mtime and a sampled content hash. Entries are evicted
+    least-recently-used first once the folder exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or get_cache_dir("gauge_cache")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key_for(self, file_path, part=None):
+        """Entry key; `part` tells apart several gauges stored in one source file (e.g. a .survey)."""
+        stat = os.stat(file_path)
+        content_hash = fast_content_hash(file_path, stat.st_size)
+        raw = f"{CACHE_FORMAT_VERSION}|{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash}"
+        if part:
+            raw += f"|{part}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, file_path, part=None):
+        """Return a memory-mapped GaugeSeries for an unchanged file, or None on a miss."""
+        try:
+            entry = self.entry_dir(self.key_for(file_path, part))
+            meta_path = os.path.join(entry, "meta.json")
+            if not os.path.exists(meta_path):
+                return None
+
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+            # Streamed entries are preallocated, so only the first `rows` are readings
+            rows = meta["rows"]
+            columns = [np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r")[:rows] for name in COLUMNS]
+            os.utime(meta_path)  # Mark as recently used for LRU eviction
+            return GaugeSeries(*columns, is_sorted=meta.get("sorted"))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Gauge cache read failed: {e}")
+            return None
+
+    def put(self, file_path, series, part=None):
+        """Store a parsed series for `file_path`; failures are logged and ignored."""
+        def write_columns(directory):
+            for name in COLUMNS:
+                np.save(os.path.join(directory, f"{name}.npy"), np.asarray(getattr(series, name)))
+            return {"rows": len(series), "sorted": series.is_sorted}
+
+        return self.put_streamed(file_path, write_columns, part)
+
+    def put_streamed(self, file_path, fill, part=None, raise_errors=False):
+        """
+        Create the entry for `file_path` by calling `fill(directory)`, which
+        writes the column files and returns metadata including `rows`.
+        Used directly by the out-of-core ingest; OS failures are logged and
+        ignored unless `raise_errors` (the entry is then the only copy of the
+        data), parse errors from `fill` propagate.
+        """
+        tmp_entry = None
+        try:
+            key = self.key_for(file_path, part)
+            entry = self.entry_dir(key)
+            if os.path.exists(entry):
+                return entry
+
+            tmp_entry = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+            os.makedirs(tmp_entry, exist_ok=True)
+            meta = fill(tmp_entry)
+            with open(os.path.join(tmp_entry, "meta.json"), "w") as f:
+                json.dump({**meta, "source": os.path.abspath(file_path), "part": part,
+                           "version": CACHE_FORMAT_VERSION}, f)
+
+            try:
+                os.replace(tmp_entry, entry)
+            except OSError:
+                shutil.rmtree(tmp_entry, ignore_errors=True)  # Another writer got there first
+
+            self.evict(keep=entry)
+            return entry
+        except OSError as e:
+            print(f"⚠️ Gauge cache write failed: {e}")
+            if raise_errors:
+                raise
+            return None
+        finally:
+            if tmp_entry and os.path.exists(tmp_entry):
+                shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def entries(self):
+        """(last_used, size_bytes, path) for every complete entry."""
+        result = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(path, "meta.json")
+            if ".tmp-" in name or not os.path.exists(meta_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            result.append((os.path.getmtime(meta_path), size, path))
+        return result
+
+    def evict(self, keep=None):
+        """
+        Drop least-recently-used entries until the cache fits in `max_bytes`.
+        The entry `keep` (the one just written) stays even when it alone is larger.
+        """
+        with self._lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and os.path.samefile(path, keep):
+                    continue
+                try:
+                    shutil.rmtree(path)
+                    total -= size
+                except OSError:
+                    continue  # Still memory-mapped by an open survey (Windows)
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+
+_default_cache = None
+
+
+def get_gauge_cache():
+    """Process-wide GaugeCache instance."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GaugeCache()
+    return _default_cache
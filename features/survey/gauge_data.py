@@ -0,0 +1,276 @@
+# gauge_data.py
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+EPOCH = np.datetime64("1970-01-01T00:00:00", "s")
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y")
+TIME_FORMAT = "%H:%M:%S"
+SORT_CHECK_ROWS = 4_000_000  # Rows compared per block when checking time order
+
+
+class GaugeSeries:
+    """
+    Columnar memory gauge readings.
+
+    - `times` are naive datetime64[s] (gauge clock, no timezone)
+    - `pressures` (psia) and `temperatures` (°F) are float64
+
+    The arrays may be plain ndarrays or read-only memory maps, so callers
+    must never modify them in place. A series can also be created lazily
+    (see `GaugeSeries.lazy`): its length is known up front and the columns
+    are only read when first accessed.
+    """
+    __slots__ = ("_times", "_pressures", "_temperatures", "_loader", "_length", "_is_sorted")
+
+    def __init__(self, times, pressures, temperatures, is_sorted=None):
+        self._loader = None
+        self._set_columns(times, pressures, temperatures, is_sorted)
+
+    def _set_columns(self, times, pressures, temperatures, is_sorted=None):
+        self._times = np.asarray(times, dtype="datetime64[s]")
+        self._pressures = np.asarray(pressures, dtype=np.float64)
+        self._temperatures = np.asarray(temperatures, dtype=np.float64)
+        self._length = len(self._times)
+        self._is_sorted = is_sorted
+
+    @classmethod
+    def lazy(cls, length, loader):
+        """Series whose columns come from `loader()` -> (times, pressures, temperatures) on first use."""
+        series = cls.__new__(cls)
+        series._times = series._pressures = series._temperatures = None
+        series._loader = loader
+        series._length = length
+        series._is_sorted = None
+        return series
+
+    def _ensure_loaded(self):
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            self._set_columns(*loader())
+
+    @property
+    def is_loaded(self):
+        return self._loader is None
+
+    @property
+    def times(self):
+        self._ensure_loaded()
+        return self._times
+
+    @property
+    def pressures(self):
+        self._ensure_loaded()
+        return self._pressures
+
+    @property
+    def temperatures(self):
+        self._ensure_loaded()
+        return self._temperatures
+
+    def __len__(self):
+        return self._length
+
+    def __getstate__(self):
+        return {"times": np.asarray(self.times), "pressures": np.asarray(self.pressures),
+                "temperatures": np.asarray(self.temperatures)}
+
+    def __setstate__(self, state):
+        self.__init__(state["times"], state["pressures"], state["temperatures"])
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from the legacy list of (datetime, pressure, temperature) tuples."""
+        if isinstance(records, GaugeSeries):
+            return records
+        if not records:
+            return cls.empty()
+        times, pressures, temps = zip(*records)
+        return cls(np.array(times, dtype="datetime64[s]"), pressures, temps)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, dtype="datetime64[s]"), np.empty(0), np.empty(0))
+
+    @property
+    def is_sorted(self):
+        """True when timestamps never go backwards (cached after first check, checked in blocks)."""
+        if self._is_sorted is None:
+            times = self.times
+            last = len(times) - 1
+            self._is_sorted = True
+            for start in range(0, max(last, 0), SORT_CHECK_ROWS):
+                stop = min(start + SORT_CHECK_ROWS, last)
+                if not np.all(times[start + 1:stop + 1] >= times[start:stop]):
+                    self._is_sorted = False
+                    break
+        return self._is_sorted
+
+    def ordered(self):
+        """This series in time order (itself when already sorted)."""
+        if self.is_sorted:
+            return self
+        order = np.argsort(self.times, kind="stable")
+        return GaugeSeries(self.times[order], self.pressures[order], self.temperatures[order], is_sorted=True)
+
+    def seconds(self):
+        """Timestamps as float seconds since 1970-01-01 (naive), used as the plot x axis."""
+        return (self.times - EPOCH).astype(np.float64)
+
+    def start_time(self):
+        return to_datetime(self.times.min()) if len(self) else None
+
+    def window(self, start, end):
+        """Index (slice or mask) of readings with start <= time <= end."""
+        start_np = np.datetime64(start, "s")
+        end_np = np.datetime64(end, "s")
+        if self.is_sorted:
+            lo = np.searchsorted(self.times, start_np, side="left")
+            hi = np.searchsorted(self.times, end_np, side="right")
+            return slice(lo, hi)
+        return (self.times >= start_np) & (self.times <= end_np)
+
+    def station_statistics(self, start, end):
+        """High / low / median pressure and temperature between two datetimes, or None if empty."""
+        idx = self.window(start, end)
+        p_slice = self.pressures[idx]
+        if len(p_slice) == 0:
+            return None
+        t_slice = self.temperatures[idx]
+        return [
+            float(np.max(p_slice)), float(np.min(p_slice)), float(np.median(p_slice)),
+            float(np.max(t_slice)), float(np.min(t_slice)), float(np.median(t_slice))
+        ]
+
+
+def to_datetime(value):
+    """numpy datetime64 -> naive Python datetime (second resolution)."""
+    seconds = int((np.datetime64(value, "s") - EPOCH).astype(np.int64))
+    return datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=seconds)
+
+
+def to_plot_seconds(value):
+    """Naive datetime -> seconds on the same x axis as GaugeSeries.seconds()."""
+    return float((np.datetime64(value, "s") - EPOCH).astype(np.float64))
+
+
+def from_plot_seconds(value):
+    """Inverse of to_plot_seconds for axis labels and cursor readouts."""
+    return datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=float(value))
+
+
+def find_data_start(file_path):
+    """Return the number of lines before the first reading (header + unit line), or None."""
+    with open(file_path, "r", errors="replace") as f:
+        for i, line in enumerate(f):
+            if "Date" in line and "Time" in line and "Press" in line:
+                return i + 2  # Skip header and unit line
+    return None
+
+
+def _parse_unique(values, formats, origin):
+    """Seconds since `origin` for each unique string, NaN where no format matches."""
+    seconds = np.full(len(values), np.nan)
+    for i, value in enumerate(values):
+        for fmt in formats:
+            try:
+                seconds[i] = (datetime.datetime.strptime(value, fmt) - origin).total_seconds()
+                break
+            except (TypeError, ValueError):
+                continue
+    return seconds
+
+
+def parse_reading_frame(frame):
+    """
+    Convert a raw frame (date, time, pressure, temperature) into clean
+    columns, dropping any row that fails to parse.
+
+    Gauge files repeat the same few dates and at most 86,400 distinct
+    times of day, so each unique string is parsed once and broadcast back.
+    """
+    date_codes, dates = pd.factorize(frame["date"].str.replace("-", "/", regex=False))
+    time_codes, times_of_day = pd.factorize(frame["time"])
+
+    day_seconds = _parse_unique(dates, DATE_FORMATS, datetime.datetime(1970, 1, 1))
+    tod_seconds = _parse_unique(times_of_day, [TIME_FORMAT], datetime.datetime(1900, 1, 1))
+
+    seconds = np.full(len(frame), np.nan)
+    known = (date_codes >= 0) & (time_codes >= 0)
+    seconds[known] = day_seconds[date_codes[known]] + tod_seconds[time_codes[known]]
+
+    pressures = pd.to_numeric(frame["pressure"], errors="coerce").to_numpy(dtype=np.float64)
+    temps = pd.to_numeric(frame["temperature"], errors="coerce").to_numpy(dtype=np.float64)
+
+    valid = ~(np.isnan(seconds) | np.isnan(pressures) | np.isnan(temps))
+    return (
+        EPOCH + seconds[valid].astype(np.int64),
+        pressures[valid],
+        temps[valid],
+    )
+
+
+def read_reading_frames(file_path, skip_rows, chunk_size=None):
+    """pandas reader over the whitespace separated reading block of a gauge file."""
+    return pd.read_csv(
+        file_path,
+        sep=r"\s+",
+        header=None,
+        names=["date", "time", "pressure", "temperature"],
+        usecols=[0, 1, 2, 3],
+        index_col=False,
+        dtype={"date": str, "time": str},
+        skiprows=skip_rows,
+        skip_blank_lines=True,
+        on_bad_lines="skip",
+        encoding_errors="replace",
+        chunksize=chunk_size,
+        engine="c",
+    )
+
+
+def parse_gauge_txt(file_path):
+    """
+    Parse an SGS/FGS gauge .txt export (PPS SmartView / MetroWin) into a GaugeSeries.
+
+    Raises ValueError when the Date/Time/Press header cannot be found.
+    """
+    data_start = find_data_start(file_path)
+    if data_start is None:
+        raise ValueError("Could not find data headers in file")
+
+    times, pressures, temps = parse_reading_frame(read_reading_frames(file_path, data_start))
+    return GaugeSeries(times, pressures, temps)
+
+
+def load_gauge_file(file_path, use_cache=True):
+    """
+    Load a gauge file, reusing the on-disk binary cache when the file is unchanged.
+
+    Files of OUT_OF_CORE_BYTES or more are never held in memory: they are
+    streamed block by block into memory-mapped columns in the cache.
+    """
+    if not use_cache:
+        return parse_gauge_txt(file_path)
+
+    from features.survey.gauge_cache import get_gauge_cache
+    from features.survey.gauge_ingest import OUT_OF_CORE_BYTES, stream_gauge_txt
+
+    cache = get_gauge_cache()
+    series = cache.get(file_path)
+    if series is not None:
+        return series
+
+    if os.path.getsize(file_path) >= OUT_OF_CORE_BYTES:
+        # Write failures (disk full, cache folder not writable) reach the caller with their real cause
+        cache.put_streamed(file_path, lambda directory: stream_gauge_txt(file_path, directory), raise_errors=True)
+        series = cache.get(file_path)
+        if series is None:
+            raise OSError(f"Could not read back the cached copy of this gauge file from {cache.cache_dir}")
+        return series
+
+    series = parse_gauge_txt(file_path)
+    cache.put(file_path, series)
+    return cache.get(file_path) or series  # Hand back the memory-mapped copy
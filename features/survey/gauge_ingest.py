@@ -0,0 +1,163 @@
+# gauge_ingest.py
+import math
+import os
+
+import numpy as np
+
+from features.survey.gauge_data import EPOCH, find_data_start, parse_reading_frame, read_reading_frames
+from features.survey.resample import resample
+
+OUT_OF_CORE_BYTES = 256 * 1024 ** 2   # Gauge files at least this big are streamed to disk
+INGEST_CHUNK_ROWS = 500_000           # Text rows parsed per block (~100 MB of pandas strings)
+COPY_CHUNK_ROWS = 4_000_000           # Rows moved per block when a column file has to grow
+PLOT_MAX_POINTS = 2_000_000           # Larger series are drawn as a min/max envelope
+SAMPLE_BYTES = 1024 * 1024            # Text sampled to estimate the number of rows
+COLUMN_DTYPES = {
+    "times": "datetime64[s]",
+    "pressures": np.float64,
+    "temperatures": np.float64,
+}
+
+
+def estimate_rows(file_path, data_start):
+    """Rough row count from the average line length of the first reading block."""
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        for _ in range(data_start):
+            f.readline()
+        header_bytes = f.tell()
+        sample = f.read(SAMPLE_BYTES)
+    lines = sample.count(b"\n")
+    if lines == 0:
+        return 1
+    return max(1, int((size - header_bytes) / (len(sample) / lines)))
+
+
+class ColumnStore:
+    """
+    Gauge columns written straight into preallocated `.npy` memory maps.
+
+    The files are sized from an estimate up front; if the estimate is too
+    small they grow by half again, copying block by block, so RAM use never
+    depends on the file size. `close()` returns the number of rows actually
+    written (the files may keep some unused capacity at the end).
+    """
+
+    def __init__(self, directory, capacity):
+        self.directory = directory
+        self.capacity = max(1, int(capacity))
+        self.rows = 0
+        self.is_sorted = True
+        self._last_time = None
+        self._columns = {name: self._open(name, self.capacity) for name in COLUMN_DTYPES}
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _open(self, name, capacity, path=None):
+        return np.lib.format.open_memmap(path or self._path(name), mode="w+",
+                                         dtype=COLUMN_DTYPES[name], shape=(capacity,))
+
+    def _grow(self, needed):
+        capacity = max(needed, int(self.capacity * 1.5))
+        for name in COLUMN_DTYPES:
+            old = self._columns.pop(name)
+            tmp_path = self._path(name) + ".grow"
+            new = self._open(name, capacity, tmp_path)
+            for start in range(0, self.rows, COPY_CHUNK_ROWS):
+                stop = min(start + COPY_CHUNK_ROWS, self.rows)
+                new[start:stop] = old[start:stop]
+            new.flush()
+            del old, new  # Release both maps before swapping files (required on Windows)
+            os.replace(tmp_path, self._path(name))
+            self._columns[name] = np.load(self._path(name), mmap_mode="r+")
+        self.capacity = capacity
+
+    def append(self, times, pressures, temperatures):
+        count = len(times)
+        if count == 0:
+            return
+        if self.rows + count > self.capacity:
+            self._grow(self.rows + count)
+
+        if self.is_sorted:
+            previous_ok = self._last_time is None or times[0] >= self._last_time
+            self.is_sorted = bool(previous_ok and np.all(times[1:] >= times[:-1]))
+        self._last_time = times[-1]
+
+        stop = self.rows + count
+        self._columns["times"][self.rows:stop] = times
+        self._columns["pressures"][self.rows:stop] = pressures
+        self._columns["temperatures"][self.rows:stop] = temperatures
+        self.rows = stop
+
+    def close(self):
+        for column in self._columns.values():
+            column.flush()
+        self._columns.clear()
+        return self.rows
+
+
+def stream_gauge_txt(file_path, directory, chunk_rows=INGEST_CHUNK_ROWS):
+    """
+    Parse a gauge .txt export block by block into `.npy` columns in `directory`.
+
+    Returns a dict with `rows` and `sorted` for the cache metadata.
+    Raises ValueError when the Date/Time/Press header cannot be found.
+    """
+    data_start = find_data_start(file_path)
+    if data_start is None:
+        raise ValueError("Could not find data headers in file")
+
+    # A little headroom so the estimate rarely has to grow
+    store = ColumnStore(directory, estimate_rows(file_path, data_start) * 1.05 + chunk_rows)
+    try:
+        for frame in read_reading_frames(file_path, data_start, chunk_size=chunk_rows):
+            store.append(*parse_reading_frame(frame))
+    finally:
+        rows = store.close()
+    return {"rows": rows, "sorted": store.is_sorted}
+
+
+def plot_envelope(series, max_points=PLOT_MAX_POINTS, chunk_rows=COPY_CHUNK_ROWS):
+    """
+    Indices of the readings worth drawing: for each of ~max_points/4 equal
+    buckets, the rows holding the min and max pressure and temperature.
+    Spikes survive, and the columns are read one block at a time.
+    """
+    n = len(series)
+    buckets = max(1, max_points // 4)
+    bucket_rows = max(1, math.ceil(n / buckets))
+    chunk_rows = max(bucket_rows, chunk_rows // bucket_rows * bucket_rows)
+
+    picks = []
+    for start in range(0, n, chunk_rows):
+        stop = min(start + chunk_rows, n)
+        count = math.ceil((stop - start) / bucket_rows)
+        offsets = start + np.arange(count) * bucket_rows
+        for column in (series.pressures, series.temperatures):
+            block = column[start:stop]
+            padded = np.pad(block, (0, count * bucket_rows - len(block)), mode="edge").reshape(count, bucket_rows)
+            picks.append(offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1))
+            picks.append(offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1))
+
+    # Edge padding repeats the last reading, so a pick past the end means that reading
+    return np.unique(np.minimum(np.concatenate(picks), n - 1))
+
+
+def plot_arrays(series, max_points=PLOT_MAX_POINTS, interval=None):
+    """
+    (seconds, pressures, temperatures) for pyqtgraph; an envelope for very
+    long series. With `interval` (seconds) the gauge is first averaged into
+    bins of that width, with NaN rows where the gauge has gaps.
+    """
+    if interval:
+        series = resample(series, interval, "mean", fill_gaps=True)
+    if len(series) <= max_points:
+        return (series.seconds(), series.pressures.astype(np.float32),
+                series.temperatures.astype(np.float32))
+
+    index = plot_envelope(series, max_points)
+    return ((series.times[index] - EPOCH).astype(np.float64),
+            series.pressures[index].astype(np.float32),
+            series.temperatures[index].astype(np.float32))
@@ -0,0 +1,138 @@
+# gauge_tail.py
+import io
+import os
+
+import numpy as np
+
+from features.survey.gauge_data import GaugeSeries, parse_reading_frame, read_reading_frames
+
+INITIAL_CAPACITY = 65536
+MAX_READ_BYTES = 64 * 1024 * 1024  # Text parsed per poll, so catching up on a big file stays responsive
+
+
+def find_data_offset(file_path):
+    """Byte offset of the first reading (after the Date/Time/Press header and unit line), or None."""
+    with open(file_path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return None
+            text = line.decode("latin-1")
+            if "Date" in text and "Time" in text and "Press" in text:
+                unit_line = f.readline()
+                if not unit_line.endswith(b"\n"):
+                    return None  # Unit line not fully written yet
+                return f.tell()
+
+
+class GaugeTail:
+    """
+    Incremental reader for a gauge .txt file that is still being written.
+
+    `poll()` parses only the complete lines appended since the last call
+    (a trailing partial line is kept for the next poll) and appends them to
+    columns that grow geometrically, so each reading is copied O(1) times
+    on average. `series()` is a cheap view of everything read so far.
+    """
+
+    def __init__(self, file_path, max_read_bytes=MAX_READ_BYTES):
+        self.file_path = file_path
+        self.max_read_bytes = max_read_bytes
+        self.reset()
+
+    def reset(self):
+        """Forget everything read (used when the file is truncated or replaced)."""
+        self.offset = None  # Byte offset of the next unread byte, once the header is found
+        self.partial = b""
+        self.rows = 0
+        self.is_sorted = True
+        self._times = np.empty(INITIAL_CAPACITY, dtype="datetime64[s]")
+        self._pressures = np.empty(INITIAL_CAPACITY)
+        self._temperatures = np.empty(INITIAL_CAPACITY)
+
+    @property
+    def pending(self):
+        """True when the file holds more bytes than have been read."""
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            return False
+        return self.offset is None or size > self.offset
+
+    def _reserve(self, count):
+        needed = self.rows + count
+        if needed <= len(self._times):
+            return
+        capacity = max(needed, 2 * len(self._times))
+        for name in ("_times", "_pressures", "_temperatures"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.rows] = old[:self.rows]
+            setattr(self, name, new)
+
+    def _append(self, times, pressures, temperatures):
+        count = len(times)
+        if count == 0:
+            return
+        if self.is_sorted:
+            previous_ok = self.rows == 0 or times[0] >= self._times[self.rows - 1]
+            self.is_sorted = bool(previous_ok and np.all(times[1:] >= times[:-1]))
+
+        self._reserve(count)
+        stop = self.rows + count
+        self._times[self.rows:stop] = times
+        self._pressures[self.rows:stop] = pressures
+        self._temperatures[self.rows:stop] = temperatures
+        self.rows = stop
+
+    def poll(self):
+        """
+        Read newly appended lines. Returns (first_new_row, rows_after);
+        the two are equal when nothing new arrived.
+        """
+        first = self.rows
+        try:
+            size = os.path.getsize(self.file_path)
+            if self.offset is not None and size < self.offset:
+                self.reset()  # File was truncated or replaced: start again
+                first = 0
+            if self.offset is None:
+                self.offset = find_data_offset(self.file_path)
+                if self.offset is None:
+                    return first, self.rows
+
+            with open(self.file_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(self.max_read_bytes)
+        except OSError:
+            return first, self.rows
+
+        if not data:
+            return first, self.rows
+        self.offset += len(data)
+
+        # Only complete lines are parsed; the remainder waits for the next poll
+        data = self.partial + data
+        cut = data.rfind(b"\n") + 1
+        self.partial = data[cut:]
+        if cut:
+            try:
+                frame = read_reading_frames(io.BytesIO(data[:cut]), 0)
+            except ValueError:  # Only blank lines so far (pandas EmptyDataError)
+                return first, self.rows
+            self._append(*parse_reading_frame(frame))
+        return first, self.rows
+
+    def catch_up(self):
+        """Poll until every complete line currently in the file has been read."""
+        while True:
+            before = self.offset
+            self.poll()
+            if self.offset == before or not self.pending:
+                return self.rows
+
+    def series(self, start=0):
+        """Readings from row `start` onwards as a GaugeSeries (views, no copy)."""
+        stop = self.rows
+        return GaugeSeries(self._times[start:stop], self._pressures[start:stop],
+                           self._temperatures[start:stop], is_sorted=self.is_sorted)
@@ -0,0 +1,230 @@
+# gradients.py
+import numpy as np
+
+from utils.depth_reference import get_depth_reference
+
+GAS_OIL_SPLIT = 0.20        # psi/ft: lighter segments are read as gas
+OIL_WATER_SPLIT = 0.40      # psi/ft: heavier segments are read as water (fresh water is 0.433)
+MAX_SEGMENTS = 3            # Gas, oil and water at most
+MIN_SEGMENT_STATIONS = 2    # Stations needed to fit a segment
+PRESSURE_NOISE_PSI = 0.5    # Floor on the residual scatter when choosing the number of segments
+GAUGE_LABELS = {"top": "Top Gauge", "bottom": "Bottom Gauge"}
+CONTACT_NAMES = {("gas", "oil"): "GOC", ("oil", "water"): "OWC", ("gas", "water"): "GWC"}
+FLUID_ORDER = ("gas", "oil", "water")
+
+
+def station_tvds(station_timings, tvd_data, bdf):
+    """True vertical depth of each station when the AHD/TVD table covers it, else the wireline depth."""
+    depths = np.array([float(station.get("depth") or 0.0) for station in station_timings])
+    try:
+        reference = get_depth_reference((tvd_data or {}).get("ahd_values", []),
+                                        (tvd_data or {}).get("tvd_values", []), extrapolate="nan")
+    except (ValueError, TypeError):
+        return depths
+    tvds = reference.to_tvd(bdf + depths)
+    return np.where(np.isnan(tvds), depths, tvds)
+
+
+def station_profile(station_timings, gauges, tvd_data=None, bdf=0.0):
+    """
+    Median pressure and temperature of every gauge at every station, in
+    depth order. ATM readings are left out (they are not well pressure).
+
+    `gauges` maps a name to a GaugeSeries (or None). Returns a dict with
+    `stations` (names), `depths` (TVD, shape n) and `pressures` and
+    `temperatures` (shape gauges x n, NaN where a gauge has no readings).
+    """
+    stations = [station for station in station_timings if station["station"] != "ATM"]
+    depths = station_tvds(stations, tvd_data, bdf)
+    names = list(gauges)
+
+    pressures = np.full((len(names), len(stations)), np.nan)
+    temperatures = np.full((len(names), len(stations)), np.nan)
+    for row, name in enumerate(names):
+        series = gauges[name]
+        if series is None or len(series) == 0:
+            continue
+        for col, station in enumerate(stations):
+            stats = series.station_statistics(station["start"], station["end"])
+            if stats is not None:
+                pressures[row, col] = stats[2]
+                temperatures[row, col] = stats[5]
+
+    order = np.argsort(depths, kind="stable")
+    return {
+        "gauges": names,
+        "stations": [stations[i]["station"] for i in order],
+        "depths": depths[order],
+        "pressures": pressures[:, order],
+        "temperatures": temperatures[:, order],
+    }
+
+
+def interval_gradients(depths, values):
+    """
+    (mid depths, gradients) between consecutive stations. `values` may be
+    one row per gauge; intervals with no depth change give NaN.
+    """
+    depths = np.asarray(depths, dtype=np.float64)
+    thickness = np.diff(depths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gradients = np.diff(np.asarray(values, dtype=np.float64), axis=-1) / thickness
+    gradients[..., thickness <= 0] = np.nan
+    return 0.5 * (depths[1:] + depths[:-1]), gradients
+
+
+def classify_fluid(gradient):
+    """'gas', 'oil' or 'water' from a pressure gradient in psi/ft."""
+    if gradient < GAS_OIL_SPLIT:
+        return "gas"
+    if gradient < OIL_WATER_SPLIT:
+        return "oil"
+    return "water"
+
+
+def _segment_costs(depths, pressures, min_points):
+    """
+    Least-squares residual of a straight line through points [i, j) for
+    every pair i < j, from prefix sums (inf where the segment is too short
+    or has no depth spread).
+    """
+    n = len(depths)
+    x = depths - depths.mean()
+    y = pressures - pressures.mean()
+    prefix = np.zeros((5, n + 1))
+    prefix[:, 1:] = np.cumsum([x, y, x * x, x * y, y * y], axis=1)
+
+    sums = prefix[:, None, :] - prefix[:, :, None]  # sums[k, i, j] over points i..j-1
+    sx, sy, sxx, sxy, syy = sums
+    count = np.arange(n + 1)[None, :] - np.arange(n + 1)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread = sxx - sx * sx / count
+        cost = (syy - sy * sy / count) - (sxy - sx * sy / count) ** 2 / spread
+    valid = (count >= min_points) & (spread > 1e-9)
+    return np.where(valid, np.maximum(cost, 0.0), np.inf)
+
+
+def fit_segments(depths, pressures, max_segments=MAX_SEGMENTS, min_points=MIN_SEGMENT_STATIONS,
+                 noise=PRESSURE_NOISE_PSI):
+    """
+    Piecewise-linear fit of pressure against depth.
+
+    The optimal split for every number of segments comes from dynamic
+    programming over the all-pairs residual table; the number of segments
+    is then the one with the lowest BIC, so a single fluid column stays one
+    line. Returns segment dicts (top, bottom, gradient, intercept, fluid,
+    stations) from shallow to deep.
+    """
+    depths = np.asarray(depths, dtype=np.float64)
+    pressures = np.asarray(pressures, dtype=np.float64)
+    keep = np.isfinite(depths) & np.isfinite(pressures)
+    depths, pressures = depths[keep], pressures[keep]
+    n = len(depths)
+    if n < min_points:
+        return []
+
+    costs = _segment_costs(depths, pressures, min_points)
+
+    # best[k, j]: lowest residual covering points [0, j) with k + 1 segments
+    max_segments = max(1, min(max_segments, n // min_points))
+    best = np.full((max_segments, n + 1), np.inf)
+    split = np.zeros((max_segments, n + 1), dtype=np.int64)
+    best[0] = costs[0]
+    for k in range(1, max_segments):
+        total = best[k - 1][:, None] + costs  # [i, j]: k segments up to i, one more from i to j
+        split[k] = np.argmin(total, axis=0)
+        best[k] = total[split[k], np.arange(n + 1)]
+
+    residuals = best[:, n]
+    if not np.isfinite(residuals).any():
+        return []
+    segments_used = np.arange(1, max_segments + 1)
+    variance = np.maximum(residuals / n, noise * noise)
+    bic = n * np.log(variance) + (3 * segments_used - 1) * np.log(n)
+    bic[~np.isfinite(residuals)] = np.inf
+    k = int(np.argmin(bic))
+
+    # Walk the split points back from the last point
+    bounds = [n]
+    for level in range(k, 0, -1):
+        bounds.append(int(split[level, bounds[-1]]))
+    bounds.append(0)
+    bounds.reverse()
+
+    segments = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        gradient, intercept = np.polyfit(depths[start:stop], pressures[start:stop], 1)
+        segments.append({
+            "top": float(depths[start]),
+            "bottom": float(depths[stop - 1]),
+            "gradient": float(gradient),
+            "intercept": float(intercept),
+            "fluid": classify_fluid(gradient),
+            "stations": stop - start,
+        })
+    return segments
+
+
+def find_contacts(segments):
+    """
+    Fluid contacts between consecutive segments of different fluids: where
+    the two fitted lines cross, kept within the gap between the segments.
+    """
+    contacts = []
+    for upper, lower in zip(segments, segments[1:]):
+        if upper["fluid"] == lower["fluid"]:
+            continue
+        if upper["gradient"] != lower["gradient"]:
+            depth = (lower["intercept"] - upper["intercept"]) / (upper["gradient"] - lower["gradient"])
+        else:
+            depth = 0.5 * (upper["bottom"] + lower["top"])
+        depth = min(max(depth, upper["bottom"]), lower["top"])
+        pair = tuple(sorted((upper["fluid"], lower["fluid"]), key=FLUID_ORDER.index))
+        contacts.append({
+            "contact": CONTACT_NAMES[pair],
+            "depth": float(depth),
+            "pressure": float(upper["gradient"] * depth + upper["intercept"]),
+        })
+    return contacts
+
+
+def analyse_gradients(station_timings, gauges, tvd_data=None, bdf=0.0):
+    """
+    Gradient analysis of a survey: the station profile plus, per gauge,
+    pressure and temperature gradients between consecutive stations, fitted
+    fluid segments and contact depths.
+    """
+    profile = station_profile(station_timings, gauges, tvd_data, bdf)
+    depths = profile["depths"]
+    mids, pressure_gradients = interval_gradients(depths, profile["pressures"])
+    _, temperature_gradients = interval_gradients(depths, profile["temperatures"])
+
+    results = {}
+    for row, name in enumerate(profile["gauges"]):
+        segments = fit_segments(depths, profile["pressures"][row])
+        results[name] = {
+            "pressures": profile["pressures"][row],
+            "temperatures": profile["temperatures"][row],
+            "pressure_gradients": pressure_gradients[row],
+            "temperature_gradients": temperature_gradients[row],
+            "segments": segments,
+            "contacts": find_contacts(segments),
+        }
+    return {"stations": profile["stations"], "depths": depths, "mid_depths": mids, "gauges": results}
+
+
+def format_gradient_summary(analysis):
+    """Short plain-text summary of the fitted fluid segments and contacts of each gauge."""
+    lines = []
+    for name, result in analysis["gauges"].items():
+        label = GAUGE_LABELS.get(name, name)
+        if not result["segments"]:
+            lines.append(f"{label}: not enough stations for a gradient fit")
+            continue
+        lines.append(f"{label}:")
+        for segment in result["segments"]:
+            lines.append(f"    {segment['fluid'].capitalize()} {segment['gradient']:.4f} psi/ft "
+                         f"({segment['top']:,.0f} – {segment['bottom']:,.0f} ft TVD, {segment['stations']} stations)")
+        for contact in result["contacts"]:
+            lines.append(f"    {contact['contact']} at {contact['depth']:,.1f} ft TVD ({contact['pressure']:,.1f} psia)")
+    return "\n".join(lines)
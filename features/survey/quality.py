@@ -0,0 +1,226 @@
+# quality.py
+import numpy as np
+
+from features.survey.gauge_data import EPOCH, GaugeSeries, to_datetime
+
+GAP_FACTOR = 10             # A gap is a step this many times the usual sampling interval...
+MIN_GAP_SECONDS = 30        # ...and at least this long
+SPIKE_MIN_PSI = 5.0         # Smallest jump that can count as a pressure spike
+SPIKE_NOISE_FACTOR = 20     # ...or this many times the typical reading-to-reading change
+SPIKE_MAX_WIDTH = 3         # Spikes are at most this many readings wide
+STUCK_SECONDS = 900         # A sensor repeating the exact same value this long is reported as stuck
+DESPIKE_WINDOW = 5          # Readings in the rolling median used to replace spikes
+MAX_LISTED_RANGES = 5       # Ranges per issue shown in the summary text
+TYPICAL_SAMPLE = 200_000    # Evenly spaced values used to estimate typical steps
+
+ISSUE_LABELS = {
+    "duplicates": "Duplicate timestamps",
+    "backward_jumps": "Clock jumps backwards",
+    "gaps": "Gaps in logging",
+    "spikes": "Pressure spikes",
+    "stuck_pressure": "Stuck pressure sensor",
+    "stuck_temperature": "Stuck temperature sensor",
+}
+
+
+def _runs(mask):
+    """(start, stop) row ranges of consecutive True values."""
+    if not mask.any():
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[0::2], edges[1::2]
+
+
+def _issue(seconds, starts, stops, count=None):
+    """
+    Issue record: count, number of occurrences and the time range (earlier
+    time first) of the first MAX_LISTED_RANGES. The seconds of every
+    occurrence stay as arrays under `spans` for the station check.
+    """
+    first = np.minimum(seconds[starts], seconds[stops])  # A backward jump ends earlier than it starts
+    last = np.maximum(seconds[starts], seconds[stops])
+    ranges = [(to_datetime(EPOCH + int(lo)), to_datetime(EPOCH + int(hi)))
+              for lo, hi in zip(first[:MAX_LISTED_RANGES], last[:MAX_LISTED_RANGES])]
+    return {"count": int(len(starts) if count is None else count), "occurrences": int(len(starts)),
+            "ranges": ranges, "stations": [], "spans": (first, last)}
+
+
+def _typical(values):
+    """Median of an evenly spaced sample (exact for short series, plenty for long ones)."""
+    if len(values) == 0:
+        return 0.0
+    return float(np.median(values[::max(1, len(values) // TYPICAL_SAMPLE)]))
+
+
+def find_spikes(pressures, threshold=None):
+    """
+    Boolean mask of readings that jump away from both neighbours and come
+    back within SPIKE_MAX_WIDTH readings (a step change is not a spike).
+
+    Only the rows after a jump larger than the threshold can start a spike,
+    so the full-length work is a single diff; the shape test runs on those
+    few candidates.
+    """
+    n = len(pressures)
+    mask = np.zeros(n, dtype=bool)
+    if n < 3:
+        return mask
+
+    jumps = np.abs(np.diff(pressures))
+    if threshold is None:
+        noise = _typical(jumps[np.isfinite(jumps) & (jumps > 0)])
+        threshold = max(SPIKE_MIN_PSI, SPIKE_NOISE_FACTOR * noise)
+
+    before_rows = np.flatnonzero(jumps > threshold)  # Spike would start at before_rows + 1
+    if len(before_rows) == 0:
+        return mask
+    values = np.asarray(pressures, dtype=np.float64)
+    found = np.zeros(len(before_rows), dtype=bool)
+
+    for width in range(1, SPIKE_MAX_WIDTH + 1):
+        after_rows = before_rows + width + 1
+        valid = (after_rows < n) & ~found
+        before = values[before_rows[valid]]
+        after = values[after_rows[valid]]
+        # Baseline either side must agree, and every reading in between must be off it the same way
+        level = 0.5 * (before + after)
+        up = np.abs(after - before) < threshold
+        down = up.copy()
+        for k in range(1, width + 1):
+            inner = values[before_rows[valid] + k]
+            up &= inner - level > threshold
+            down &= level - inner > threshold
+        hits = np.flatnonzero(valid)[up | down]
+        found[hits] = True
+        for k in range(1, width + 1):
+            mask[before_rows[hits] + k] = True
+    return mask
+
+
+def check_gauge_quality(series, station_timings=None, gap_seconds=None, spike_threshold=None,
+                        stuck_seconds=STUCK_SECONDS):
+    """
+    Scan a gauge in file order for duplicate timestamps, backwards clock
+    jumps, logging gaps, pressure spikes and stuck sensors.
+
+    Every check is a vectorized diff or run-length pass over the columns.
+    Returns a dict with `rows`, `interval` (usual sampling step, seconds)
+    and one entry per issue in ISSUE_LABELS, each with `count`,
+    `occurrences`, `ranges` (start/end datetimes of the first
+    MAX_LISTED_RANGES occurrences) and `stations` (names of the stations hit).
+    """
+    report = {"rows": len(series), "interval": None}
+    empty = np.empty(0, dtype=np.int64)
+    for key in ISSUE_LABELS:
+        report[key] = {"count": 0, "occurrences": 0, "ranges": [], "stations": [], "spans": (empty, empty)}
+    if len(series) < 2:
+        return report
+
+    seconds = (series.times - EPOCH).astype(np.int64)
+    steps = np.diff(seconds)
+    interval = _typical(steps[steps > 0]) or 1.0
+    report["interval"] = interval
+    if gap_seconds is None:
+        gap_seconds = max(MIN_GAP_SECONDS, GAP_FACTOR * interval)
+
+    # Duplicates: runs of repeated timestamps (count is the number of extra rows)
+    starts, stops = _runs(steps == 0)
+    report["duplicates"] = _issue(seconds, starts, stops, count=int((steps == 0).sum()))
+
+    # Backwards jumps and gaps are single steps from row i to row i + 1
+    backward = np.flatnonzero(steps < 0)
+    report["backward_jumps"] = _issue(seconds, backward, backward + 1)
+    gaps = np.flatnonzero(steps > gap_seconds)
+    report["gaps"] = _issue(seconds, gaps, gaps + 1)
+
+    # Spikes (ranges cover the spike readings themselves)
+    spike_mask = find_spikes(series.pressures, spike_threshold)
+    starts, stops = _runs(spike_mask)
+    report["spikes"] = _issue(seconds, starts, stops - 1)
+
+    # Stuck sensors: exactly the same value for at least `stuck_seconds`
+    for key, values in (("stuck_pressure", series.pressures), ("stuck_temperature", series.temperatures)):
+        starts, stops = _runs(np.diff(values) == 0)  # run [s, e) of equal steps covers rows s..e
+        long_enough = (seconds[stops] - seconds[starts]) >= stuck_seconds
+        report[key] = _issue(seconds, starts[long_enough], stops[long_enough])
+
+    if station_timings:
+        for key in ISSUE_LABELS:
+            report[key]["stations"] = affected_stations(*report[key]["spans"], station_timings)
+    return report
+
+
+def affected_stations(first, last, station_timings):
+    """
+    Labels of the stations that overlap any occurrence, given as arrays of
+    first/last seconds since 1970. One sort, then a binary search per station.
+    """
+    if len(first) == 0:
+        return []
+    order = np.argsort(first, kind="stable")
+    first = first[order]
+    reach = np.maximum.accumulate(last[order])  # Latest end among the occurrences starting so far
+
+    hits = []
+    for index, station in enumerate(station_timings):
+        start = int((np.datetime64(station['start'], "s") - EPOCH).astype(np.int64))
+        end = int((np.datetime64(station['end'], "s") - EPOCH).astype(np.int64))
+        before_end = int(np.searchsorted(first, end, side="right"))  # Occurrences starting by the station's end
+        if before_end and reach[before_end - 1] >= start:
+            depth = station.get('depth')
+            label = f"{station['station']} {depth:g} ft" if isinstance(depth, (int, float)) and depth else \
+                station['station']
+            hits.append(f"{index + 1}. {label}")
+    return hits
+
+
+def has_issues(report):
+    return any(report[key]["count"] for key in ISSUE_LABELS)
+
+
+def format_quality_report(report, name="Gauge"):
+    """Short plain-text summary of a quality report, for message boxes and the console."""
+    if not has_issues(report):
+        return f"{name}: no data quality issues in {report['rows']:,} readings."
+
+    lines = [f"{name}: {report['rows']:,} readings"]
+    for key, label in ISSUE_LABELS.items():
+        issue = report[key]
+        if not issue["count"]:
+            continue
+        lines.append(f"• {label}: {issue['count']:,}")
+        for start, end in issue["ranges"][:MAX_LISTED_RANGES]:
+            if start == end:
+                lines.append(f"    {start.strftime('%d/%m %H:%M:%S')}")
+            else:
+                lines.append(f"    {start.strftime('%d/%m %H:%M:%S')} – {end.strftime('%d/%m %H:%M:%S')}")
+        if issue["occurrences"] > MAX_LISTED_RANGES:
+            lines.append(f"    … and {issue['occurrences'] - MAX_LISTED_RANGES:,} more")
+        if issue["stations"]:
+            lines.append(f"    Stations: {', '.join(issue['stations'])}")
+    return "\n".join(lines)
+
+
+def rolling_median_at(values, rows, window=DESPIKE_WINDOW):
+    """Centred rolling median of `values` evaluated only at `rows` (windows are clipped at the ends)."""
+    half = window // 2
+    index = np.clip(rows[:, None] + np.arange(-half, half + 1), 0, len(values) - 1)
+    return np.nanmedian(np.asarray(values, dtype=np.float64)[index], axis=1)
+
+
+def despike(series, spike_threshold=None, window=DESPIKE_WINDOW):
+    """
+    New GaugeSeries with the detected pressure spikes replaced by the
+    rolling median; every other reading is left untouched.
+    Returns (series, number of readings replaced).
+    """
+    rows = np.flatnonzero(find_spikes(series.pressures, spike_threshold))
+    if len(rows) == 0:
+        return series, 0
+
+    # The window must hold more good readings than the widest spike
+    window = max(window, 2 * SPIKE_MAX_WIDTH + 1)
+    pressures = np.array(series.pressures, dtype=np.float64)
+    pressures[rows] = rolling_median_at(series.pressures, rows, window)
+    return GaugeSeries(series.times, pressures, series.temperatures, is_sorted=series.is_sorted), len(rows)
@@ -0,0 +1,142 @@
+# resample.py
+import numpy as np
+import pandas as pd
+
+from features.survey.gauge_data import EPOCH, GaugeSeries
+
+AGGREGATIONS = ("mean", "min", "max", "median", "last")
+RESOLUTIONS = {  # Label -> bin width in seconds, as offered in the app
+    "1 s": 1,
+    "10 s": 10,
+    "1 min": 60,
+}
+MEDIAN_BLOCK_SLACK = 1_000_000  # Extra padded cells allowed before the median falls back to a full sort
+
+
+def time_bins(seconds, interval, origin=None):
+    """
+    Group sorted int64 `seconds` into fixed-width bins.
+
+    Returns (bin_seconds, starts, stops): the start time of every non-empty
+    bin and the row range [start, stop) of the readings inside it. Bins
+    are aligned to multiples of `interval` since `origin` (default: the
+    epoch, so 1 min bins start on whole minutes).
+    """
+    interval = int(interval)
+    if interval < 1:
+        raise ValueError("Resampling interval must be at least one second")
+    if len(seconds) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    origin = 0 if origin is None else int(origin)
+    bin_ids = (seconds - origin) // interval
+
+    # A new bin starts wherever the bin number changes; empty bins never appear
+    starts = np.concatenate(([0], np.flatnonzero(bin_ids[1:] != bin_ids[:-1]) + 1))
+    stops = np.append(starts[1:], len(bin_ids))
+    return origin + bin_ids[starts] * interval, starts, stops
+
+
+def aggregate(values, starts, stops, how="mean"):
+    """
+    Reduce `values[start:stop]` for every bin. NaN readings are ignored;
+    a bin with no finite readings gives NaN.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}' (use one of {', '.join(AGGREGATIONS)})")
+    if len(starts) == 0:
+        return np.empty(0)
+
+    values = np.asarray(values, dtype=np.float64)
+    if len(starts) == len(values):
+        return values.copy()  # One reading per bin: nothing to reduce
+
+    finite = ~np.isnan(values)
+    counts = np.add.reduceat(finite, starts).astype(np.int64)
+
+    if how == "last":
+        # Last finite reading of each bin
+        positions = np.where(finite, np.arange(len(values)), -1)
+        last = np.maximum.reduceat(positions, starts)
+        out = values[np.maximum(last, 0)]
+    elif how == "mean":
+        out = np.add.reduceat(np.where(finite, values, 0.0), starts) / np.maximum(counts, 1)
+    elif how == "min":
+        out = np.fmin.reduceat(values, starts)
+    elif how == "max":
+        out = np.fmax.reduceat(values, starts)
+    else:
+        out = _median(values, starts, stops, counts)
+
+    out = np.asarray(out, dtype=np.float64)
+    out[counts == 0] = np.nan
+    return out
+
+
+def _median(values, starts, stops, counts):
+    """
+    Per-bin median. Bins are laid out as rows of a NaN-padded block, so one
+    row-wise sort puts each bin's finite readings first, in order.
+    """
+    sizes = stops - starts
+    width = int(sizes.max())
+    if len(sizes) * width > 4 * len(values) + MEDIAN_BLOCK_SLACK:
+        # A few very full bins among many sparse ones: sort (bin, value) pairs instead
+        order = np.lexsort((values, np.repeat(np.arange(len(starts)), sizes)))
+        ordered = values[order]
+        lower = starts + np.maximum(counts - 1, 0) // 2
+        upper = starts + np.maximum(counts - 1, 0) - np.maximum(counts - 1, 0) // 2
+        return 0.5 * (ordered[lower] + ordered[upper])
+
+    rows = np.repeat(np.arange(len(sizes)), sizes)
+    block = np.full((len(sizes), width), np.nan)
+    block[rows, np.arange(len(values)) - starts[rows]] = values
+    block.sort(axis=1)
+
+    index = np.arange(len(sizes))
+    lower = np.maximum(counts - 1, 0) // 2
+    upper = np.maximum(counts - 1, 0) - lower
+    return 0.5 * (block[index, lower] + block[index, upper])
+
+
+def resample(series, interval, how="mean", fill_gaps=False, origin=None):
+    """
+    GaugeSeries at a fixed `interval` (seconds): one row per bin, stamped
+    with the bin start, pressures and temperatures reduced with `how`.
+
+    Bins without readings are left out, unless `fill_gaps` is set; then
+    they are kept as NaN rows so a plot breaks the line across gaps
+    instead of drawing a straight segment over them.
+    """
+    series = series.ordered()
+    seconds = (series.times - EPOCH).astype(np.int64)
+    bin_seconds, starts, stops = time_bins(seconds, interval, origin)
+
+    pressures = aggregate(series.pressures, starts, stops, how)
+    temperatures = aggregate(series.temperatures, starts, stops, how)
+
+    if fill_gaps and len(bin_seconds) > 1:
+        slots = (bin_seconds - bin_seconds[0]) // int(interval)
+        full_seconds = bin_seconds[0] + np.arange(slots[-1] + 1) * int(interval)
+        full_pressures = np.full(len(full_seconds), np.nan)
+        full_temperatures = np.full(len(full_seconds), np.nan)
+        full_pressures[slots] = pressures
+        full_temperatures[slots] = temperatures
+        bin_seconds, pressures, temperatures = full_seconds, full_pressures, full_temperatures
+
+    return GaugeSeries(EPOCH + bin_seconds, pressures, temperatures, is_sorted=True)
+
+
+def write_resampled_csv(file_path, series, interval, how="mean"):
+    """Write a resampled gauge as Date, Time, Pressure, Temperature CSV (client deliverable)."""
+    resampled = resample(series, interval, how)
+    stamps = pd.DatetimeIndex(resampled.times)
+    frame = pd.DataFrame({
+        "Date": stamps.strftime("%d/%m/%Y"),
+        "Time": stamps.strftime("%H:%M:%S"),
+        "Pressure (psia)": resampled.pressures,
+        "Temperature (F)": resampled.temperatures,
+    })
+    frame.to_csv(file_path, index=False, float_format="%.4f")
+    return file_path
@@ -0,0 +1,244 @@
+# station_detection.py
+import numpy as np
+
+from features.survey.gauge_data import EPOCH, to_datetime
+
+BIN_SECONDS = 10            # Readings are averaged into bins of this width first
+WINDOW_SECONDS = 120        # Rolling window used for the flatness / slope test
+MIN_STATION_SECONDS = 180   # Shorter plateaus are not proposed as stations
+MERGE_GAP_SECONDS = 120     # Plateaus split by a shorter disturbance are merged back
+SLOPE_TOLERANCE = 1.0       # psi/min; a parked gauge drifts far less than this
+MIN_NOISE_TOLERANCE = 0.5   # psi; floor for the rolling standard deviation test
+ATM_MAX_PRESSURE = 25.0     # psia; anything flatter and lower is at atmosphere
+SWAB_STEP_PSI = 0.5         # Minimum rise above the atmospheric level
+SUSTAIN_SECONDS = 30        # A swab-valve rise must hold for this long (rejects spikes)
+
+
+def _ordered_columns(series):
+    """Integer seconds and pressures in time order."""
+    series = series.ordered()
+    return (series.times - EPOCH).astype(np.int64), series.pressures
+
+
+def _bin_means(seconds, pressures, bin_seconds):
+    """Mean pressure per fixed-width time bin; bins without readings (gaps) are NaN."""
+    bins = (seconds - seconds[0]) // bin_seconds
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=pressures)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return means, counts
+
+
+def _rolling_flatness(means, window):
+    """
+    Centred rolling standard deviation and least-squares slope (per bin)
+    for every bin, from cumulative sums. Windows touching a gap are NaN.
+    """
+    n = len(means)
+    std = np.full(n, np.nan)
+    slope = np.full(n, np.nan)
+    if n < window:
+        return std, slope
+
+    valid = np.isfinite(means)
+    values = np.where(valid, means, 0.0)
+    index = np.arange(n, dtype=np.float64)
+
+    def window_sum(x):
+        c = np.concatenate(([0.0], np.cumsum(x)))
+        return c[window:] - c[:-window]
+
+    count = window_sum(valid.astype(np.float64))
+    s_y = window_sum(values)
+    s_yy = window_sum(values * values)
+    s_iy = window_sum(values * index)
+
+    full = count == window
+    mean_y = s_y / window
+    variance = np.maximum(s_yy / window - mean_y ** 2, 0.0)
+    # Centred index of each window is (start + (window - 1) / 2)
+    start = np.arange(n - window + 1, dtype=np.float64)
+    mean_i = start + (window - 1) / 2.0
+    s_ii = window * (window * window - 1) / 12.0
+    window_slope = (s_iy - mean_i * s_y) / s_ii
+
+    half = window // 2
+    centre = slice(half, half + n - window + 1)
+    std[centre] = np.where(full, np.sqrt(variance), np.nan)
+    slope[centre] = np.where(full, window_slope, np.nan)
+    return std, slope
+
+
+def _runs(mask):
+    """(start, stop) index pairs of consecutive True values."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def find_plateaus(series, bin_seconds=BIN_SECONDS, window_seconds=WINDOW_SECONDS,
+                  min_seconds=MIN_STATION_SECONDS, merge_gap_seconds=MERGE_GAP_SECONDS,
+                  slope_tolerance=SLOPE_TOLERANCE):
+    """
+    Flat stretches of the pressure trace.
+
+    Returns a list of dicts with `start`/`end` (datetime), `level` (median
+    psia), `noise` (psi) and `flatness` (0..1, how far inside the
+    tolerances the plateau sits).
+    """
+    if len(series) < 2:
+        return []
+
+    seconds, pressures = _ordered_columns(series)
+    means, _ = _bin_means(seconds, pressures, bin_seconds)
+    window = max(3, int(round(window_seconds / bin_seconds)))
+    std, slope = _rolling_flatness(means, window)
+
+    # Tolerances scale with the gauge's own noise floor (most of a survey is flat)
+    finite_std = std[np.isfinite(std)]
+    if len(finite_std) == 0:
+        return []
+    noise_floor = float(np.median(finite_std))
+    std_tolerance = max(MIN_NOISE_TOLERANCE, 4.0 * noise_floor)
+    slope_per_bin = slope_tolerance * bin_seconds / 60.0
+
+    with np.errstate(invalid="ignore"):
+        stable = (std <= std_tolerance) & (np.abs(slope) <= slope_per_bin)
+
+    # A stable window centred on bin c covers bins c - half .. c + window - half - 1, so those are flat too
+    half = window // 2
+    starts, stops = _runs(stable)
+    starts = np.maximum(starts - half, 0)
+    stops = np.minimum(stops + (window - half - 1), len(means))
+
+    # Merge plateaus split by short disturbances when the level is unchanged
+    merged = []
+    merge_gap = merge_gap_seconds // bin_seconds
+    for lo, hi in zip(starts, stops):
+        if merged:
+            prev_lo, prev_hi = merged[-1]
+            # Short disturbance, or a logging gap with no readings in between
+            gap_ok = lo - prev_hi <= merge_gap or not np.isfinite(means[prev_hi:lo]).any()
+            level_ok = abs(np.nanmedian(means[lo:hi]) - np.nanmedian(means[prev_lo:prev_hi])) <= std_tolerance
+            if gap_ok and level_ok:
+                merged[-1] = (prev_lo, max(prev_hi, hi))
+                continue
+        merged.append((lo, hi))
+
+    plateaus = []
+    origin = seconds[0]
+    for lo, hi in merged:
+        t0 = origin + lo * bin_seconds
+        t1 = origin + hi * bin_seconds - 1
+        first = np.searchsorted(seconds, t0, side="left")
+        last = np.searchsorted(seconds, t1, side="right")
+        if last - first < 2:
+            continue
+        t0, t1 = seconds[first], seconds[last - 1]
+        if t1 - t0 < min_seconds:
+            continue
+
+        segment = pressures[first:last]
+        stds = std[lo:hi]
+        slopes = np.abs(slope[lo:hi])
+        with np.errstate(invalid="ignore"):
+            flat_std = 1.0 - np.nanmedian(stds) / std_tolerance if np.isfinite(stds).any() else 0.5
+            flat_slope = 1.0 - np.nanmedian(slopes) / slope_per_bin if np.isfinite(slopes).any() else 0.5
+        plateaus.append({
+            "start": to_datetime(EPOCH + t0),
+            "end": to_datetime(EPOCH + t1),
+            "level": float(np.median(segment)),
+            "noise": float(np.std(segment)),
+            "flatness": float(np.clip(0.5 * flat_std + 0.5 * flat_slope, 0.0, 1.0)),
+            "seconds": int(t1 - t0),
+        })
+    return plateaus
+
+
+def detect_stations(series, depth_station="SGS", min_seconds=MIN_STATION_SECONDS, **kwargs):
+    """
+    Propose station windows from the pressure trace of one gauge.
+
+    - ATM: flat readings at atmospheric pressure (before the swab valve opens
+      or after bleeding off)
+    - THP: the first pressurised plateau, and any later one back at that level
+    - depth stops (`depth_station`, usually SGS/FGS): every other plateau
+
+    Each proposal is a station dict as used by the station table
+    (`station`, `depth`, `start`, `end`, `duration`) plus `level` (psia)
+    and `confidence` (0..1). Depths are left at 0 for the user to enter.
+    """
+    plateaus = find_plateaus(series, min_seconds=min_seconds, **kwargs)
+
+    thp_level = None
+    stations = []
+    for plateau in plateaus:
+        level = plateau["level"]
+        if level <= ATM_MAX_PRESSURE:
+            name = "ATM"
+        elif thp_level is None:
+            name = "THP"
+            thp_level = level
+        elif abs(level - thp_level) <= max(10.0, 0.02 * thp_level):
+            name = "THP"
+        else:
+            name = depth_station
+
+        # Long, quiet plateaus score high; short or borderline ones need a second look
+        duration_score = min(1.0, plateau["seconds"] / (3.0 * min_seconds))
+        confidence = round(0.6 * plateau["flatness"] + 0.4 * duration_score, 2)
+
+        stations.append({
+            "station": name,
+            "depth": 0.0,
+            "start": plateau["start"],
+            "end": plateau["end"],
+            "duration": plateau["seconds"] / 3600.0,
+            "level": level,
+            "confidence": confidence,
+        })
+    return stations
+
+
+def detect_swab_valve_opening(series, atm_station=None, bin_seconds=BIN_SECONDS):
+    """
+    Time of the first sustained pressure rise above the atmospheric level, or None.
+
+    The atmospheric level is the median over `atm_station` when given,
+    otherwise over the first minute of readings. The rise must exceed both
+    SWAB_STEP_PSI and five times the baseline noise, and hold for
+    SUSTAIN_SECONDS, so single spikes are ignored.
+    """
+    if len(series) < 2:
+        return None
+
+    seconds, pressures = _ordered_columns(series)
+    if atm_station is not None:
+        lo = np.searchsorted(seconds, int((np.datetime64(atm_station["start"], "s") - EPOCH).astype(np.int64)))
+        hi = np.searchsorted(seconds, int((np.datetime64(atm_station["end"], "s") - EPOCH).astype(np.int64)),
+                             side="right")
+    else:
+        lo, hi = 0, np.searchsorted(seconds, seconds[0] + 60, side="right")
+    if hi - lo < 1:
+        lo, hi = 0, 1
+
+    baseline = pressures[lo:hi]
+    threshold = float(np.median(baseline)) + max(SWAB_STEP_PSI, 5.0 * float(np.std(baseline)))
+
+    # Sustained rise on binned means (after the baseline window), then refine to the first raw reading
+    origin = lo
+    means, _ = _bin_means(seconds[origin:], pressures[origin:], bin_seconds)
+    above = np.where(np.isfinite(means), means > threshold, False)
+    sustain = max(1, int(np.ceil(SUSTAIN_SECONDS / bin_seconds)))
+    if len(above) < sustain:
+        return None
+    held = np.lib.stride_tricks.sliding_window_view(above, sustain).all(axis=1)
+    hits = np.flatnonzero(held)
+    if len(hits) == 0:
+        return None
+
+    bin_start = seconds[origin] + hits[0] * bin_seconds
+    first = np.searchsorted(seconds, bin_start - bin_seconds, side="left")
+    rise = np.flatnonzero(pressures[first:] > threshold)
+    index = first + rise[0] if len(rise) else np.searchsorted(seconds, bin_start)
+    return to_datetime(EPOCH + seconds[index])
@@ -0,0 +1,242 @@
+# survey_file.py
+import datetime
+import io
+import json
+import os
+import pickle
+import shutil
+import zipfile
+
+import numpy as np
+
+from features.survey.gauge_data import GaugeSeries
+
+SURVEY_FORMAT = "deleum-survey"
+SURVEY_FORMAT_VERSION = 2
+APP_VERSION = "1.0"
+MANIFEST_NAME = "manifest.json"
+GAUGES = ("top", "bottom")
+
+
+class SurveyFileError(Exception):
+    """Raised when a .survey file cannot be read."""
+
+
+# --------------------------------------------------
+# Column encodings
+# --------------------------------------------------
+def _encode_times(times):
+    """datetime64[s] -> int64 deltas (1 Hz data becomes a run of 1s that deflates to almost nothing)."""
+    seconds = np.asarray(times, dtype="datetime64[s]").astype(np.int64)
+    if len(seconds) == 0:
+        return seconds
+    return np.concatenate(([seconds[0]], np.diff(seconds)))
+
+
+def _decode_times(deltas):
+    return np.cumsum(deltas, dtype=np.int64).astype("datetime64[s]")
+
+
+def _encode_floats(values):
+    """float64 -> byte-shuffled uint8 planes, which deflate far better than raw floats."""
+    values = np.ascontiguousarray(values, dtype="<f8")
+    return values.view(np.uint8).reshape(-1, 8).T.copy()
+
+
+def _decode_floats(planes):
+    return np.ascontiguousarray(planes.T).view("<f8").reshape(-1)
+
+
+def _npy_bytes(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _read_npy(archive, name):
+    with archive.open(name) as f:
+        return np.load(io.BytesIO(f.read()), allow_pickle=False)
+
+
+# --------------------------------------------------
+# Metadata (JSON) conversion
+# --------------------------------------------------
+def _dt_to_json(value):
+    return value.isoformat() if value is not None else None
+
+
+def _dt_from_json(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+
+def _date_from_json(value):
+    return datetime.date.fromisoformat(value) if value else None
+
+
+def _stations_to_json(stations):
+    return [
+        {**station, "start": _dt_to_json(station["start"]), "end": _dt_to_json(station["end"])}
+        for station in stations or []
+    ]
+
+
+def _stations_from_json(stations):
+    return [
+        {**station, "start": _dt_from_json(station["start"]), "end": _dt_from_json(station["end"])}
+        for station in stations
+    ]
+
+
+# --------------------------------------------------
+# Public API
+# --------------------------------------------------
+def write_survey(file_path, state):
+    """
+    Write a survey as a zip container:
+
+    - `manifest.json`: format version, survey metadata, stations, events
+    - `gauges/<top|bottom>/<column>.npy`: encoded, deflate-compressed columns
+
+    The file is written next to the target first and then swapped in.
+    """
+    manifest = {
+        "format": SURVEY_FORMAT,
+        "format_version": SURVEY_FORMAT_VERSION,
+        "app_version": APP_VERSION,
+        "top_file_path": state.get("top_file_path"),
+        "bottom_file_path": state.get("bottom_file_path"),
+        "location": state.get("location"),
+        "well": state.get("well"),
+        "date": _dt_to_json(state.get("date")),
+        "start_time": _dt_to_json(state.get("start_time")),
+        "bdf": state.get("bdf"),
+        "sea_level": state.get("sea_level"),
+        "gauge_type": state.get("gauge_type", "SGS"),
+        "spm_depths": list(state.get("spm_depths") or []),
+        "station_timings": _stations_to_json(state.get("station_timings")),
+        "tvd_data": state.get("tvd_data") or {},
+        "events": [[_dt_to_json(dt), desc] for dt, desc in state.get("events") or []],
+        "gauges": {},
+    }
+
+    tmp_path = file_path + ".tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        for gauge in GAUGES:
+            series = state.get(f"{gauge}_data")
+            if series is None:
+                continue
+            series = GaugeSeries.from_records(series)
+            folder = f"gauges/{gauge}"
+            archive.writestr(f"{folder}/times.npy", _npy_bytes(_encode_times(series.times)))
+            archive.writestr(f"{folder}/pressures.npy", _npy_bytes(_encode_floats(series.pressures)))
+            archive.writestr(f"{folder}/temperatures.npy", _npy_bytes(_encode_floats(series.temperatures)))
+            manifest["gauges"][gauge] = {
+                "rows": len(series),
+                "columns": {
+                    "times": {"path": f"{folder}/times.npy", "encoding": "delta-seconds"},
+                    "pressures": {"path": f"{folder}/pressures.npy", "encoding": "shuffle-f8"},
+                    "temperatures": {"path": f"{folder}/temperatures.npy", "encoding": "shuffle-f8"},
+                },
+            }
+
+        # Manifest last so a half-written file is never mistaken for a valid one
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=1))
+
+    os.replace(tmp_path, file_path)
+    return file_path
+
+
+def _gauge_loader(file_path, columns):
+    """Closure that decodes one gauge's columns from the archive when called."""
+    def load():
+        with zipfile.ZipFile(file_path) as archive:
+            times = _decode_times(_read_npy(archive, columns["times"]["path"]))
+            pressures = _decode_floats(_read_npy(archive, columns["pressures"]["path"]))
+            temps = _decode_floats(_read_npy(archive, columns["temperatures"]["path"]))
+        return times, pressures, temps
+    return load
+
+
+def read_manifest(file_path):
+    """Read and validate only the JSON manifest of a survey container."""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+    except (zipfile.BadZipFile, KeyError, ValueError) as e:
+        raise SurveyFileError(f"Not a valid survey file: {e}")
+
+    if manifest.get("format") != SURVEY_FORMAT:
+        raise SurveyFileError("Not a valid survey file")
+    if manifest.get("format_version", 0) > SURVEY_FORMAT_VERSION:
+        raise SurveyFileError("This file was created with a newer version of the application")
+    return manifest
+
+
+def read_survey(file_path):
+    """
+    Open a survey file and return the application state dictionary.
+
+    Metadata, stations and events are read immediately; `top_data` and
+    `bottom_data` are lazy GaugeSeries that decompress on first access.
+    Legacy pickle files are converted in memory.
+    """
+    if is_legacy_survey(file_path):
+        return read_legacy_survey(file_path)
+
+    manifest = read_manifest(file_path)
+    state = {
+        "top_file_path": manifest.get("top_file_path"),
+        "bottom_file_path": manifest.get("bottom_file_path"),
+        "location": manifest.get("location"),
+        "well": manifest.get("well"),
+        "date": _date_from_json(manifest.get("date")),
+        "start_time": _dt_from_json(manifest.get("start_time")),
+        "bdf": manifest.get("bdf"),
+        "sea_level": manifest.get("sea_level"),
+        "gauge_type": manifest.get("gauge_type", "SGS"),
+        "spm_depths": manifest.get("spm_depths", []),
+        "station_timings": _stations_from_json(manifest.get("station_timings", [])),
+        "tvd_data": manifest.get("tvd_data", {}),
+        "events": [(_dt_from_json(dt), desc) for dt, desc in manifest.get("events", [])],
+        "app_version": manifest.get("app_version"),
+    }
+
+    for gauge in GAUGES:
+        info = manifest.get("gauges", {}).get(gauge)
+        state[f"{gauge}_data"] = (
+            GaugeSeries.lazy(info["rows"], _gauge_loader(file_path, info["columns"])) if info else None
+        )
+    return state
+
+
+def is_legacy_survey(file_path):
+    """Surveys saved before the container format are plain pickles."""
+    return not zipfile.is_zipfile(file_path)
+
+
+def read_legacy_survey(file_path):
+    """Unpickle a pre-container survey and convert its gauge tuples to GaugeSeries."""
+    try:
+        with open(file_path, "rb") as f:
+            state = pickle.load(f)
+    except Exception as e:
+        raise SurveyFileError(f"Failed to read legacy survey: {e}")
+
+    if state.get("app_version") != APP_VERSION:
+        raise SurveyFileError("This file was created with a different version of the application")
+
+    for gauge in GAUGES:
+        state[f"{gauge}_data"] = GaugeSeries.from_records(state.get(f"{gauge}_data"))
+    return state
+
+
+def convert_legacy_survey(file_path, backup=True):
+    """
+    One-way conversion of a pickled survey to the container format, in place.
+    The original is kept as `<name>.survey.bak` unless `backup` is False.
+    """
+    state = read_legacy_survey(file_path)
+    if backup:
+        shutil.copy2(file_path, file_path + ".bak")
+    write_survey(file_path, state)
+    return read_survey(file_path)
@@ -0,0 +1,313 @@
+# survey_report.py
+
+from features.survey.gauge_data import to_datetime
+from features.survey.station_detection import detect_swab_valve_opening
+from utils.depth_reference import get_depth_reference
+from utils.excel_templates import clear_block, get_template_service, write_block
+
+INTERPRETATION_TEMPLATE = "Interpretation_Template.xlsx"
+TVD_TEMPLATE = "MD_TVD_Template.xlsx"
+TEMPLATE_FIRST_ROW = 13  # First station row of the interpretation template
+TEMPLATE_ROWS = 69       # Station rows available in the interpretation template
+GRADIENT_SHEET = "Gradient Analysis"
+
+
+# --------------------------------------------------
+# Station results
+# --------------------------------------------------
+def calculate_ahd_tvd(thf, depth, ahd_list, tvd_list):
+    """
+    Excel-equivalent AHD/TVD calculation: AHD is the depth below the tubing
+    hanger flange, TVD is interpolated linearly in the AHD/TVD table.
+    """
+    ahd_calc = thf + depth
+    tvd_calc = get_depth_reference(ahd_list, tvd_list).to_tvd(ahd_calc)
+    return ahd_calc, tvd_calc
+
+
+def _format_value(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def station_result_rows(station_timings, top_data, bottom_data, tvd_data, bdf):
+    """
+    One row of display text per station, laid out like the results table:
+    Station, Depth, Start, End, AHD, TVD, then high/low/median pressure and
+    temperature for the top gauge and for the bottom gauge.
+    """
+    ahd_list = (tvd_data or {}).get('ahd_values', [])
+    tvd_list = (tvd_data or {}).get('tvd_values', [])
+
+    rows = []
+    for station in station_timings:
+        depth_raw = station.get('depth')
+        ahd_calc = tvd_calc = None
+        if depth_raw is not None:
+            try:
+                ahd_calc, tvd_calc = calculate_ahd_tvd(bdf, float(depth_raw), ahd_list, tvd_list)
+            except Exception:
+                ahd_calc, tvd_calc = None, None
+
+        row = [
+            station['station'],
+            str(station.get('depth', 'N/A')),
+            station['start'].strftime("%H:%M:%S"),
+            station['end'].strftime("%H:%M:%S"),
+            f"{ahd_calc:.2f}" if ahd_calc is not None else "N/A",
+            f"{tvd_calc:.2f}" if tvd_calc is not None else "N/A",
+        ]
+        for data in (top_data, bottom_data):
+            if data is None or len(data) == 0:
+                row += [""] * 6
+                continue
+            stats = data.station_statistics(station['start'], station['end']) or ["N/A"] * 6
+            row += [_format_value(stat) for stat in stats]
+        rows.append(row)
+    return rows
+
+
+def statistics_rows(result_rows):
+    """The AHD..bottom statistics columns that go into the interpretation template."""
+    return [row[4:18] for row in result_rows]
+
+
+# --------------------------------------------------
+# Events
+# --------------------------------------------------
+def ordinal(n):
+    """Convert integer to ordinal string (1st, 2nd, 3rd, etc.)"""
+    if 10 <= n % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+def generate_events(top_data, bottom_data, station_timings):
+    """Standard survey events (battery, ATM, swab valve, THP, stops) from the data and stations."""
+    events = []
+
+    # 1. Battery connected (earliest time from .txt file)
+    start_times = [data.times.min() for data in (top_data, bottom_data) if data]
+    if start_times:
+        events.append((to_datetime(min(start_times)), "Battery Connected"))
+
+    # 2. ATM Reading (start time of ATM station)
+    atm_stations = [s for s in station_timings if s['station'] == 'ATM']
+    if atm_stations:
+        events.append((atm_stations[0]['start'], "Reading ATM"))
+
+    # 3. Open Swab Valve (first sustained rise above atmospheric pressure)
+    if top_data:
+        swab_time = detect_swab_valve_opening(top_data, atm_stations[0] if atm_stations else None)
+        if swab_time is not None:
+            events.append((swab_time, "Open Swab Valve"))
+
+    # 4. THP Reading and POOH events
+    thp_stations = [s for s in station_timings if s['station'] == 'THP']
+    non_thp_stations = [s for s in station_timings if s['station'] not in ['ATM', 'THP']]
+
+    for idx, thp in enumerate(thp_stations):
+        # THP Reading event
+        events.append((thp['start'], "Reading THP"))
+
+        # RIH after every THP reading except the last
+        if idx < len(thp_stations) - 1:
+            events.append((thp['end'], "RIH"))
+
+        # For each non-THP station after this THP
+        station_count = 0
+        for station in non_thp_stations:
+            if station['start'] > thp['end']:
+                station_count += 1
+
+                # Station start event
+                events.append((
+                    station['start'],
+                    f"{ordinal(station_count)} Stop at {station['depth']} ft WLD"
+                ))
+
+                # Station end event (POOH)
+                events.append((station['end'], "POOH"))
+
+    return events
+
+
+# --------------------------------------------------
+# Excel outputs
+# --------------------------------------------------
+def fill_interpretation_template(workbook_path, rows, survey, analysis=None):
+    """
+    Save a filled interpretation template to `workbook_path`: the statistics
+    `rows` (14 display strings each, pasted from C13) and the survey header.
+    Blank rows keep their position but do not count as stations. A gradient
+    `analysis` (see gradients.analyse_gradients) is added as its own sheet.
+    """
+    wb = get_template_service().open(INTERPRETATION_TEMPLATE)
+    sheet = wb.active
+
+    # Count valid data rows (non-empty)
+    x = sum(1 for row in rows if any(str(value).strip() for value in row))
+
+    # Calculate unused rows
+    U = TEMPLATE_ROWS - x
+
+    gauge_type = survey.get('gauge_type')
+    spm_depths = survey.get('spm_depths') or []
+
+    # --- Handle SGS/FGS specific changes ---
+    if gauge_type == "SGS":
+        # SGS: Change B1 to "STATIC GRADIENT SURVEY"
+        sheet['B1'] = "STATIC GRADIENT SURVEY"
+
+        # Hide columns X to Z
+        for col in ['X', 'Y', 'Z']:
+            sheet.column_dimensions[col].hidden = True
+
+    elif gauge_type == "FGS":
+        # FGS: Change B1 to "FLOWING GRADIENT SURVEY"
+        sheet['B1'] = "FLOWING GRADIENT SURVEY"
+
+        # Make sure columns X-Z are not hidden
+        for col in ['X', 'Y', 'Z']:
+            sheet.column_dimensions[col].hidden = False
+
+        # Change all cells in column B that contain "static. grad" to "flw. grad"
+        for row in sheet.iter_rows(min_col=2, max_col=2):  # Column B is column 2
+            cell = row[0]
+            if cell.value and "static. grad" in str(cell.value):
+                cell.value = str(cell.value).replace("static. grad", "flw. grad")
+
+        start_row = 12
+        if spm_depths:
+            # SPM numbers in column X (24), depths in column Y (25)
+            write_block(sheet, start_row, 24, [[i + 1, float(depth)] for i, depth in enumerate(spm_depths)])
+
+            # Clear contents and formatting below the last SPM row
+            last_spm_row = start_row + len(spm_depths)
+            clear_block(sheet, last_spm_row, sheet.max_row, 24, 25, reset_style=True)
+            clear_block(sheet, last_spm_row, sheet.max_row, 36, 36, reset_style=True)
+        else:
+            # If no SPM depths but FGS is selected, clear the SPM columns
+            clear_block(sheet, start_row, sheet.max_row, 24, 26, reset_style=True)
+
+    # Delete unused rows if needed
+    if U > 0:
+        start_top = 82 - U
+        sheet.delete_rows(start_top, U + 1)  # +1 to include end row
+
+    # Station statistics from C13 (blank rows are left as they are)
+    write_block(sheet, TEMPLATE_FIRST_ROW, 3, [
+        [_excel_value(value) for value in row[:14]] if any(str(value).strip() for value in row) else []
+        for row in rows
+    ])
+
+    # Header information
+    sheet.cell(row=3, column=3, value=f": {survey.get('location')}")
+    sheet.cell(row=4, column=3, value=f": {survey.get('well')}")
+    sheet.cell(row=3, column=18, value=survey.get('date'))
+    sheet.cell(row=4, column=18, value=survey.get('sea_level'))
+    sheet.cell(row=5, column=18, value=survey.get('bdf'))
+
+    # Second last station row is the second lubricator reading
+    last_data_row = 14 + x - 1
+    sheet.cell(row=last_data_row - 1, column=2, value="2nd lubr.")
+
+    if analysis is not None:
+        write_gradient_sheet(wb, analysis)
+
+    wb.save(workbook_path)
+    return workbook_path
+
+
+def _excel_value(text):
+    """Numbers as numbers, anything else (e.g. "N/A") as text."""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+
+def _cell_number(value):
+    return None if value is None or value != value else round(float(value), 4)
+
+
+def write_gradient_sheet(wb, analysis):
+    """Station gradients, fitted fluid segments and contacts on a separate sheet of the workbook."""
+    if GRADIENT_SHEET in wb.sheetnames:
+        del wb[GRADIENT_SHEET]
+    sheet = wb.create_sheet(GRADIENT_SHEET)
+    gauges = list(analysis["gauges"].items())
+
+    # Station table: depth, median pressure and the gradient from the station above, per gauge
+    header = ["Station", "TVD (ft)"]
+    for name, _ in gauges:
+        label = name.capitalize()
+        header += [f"{label} P (psia)", f"{label} T (F)", f"{label} psi/ft", f"{label} F/ft"]
+    sheet.append(header)
+    for i, (station, depth) in enumerate(zip(analysis["stations"], analysis["depths"])):
+        row = [station, _cell_number(depth)]
+        for _, result in gauges:
+            row += [
+                _cell_number(result["pressures"][i]),
+                _cell_number(result["temperatures"][i]),
+                _cell_number(result["pressure_gradients"][i - 1]) if i else None,
+                _cell_number(result["temperature_gradients"][i - 1]) if i else None,
+            ]
+        sheet.append(row)
+
+    # Fitted segments and contacts
+    sheet.append([])
+    sheet.append(["Gauge", "Fluid", "Top TVD (ft)", "Bottom TVD (ft)", "Gradient (psi/ft)", "Stations"])
+    for name, result in gauges:
+        for segment in result["segments"]:
+            sheet.append([name.capitalize(), segment["fluid"].capitalize(), _cell_number(segment["top"]),
+                          _cell_number(segment["bottom"]), _cell_number(segment["gradient"]), segment["stations"]])
+    sheet.append([])
+    sheet.append(["Gauge", "Contact", "TVD (ft)", "Pressure (psia)"])
+    for name, result in gauges:
+        for contact in result["contacts"]:
+            sheet.append([name.capitalize(), contact["contact"], _cell_number(contact["depth"]),
+                          _cell_number(contact["pressure"])])
+
+    for column in sheet.columns:
+        sheet.column_dimensions[column[0].column_letter].width = 16
+    return sheet
+
+
+def fill_tvd_workbook(output_path, survey):
+    """Write the MD-to-TVD calculation workbook for a survey."""
+    wb = get_template_service().open(TVD_TEMPLATE)
+    sheet = wb["Calculation"]
+    station_timings = survey.get('station_timings') or []
+    tvd_data = survey.get('tvd_data') or {}
+
+    # Header values
+    sheet["D2"] = survey.get('bdf')
+    sheet["D3"] = survey.get('sea_level')
+    sheet["D4"] = survey.get('gauge_type', "")
+
+    sheet["I2"] = survey.get('date')
+    sheet["I3"] = survey.get('location')
+    sheet["I4"] = survey.get('well')
+
+    # Depths → Column B (starting B9)
+    start_row = 9
+    write_block(sheet, start_row, 2, [[station.get("depth")] for station in station_timings])
+
+    # Clear columns B–J below last depth row (merged cells are section labels, left alone)
+    last_depth_row = start_row + len(station_timings) - 1
+    clear_block(sheet, last_depth_row + 1, sheet.max_row, 2, 10)
+
+    # SPM Depths → Column C (starting C31): one row per depth with the row 9 formulas (C–J) copied as they are
+    spm_start_row = 31
+    spm_depths = survey.get('spm_depths') or []
+    if spm_depths:
+        base_formulas = [sheet.cell(row=9, column=col).value for col in range(3, 11)]
+        write_block(sheet, spm_start_row, 3, [base_formulas] * len(spm_depths))
+
+    # AHD / TVD Mapping → Columns L & M (starting row 3)
+    write_block(sheet, 3, 12, zip(tvd_data.get("ahd_values", []), tvd_data.get("tvd_values", [])))
+
+    wb.save(output_path)
+    return output_path
@@ -0,0 +1,4 @@
+# Expose key components from each module
+from .model import ToolEntry, ToolString
+
+from .bha_file import DETAIL_FIELDS, read_bha, write_bha
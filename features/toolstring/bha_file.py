@@ -0,0 +1,26 @@
+# bha_file.py
+"""Reading and writing tool strings saved as .bha (JSON) files."""
+import json
+
+from features.toolstring.model import ToolEntry, ToolString
+
+DETAIL_FIELDS = ("client_name", "location", "well_no", "max_angle", "well_type", "operation_details", "comments")
+
+
+def read_bha(file_name):
+    """(job details, ToolString) of a saved .bha or .json file."""
+    with open(file_name, "r") as f:
+        config = json.load(f)
+
+    details = {field: config.get(field, "") for field in DETAIL_FIELDS}
+    tool_string = ToolString(ToolEntry.from_bha(tool) for tool in config.get("tools", []))
+    return details, tool_string
+
+
+def write_bha(file_name, details, tool_string):
+    """Saves job details (keys of DETAIL_FIELDS) and a ToolString as a .bha file."""
+    config = {field: details.get(field, "") for field in DETAIL_FIELDS}
+    config["tools"] = [entry.to_bha() for entry in tool_string]
+
+    with open(file_name, "w") as f:
+        json.dump(config, f, indent=4)
@@ -0,0 +1,408 @@
+# builder.py
+"""
+Tool strings assembled from the catalog for a job.
+
+    job = Job(max_od=1.875, required=["GS"], weight_above_jars=60)
+    strings, complete = build_tool_strings(job)
+    for built in strings:
+        print(built.describe())
+
+A string runs from a rope socket, through stems and jars, down to the last
+required tool, with crossovers where the threads change; each tool is
+joined to the one above only where the connection graph says they make up.
+
+The search is best-first branch and bound: partial strings come off a
+queue lightest bound first, so the search can stop as soon as the next
+one cannot beat the k-th best string found. Tools wider than the job's max
+OD are never considered, and tools that weigh, measure and thread the
+same count once. Before the search, the least weight and length that
+still have to go below each kind of tool to finish a string (jar,
+required tools, crossovers to reach them) are worked out once over the
+thread graph, and the stem weights above the jar are tabled like a
+knapsack, so a partial string is bounded by the lightest stem weight it
+can actually make up, not just the weight it lacks. Strings rank by total
+weight, then total length; the same tools in another order are the same
+string.
+"""
+import heapq
+import itertools
+import math
+import time
+
+import numpy as np
+
+from features.toolstring.connections import get_connection_graph, is_crossover, thread_type
+from features.toolstring.model import ToolEntry, ToolString
+
+TOP_TOOL = "Rope Socket"
+FILLER_CATEGORY = "Basic Tools"
+MAX_TOOLS = 10  # Longest string considered, rope socket and required tools included
+TIME_LIMIT_S = 0.8  # The search stops here and returns the best strings found so far
+INFINITY = float("inf")
+WEIGHT_TOLERANCE = 1e-6  # Sums of the same tools in another order differ by float noise
+
+
+def is_jar(tool_name):
+    return "Jar" in tool_name
+
+
+def is_stem(tool_name):
+    return "Stem" in tool_name
+
+
+class Job:
+    """
+    What the string is for: the largest OD the restriction allows, tools it
+    must contain (top to bottom, the last one at the bottom), the weight
+    wanted above the jars (0 for no jar) and, optionally, the connection the
+    bottom of the string has to make up with.
+    """
+
+    __slots__ = ("max_od", "required", "weight_above_jars", "bottom_connection", "max_tools")
+
+    def __init__(self, max_od, required=(), weight_above_jars=0.0, bottom_connection=None, max_tools=MAX_TOOLS):
+        self.max_od = max_od
+        self.required = list(required)
+        self.weight_above_jars = weight_above_jars
+        self.bottom_connection = bottom_connection
+        self.max_tools = max_tools
+
+
+class BuiltString:
+    """A string found by the builder: catalog nodes top to bottom and the thread joining each pair."""
+
+    __slots__ = ("nodes", "joints", "weight", "length", "max_od", "weight_above_jars")
+
+    def __init__(self, nodes, joints, weight, length, weight_above_jars):
+        self.nodes = nodes
+        self.joints = joints
+        self.weight = weight
+        self.length = length
+        self.max_od = max(node.od for node in nodes)
+        self.weight_above_jars = weight_above_jars
+
+    def describe(self):
+        tools = " → ".join(f"{node.name} ({node.size})" for node in self.nodes)
+        return f"{tools}  |  {self.weight:.1f} lbs, {self.length:.1f} ft, max OD {self.max_od:.3f} in"
+
+    def to_tool_string(self):
+        entries = []
+        for index, node in enumerate(self.nodes):
+            entries.append(ToolEntry(
+                node.name, node.size, node.od, node.length, node.weight,
+                self.joints[index - 1] if index > 0 else "",
+                self.joints[index] if index < len(self.joints) else "",
+            ))
+        return ToolString(entries)
+
+
+def _by_top(nodes):
+    """{thread type: nodes with that top connection, lightest first}"""
+    index = {}
+    for node in sorted(nodes, key=lambda n: (n.weight, n.length)):
+        for top in node.tops:
+            index.setdefault(top, []).append(node)
+    return index
+
+
+def _interchangeable(nodes):
+    """
+    `nodes` with one kept for each group that weighs, measures and threads
+    the same (a roller stem and a normal stem, say), the narrowest: swapping
+    one for another never changes a string's rank, only fills the k best
+    with copies.
+    """
+    kept = {}
+    for node in sorted(nodes, key=lambda n: n.od):
+        kept.setdefault((node.name if not is_stem(node.name) else "Stem", node.weight, node.length,
+                         node.tops, node.lowers), node)
+    return list(kept.values())
+
+
+class _Search:
+    """State of one build_tool_strings call."""
+
+    def __init__(self, job, graph, k, time_limit):
+        self.job = job
+        self.k = k
+        self.time_limit = time_limit
+        self.deadline = time.perf_counter() + time_limit
+
+        def fits(node):
+            return node.od <= job.max_od + 1e-9
+
+        self.tops = sorted((n for n in graph.nodes if n.name == TOP_TOOL and fits(n)),
+                           key=lambda n: (n.weight, n.length))
+        fillers = _interchangeable(n for n in graph.nodes
+                                   if fits(n) and n.name != TOP_TOOL and n.name not in job.required
+                                   and (n.category == FILLER_CATEGORY and (is_stem(n.name) or is_jar(n.name))
+                                        or is_crossover(n.name) and n.tops != n.lowers))
+        self.required = [_interchangeable(n for n in graph.nodes if n.name == name and fits(n))
+                         for name in job.required]
+        self.filler_by_top = _by_top(fillers)
+        # Stems with the same threads can go in any order; only strings with them heaviest first are searched
+        self.stem_rank = {id(n): rank for rank, n in enumerate(sorted(fillers, key=lambda n: (n.weight, n.length)))
+                          if is_stem(n.name)}
+        self.required_by_top = [_by_top(options) for options in self.required]
+        self.bottom = thread_type(job.bottom_connection)
+        self.need_jar = job.weight_above_jars > 0
+
+        self._successors = {}
+        self.finish = self._finish_costs()
+        self.stem_tables = self._stem_tables(n for n in fillers if not is_jar(n.name))
+
+        self.best = []  # Max-heap on (weight, length) of the k best: (-weight, -length, tiebreak, BuiltString)
+        self.best_contents = {}  # {contents: heap entry}; the same tools in another order make the same string
+        self.tiebreak = itertools.count()
+        self.expanded = 0
+        self.queue = []  # Min-heap of partial strings by bound: (weight, length, tiebreak, partial)
+        # Partial strings at the same weight whose last tools have the same lower connections, over the
+        # same threads, have the same completions: keep the (length, tool count, tools) searched for each
+        # and skip a partial string once k with other tools are no longer and no bigger, as each of its
+        # completions then has k different strings at least as good
+        self.searched = {}
+
+    @staticmethod
+    def contents(path):
+        """The tools in `path` whatever their order."""
+        return tuple(sorted(id(node) for node in path))
+
+    def state(self, node, jar_placed, next_required):
+        return node.lowers, is_crossover(node.name), jar_placed, next_required
+
+    def finished(self, node, jar_placed, next_required):
+        """Whether a string ending in `node` is complete, stem weight aside."""
+        return (next_required == len(self.required) and (jar_placed or not self.need_jar)
+                and (self.bottom is None or self.bottom in node.lowers))
+
+    def successors(self, lowers, crossover, next_required):
+        """
+        (node, thread, is_required, is_jar, is_crossover, stem rank or -1) for
+        each tool that makes up below, once each, lightest first.
+        """
+        key = (lowers, crossover, next_required)
+        if key not in self._successors:
+            self._successors[key] = self._find_successors(lowers, crossover, next_required)
+        return self._successors[key]
+
+    def _find_successors(self, lowers, crossover, next_required):
+        candidates = {}
+        for thread in sorted(lowers):
+            if next_required < len(self.required):
+                for node in self.required_by_top[next_required].get(thread, ()):
+                    candidates.setdefault(id(node), (node, thread, True))
+            if next_required < len(self.required) or not self.required:
+                for node in self.filler_by_top.get(thread, ()):
+                    if not (crossover and is_crossover(node.name)):  # Never two crossovers in a row
+                        candidates.setdefault(id(node), (node, thread, False))
+        return [(node, thread, is_required, is_jar(node.name), is_crossover(node.name),
+                 self.stem_rank.get(id(node), -1))
+                for node, thread, is_required in sorted(candidates.values(), key=lambda c: (c[0].weight, c[0].length))]
+
+    def _finish_costs(self):
+        """
+        {state: (least weight, least length) still to add below to finish a
+        string} for every state a tool can leave the search in, by relaxing
+        over the thread graph until nothing gets lighter or shorter. Stems and
+        crossovers above the jar count as nothing here: bound() charges them
+        from the stem tables instead. States that cannot be finished are absent.
+        """
+        nodes = list(self.tops)
+        for options in self.filler_by_top.values():
+            nodes.extend(options)
+        for options in self.required:
+            nodes.extend(options)
+
+        edges = {}
+        finish = {}
+        for node in nodes:
+            for jar_placed in (False, True):
+                for next_required in range(len(self.required) + 1):
+                    key = self.state(node, jar_placed, next_required)
+                    if key in edges:
+                        continue
+                    if self.finished(node, jar_placed, next_required):
+                        finish[key] = (0.0, 0.0)
+                    edges[key] = children = []
+                    for child, _, is_required, jar, _, _ in self.successors(node.lowers, is_crossover(node.name),
+                                                                             next_required):
+                        free = self.need_jar and not jar_placed and not jar and not is_required
+                        children.append((0.0 if free else child.weight, 0.0 if free else child.length,
+                                         self.state(child, jar_placed or jar,
+                                                    next_required + 1 if is_required else next_required)))
+
+        changed = True
+        while changed:
+            changed = False
+            for key, children in edges.items():
+                weight, length = finish.get(key, (INFINITY, INFINITY))
+                for child_weight, child_length, child in children:
+                    if child in finish:
+                        weight = min(weight, child_weight + finish[child][0])
+                        length = min(length, child_length + finish[child][1])
+                if (weight, length) != finish.get(key, (INFINITY, INFINITY)):
+                    finish[key] = (weight, length)
+                    changed = True
+        return finish
+
+    def _stem_tables(self, nodes):
+        """
+        For up to m stems and crossovers, ([shortest length that weighs exactly
+        w tenths of a pound], [least reachable weight from w up]) for each m, or
+        None when a weight is not a whole tenth. Thread order is ignored, so
+        they only ever under-estimate what a real string needs.
+        """
+        if not self.need_jar:
+            return None
+        shortest = {}
+        for node in nodes:
+            tenths = round(node.weight * 10)
+            if abs(tenths - node.weight * 10) > 1e-6:
+                return None
+            if tenths > 0:
+                shortest[tenths] = min(shortest.get(tenths, INFINITY), node.length)
+        if not shortest:
+            return None
+
+        size = round(self.job.weight_above_jars * 10) + max(shortest) + 1
+        lengths = np.full(size, INFINITY)
+        lengths[0] = 0.0
+        tables = []
+        for _ in range(self.job.max_tools + 1):
+            reachable = np.where(np.isfinite(lengths), np.arange(size), size)
+            tables.append((lengths.tolist(), np.minimum.accumulate(reachable[::-1])[::-1].tolist()))
+            more = lengths.copy()
+            for tenths, length in shortest.items():
+                np.minimum(more[tenths:], lengths[:-tenths] + length, out=more[tenths:])
+            lengths = more
+        return tables
+
+    def least_stems(self, need, tools):
+        """Least (weight, length) that `tools` more stems and crossovers can add to weigh at least `need`."""
+        if need <= 0:
+            return 0.0, 0.0
+        if self.stem_tables is None:
+            return need, 0.0
+        if tools <= 0:
+            return INFINITY, INFINITY
+        lengths, reachable = self.stem_tables[min(tools, len(self.stem_tables) - 1)]
+        tenths = reachable[math.ceil(need * 10 - 1e-6)]  # Tolerant of float noise in `need`
+        if tenths == len(lengths):
+            return INFINITY, INFINITY
+        return tenths / 10, lengths[tenths]
+
+    def bound(self, node, crossover, weight, length, above, jar_placed, next_required, tools):
+        """Least (weight, length) any string starting with this partial one of `tools` tools can have."""
+        finish_weight, finish_length = self.finish.get((node.lowers, crossover, jar_placed, next_required),
+                                                       (INFINITY, INFINITY))
+        if self.need_jar and not jar_placed:
+            free = self.job.max_tools - tools - 1 - (len(self.required) - next_required)
+            stem_weight, stem_length = self.least_stems(self.job.weight_above_jars - above, free)
+            return weight + stem_weight + finish_weight, length + stem_length + finish_length
+        return weight + finish_weight, length + finish_length
+
+    def beaten(self, low_weight, low_length):
+        if low_weight == INFINITY:
+            return True
+        if len(self.best) < self.k:
+            return False
+        worst_weight, worst_length = -self.best[0][0], -self.best[0][1]
+        if abs(low_weight - worst_weight) > WEIGHT_TOLERANCE:
+            return low_weight > worst_weight
+        return low_length >= worst_length - WEIGHT_TOLERANCE
+
+    def record(self, path, joints, weight, length, above):
+        contents = self.contents(path)
+        if contents in self.best_contents:
+            return
+        built = BuiltString(list(path), list(joints), weight, length, above)
+        # Rounded so sums of the same tools in another order rank as the same weight
+        entry = (-round(weight, 6), -round(length, 6), next(self.tiebreak), built)
+        self.best_contents[contents] = entry
+        if len(self.best) < self.k:
+            heapq.heappush(self.best, entry)
+        else:
+            dropped = heapq.heappushpop(self.best, entry)
+            del self.best_contents[self.contents(dropped[3].nodes)]
+
+    def push(self, low_weight, low_length, partial):
+        # Rounded like record(), or float noise would queue a shorter string behind longer ones of its weight
+        heapq.heappush(self.queue, (round(low_weight, 6), round(low_length, 6), next(self.tiebreak), partial))
+
+    def expand(self, path, joints, weight, length, above, jar_placed, next_required):
+        job = self.job
+        last = path[-1]
+        if self.finished(last, jar_placed, next_required) and above >= job.weight_above_jars:
+            self.record(path, joints, weight, length, above)
+        if len(path) >= job.max_tools:
+            return
+
+        candidates = self.successors(last.lowers, is_crossover(last.name), next_required)
+        previous_joint = joints[-1] if joints else None
+        used = frozenset(joints)
+        last_rank = self.stem_rank.get(id(last), -1)
+        keep_thread = previous_joint in last.lowers
+        for node, thread, is_required, jar, crossover, rank in candidates:
+            if rank > last_rank >= 0 and node.tops == last.tops and node.lowers == last.lowers:
+                continue  # The same stems heaviest first turn up on another branch
+            if keep_thread and previous_joint in node.tops:
+                thread = previous_joint  # Keep the thread running down the string where it can
+            if crossover and node.lowers <= used:
+                continue  # Never cross back to a thread already used higher up
+            new_weight = weight + node.weight
+            new_length = length + node.length
+            new_above = above if jar_placed or jar else above + node.weight
+            new_jar_placed = jar_placed or jar
+            new_required = next_required + 1 if is_required else next_required
+            if jar and not jar_placed and new_above < job.weight_above_jars:
+                continue  # Not enough weight above this jar, and nothing added below can change that
+
+            low_weight, low_length = self.bound(node, crossover, new_weight, new_length, new_above, new_jar_placed,
+                                                new_required, len(path) + 1)
+            if not self.beaten(low_weight, low_length):
+                self.push(low_weight, low_length, (path + (node,), joints + (thread,), new_weight, new_length,
+                                                   new_above, new_jar_placed, new_required))
+
+    def dominated(self, path, joints, weight, length, jar_placed, next_required):
+        """Whether k others with the same completions, no longer and no bigger, were expanded before this one."""
+        contents = self.contents(path)
+        key = (self.state(path[-1], jar_placed, next_required), frozenset(joints), round(weight, 1))
+        seen = self.searched.setdefault(key, [])
+        better = {seen_contents for seen_length, seen_tools, seen_contents in seen
+                  if seen_length <= length + 1e-6 and seen_tools <= len(path)}
+        if contents in better or len(better) >= self.k:
+            return True
+        seen.append((length, len(path), contents))
+        return False
+
+    def run(self):
+        """The k best strings, best first, and whether the search finished in time to be sure of them."""
+        if not self.tops or any(not options for options in self.required):
+            return [], True
+        for top in self.tops:
+            self.push(*self.bound(top, False, top.weight, top.length, top.weight, False, 0, 1),
+                      ((top,), (), top.weight, top.length, top.weight, False, 0))
+        complete = True
+        while self.queue:
+            low_weight, low_length, _, partial = self.queue[0]
+            if self.beaten(low_weight, low_length):
+                break  # Everything still queued is at least this heavy
+            heapq.heappop(self.queue)
+            path, joints, weight, length, above, jar_placed, next_required = partial
+            if self.dominated(path, joints, weight, length, jar_placed, next_required):
+                continue
+            self.expanded += 1
+            if self.expanded % 256 == 0 and time.perf_counter() > self.deadline:
+                complete = False
+                break
+            self.expand(*partial)
+        return [entry[3] for entry in sorted(self.best, key=lambda e: (-e[0], -e[1], e[2]))], complete
+
+
+def build_tool_strings(job, k=5, graph=None, time_limit=TIME_LIMIT_S):
+    """
+    The `k` lightest (then shortest) strings that satisfy `job`, best first,
+    and whether the search finished: if it ran out of time they are only the
+    best found so far.
+    """
+    return _Search(job, graph or get_connection_graph(), k, time_limit).run()
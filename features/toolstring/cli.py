@@ -0,0 +1,79 @@
+# cli.py
+"""
+Tool strings without the editor.
+
+    python -m features.toolstring.cli summary string.bha
+    python -m features.toolstring.cli build --max-od 1.875 --require GS --weight 60
+
+`summary` prints the tools of a saved string with max OD, total length
+and total weight, as the editor's summary panel shows them. `build` prints
+the lightest catalog strings for a job (see builder.py).
+"""
+import argparse
+import sys
+
+from features.toolstring.bha_file import read_bha
+from features.toolstring.builder import MAX_TOOLS, Job, build_tool_strings
+
+
+def format_summary(tool_string):
+    """The tools of a string and its totals as a text table."""
+    lines = [f"{'Tool':<40} {'Size':>10} {'OD (in)':>9} {'Length (ft)':>12} {'Weight (lbs)':>13}"]
+    for entry in tool_string:
+        lines.append(f"{entry.name:<40} {entry.nominal_size:>10} {entry.od_text:>9} "
+                     f"{entry.length_text:>12} {entry.weight_text:>13}")
+    lines.append("")
+    lines.append(f"Max OD:       {tool_string.max_od:.3f} in ({tool_string.max_od * 25.4:.1f} mm)")
+    lines.append(f"Total Length: {tool_string.total_length:.1f} ft ({tool_string.total_length * 0.3048:.1f} m)")
+    lines.append(f"Total Weight: {tool_string.total_weight:.1f} lbs ({tool_string.total_weight * 0.453592:.1f} kg)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m features.toolstring.cli", description="Tool string utilities.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary = commands.add_parser("summary", help="print the tools and totals of a .bha file")
+    summary.add_argument("file", help="saved tool string (.bha)")
+
+    build = commands.add_parser("build", help="suggest the lightest catalog strings for a job")
+    build.add_argument("--max-od", type=float, required=True, help="largest OD the restriction allows (in)")
+    build.add_argument("--require", action="append", default=[], metavar="TOOL",
+                       help="tool the string must contain, top to bottom (repeatable)")
+    build.add_argument("--weight", type=float, default=0.0, help="weight wanted above the jars (lbs), 0 for none")
+    build.add_argument("--bottom", help="connection the bottom of the string must make up with")
+    build.add_argument("--max-tools", type=int, default=MAX_TOOLS, help="longest string considered")
+    build.add_argument("-k", type=int, default=5, help="number of strings to print")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        try:
+            details, tool_string = read_bha(args.file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Could not read {args.file}: {e}", file=sys.stderr)
+            return 1
+        title = " / ".join(value for value in (details["client_name"], details["well_no"]) if value)
+        if title:
+            print(title)
+        print(format_summary(tool_string))
+
+    elif args.command == "build":
+        job = Job(args.max_od, args.require, args.weight, args.bottom, args.max_tools)
+        results, complete = build_tool_strings(job, k=args.k)
+        if not complete:
+            print("⚠️ The search ran out of time, so results may not be optimal.", file=sys.stderr)
+        if not results:
+            if complete:
+                print("No string in the catalog fits this job.", file=sys.stderr)
+            return 1
+        for number, built in enumerate(results, 1):
+            print(f"#{number}: {built.weight:.1f} lbs, {built.length:.1f} ft, "
+                  f"{built.weight_above_jars:.1f} lbs above jars")
+            print(format_summary(built.to_tool_string()))
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
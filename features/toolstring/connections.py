@@ -0,0 +1,153 @@
+# connections.py
+"""
+Which catalog tools can be made up with which.
+
+Every (tool, nominal size) of the catalog is a node with the thread types
+of its top and lower connections. Two tools make up when the lower thread
+type of the upper one is a top thread type of the one below; the graph
+keeps nodes bucketed by top and by lower thread type, so the tools that fit
+under a connection are a dict lookup rather than a scan of the catalog.
+"""
+import re
+
+GENDER = re.compile(r"\s+(Pin|Box)$", re.IGNORECASE)
+UNKNOWN = ("", "-", "n/a", "nan")
+
+
+def thread_type(connection):
+    """Connection text without its pin/box side: '15/16" SR Box' -> '15/16" SR'. None when unknown."""
+    text = " ".join(str(connection or "").split())
+    text = GENDER.sub("", text)
+    return None if text.lower() in UNKNOWN else text
+
+
+def is_crossover(tool_name):
+    return "X-Over" in tool_name
+
+
+class ToolNode:
+    """One (tool, nominal size) of the catalog with its dimensions and thread types."""
+
+    __slots__ = ("name", "size", "category", "od", "length", "weight", "tops", "lowers")
+
+    def __init__(self, name, size, category, od, length, weight, tops, lowers):
+        self.name = name
+        self.size = size
+        self.category = category
+        self.od = od
+        self.length = length
+        self.weight = weight
+        self.tops = tops
+        self.lowers = lowers
+
+    def __repr__(self):
+        return f"ToolNode({self.name!r}, {self.size!r})"
+
+
+class Mismatch:
+    """Tools `index` and `index + 1` of a string whose connections do not make up."""
+
+    __slots__ = ("index", "upper", "lower", "crossovers")
+
+    def __init__(self, index, upper, lower, crossovers):
+        self.index = index
+        self.upper = upper  # Lower connection of the upper tool
+        self.lower = lower  # Top connection of the tool below
+        self.crossovers = crossovers
+
+    def __repr__(self):
+        return f"Mismatch({self.index}, {self.upper!r}, {self.lower!r})"
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if number != number else number  # NaN -> 0
+
+
+class ConnectionGraph:
+    """
+    Compatibility of catalog tools keyed by normalised thread type.
+
+    Built once from the catalog. `by_top[type]` and `by_lower[type]` list
+    the nodes with that top or lower thread type, and
+    `crossovers[(top, lower)]` the X-Overs going from one type to another.
+    """
+
+    def __init__(self, catalog):
+        categories = dict(catalog.tool_listing[["Tool Name", "Category"]].itertuples(index=False))
+        self.nodes = []
+        self.by_top = {}
+        self.by_lower = {}
+        self.crossovers = {}
+
+        for name, info in catalog.tools.items():
+            for size in info["Nominal Sizes"]:
+                data = info["Sizes"][size]
+                node = ToolNode(
+                    name, str(size), categories.get(name, ""),
+                    _number(data["OD"]), _number(data["Length"]), _number(data["Weight"]),
+                    frozenset(filter(None, map(thread_type, data["Top Connections"]))),
+                    frozenset(filter(None, map(thread_type, data["Lower Connections"]))),
+                )
+                self.nodes.append(node)
+                for top in node.tops:
+                    self.by_top.setdefault(top, []).append(node)
+                for lower in node.lowers:
+                    self.by_lower.setdefault(lower, []).append(node)
+                if is_crossover(name):
+                    for top in node.tops:
+                        for lower in node.lowers:
+                            self.crossovers.setdefault((top, lower), []).append(node)
+
+    def next_tools(self, connection):
+        """Nodes whose top connection makes up with `connection` (a lower connection)."""
+        return list(self.by_top.get(thread_type(connection), ()))
+
+    def successors(self, node):
+        """Nodes that can be made up below `node`."""
+        seen = set()
+        result = []
+        for lower in node.lowers:
+            for candidate in self.by_top.get(lower, ()):
+                if id(candidate) not in seen:
+                    seen.add(id(candidate))
+                    result.append(candidate)
+        return result
+
+    def crossovers_between(self, upper, lower):
+        """X-Overs that fit under connection `upper` and above connection `lower`."""
+        return list(self.crossovers.get((thread_type(upper), thread_type(lower)), ()))
+
+    def validate(self, entries):
+        """
+        Mismatches between consecutive tools of a string (ToolEntry-like
+        objects with top_connection and lower_connection), in one pass.
+        Connections that are not known on either side are not reported.
+        """
+        mismatches = []
+        for index in range(len(entries) - 1):
+            upper = entries[index].lower_connection
+            lower = entries[index + 1].top_connection
+            upper_type, lower_type = thread_type(upper), thread_type(lower)
+            if upper_type and lower_type and upper_type != lower_type:
+                crossovers = self.crossovers.get((upper_type, lower_type), [])
+                mismatches.append(Mismatch(index, upper, lower, crossovers))
+        return mismatches
+
+
+_graph = None
+_graph_catalog = None
+
+
+def get_connection_graph():
+    """The connection graph of the current catalog, rebuilt when the catalog is reloaded."""
+    global _graph, _graph_catalog
+    from database.logic_database import get_catalog
+    catalog = get_catalog()
+    if _graph is None or _graph_catalog is not catalog:
+        _graph = ConnectionGraph(catalog)
+        _graph_catalog = catalog
+    return _graph
@@ -0,0 +1,206 @@
+# model.py
+"""
+Qt-free tool string: the tools in order, with running totals.
+
+The drop zone edits a ToolString and its widgets observe it; saving,
+exporting and the command line read the same object, so nothing has to
+parse numbers back out of widget text.
+"""
+import heapq
+
+from utils.logic_utils import get_number
+
+
+def _parse_dimension(text):
+    """'1.500 in' -> 1.5; None for 'N/A' or an empty value."""
+    if text is None or str(text).strip() in ("", "N/A"):
+        return None
+    return get_number(str(text))
+
+
+def format_od(od):
+    return "N/A" if od is None else f"{od:.3f} in"
+
+
+def format_length(length):
+    return "N/A" if length is None else f"{length:.1f} ft"
+
+
+def format_weight(weight):
+    return "N/A" if weight is None else f"{weight:.1f} lbs"
+
+
+class ToolEntry:
+    """One tool of a string. OD is in inches, length in feet and weight in pounds (None when unknown)."""
+
+    __slots__ = ("name", "nominal_size", "od", "length", "weight", "top_connection", "lower_connection")
+
+    def __init__(self, name, nominal_size="", od=None, length=None, weight=None,
+                 top_connection="", lower_connection=""):
+        self.name = name
+        self.nominal_size = nominal_size
+        self.od = od
+        self.length = length
+        self.weight = weight
+        self.top_connection = top_connection
+        self.lower_connection = lower_connection
+
+    def __repr__(self):
+        return f"ToolEntry({self.name!r}, {self.nominal_size!r})"
+
+    @property
+    def od_text(self):
+        return format_od(self.od)
+
+    @property
+    def length_text(self):
+        return format_length(self.length)
+
+    @property
+    def weight_text(self):
+        return format_weight(self.weight)
+
+    def to_bha(self):
+        """The tool as stored in a .bha file."""
+        return {
+            "name": self.name,
+            "nominal_size": self.nominal_size,
+            "od": self.od_text,
+            "length": self.length_text,
+            "weight": self.weight_text,
+            "top_connection": self.top_connection,
+            "lower_connection": self.lower_connection,
+        }
+
+    @classmethod
+    def from_bha(cls, data):
+        return cls(
+            data["name"],
+            data.get("nominal_size", ""),
+            _parse_dimension(data.get("od")),
+            _parse_dimension(data.get("length")),
+            _parse_dimension(data.get("weight")),
+            data.get("top_connection", ""),
+            data.get("lower_connection", ""),
+        )
+
+    def export_row(self):
+        """The tool's row of the exported report."""
+        return ["", "", f"{self.name} ({self.nominal_size})", self.od or 0.0, self.top_connection,
+                self.lower_connection, self.length_text, self.weight or 0.0]
+
+
+class ToolString:
+    """
+    Ordered tools with their max OD, total length and total weight.
+
+    Totals are adjusted as tools are inserted, removed or edited instead of
+    being summed again: length and weight in O(1), max OD through a count
+    of each OD plus a max-heap whose stale tops are dropped when read. An OD
+    is pushed only while it is not already in the heap, so the heap never
+    holds more than the distinct ODs the string has had.
+    Observers (callables without arguments) are called after every change.
+    """
+
+    def __init__(self, entries=()):
+        self.entries = []
+        self.total_length = 0.0
+        self.total_weight = 0.0
+        self._od_counts = {}  # OD -> number of tools with that OD
+        self._od_heap = []  # Negated ODs; may hold ODs no tool has any more
+        self._od_in_heap = set()
+        self._observers = []
+        for entry in entries:
+            self._count(entry)
+            self.entries.append(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    @property
+    def max_od(self):
+        while self._od_heap and -self._od_heap[0] not in self._od_counts:
+            self._od_in_heap.discard(-heapq.heappop(self._od_heap))
+        return -self._od_heap[0] if self._od_heap else 0.0
+
+    def subscribe(self, callback):
+        self._observers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._observers):
+            callback()
+
+    def _count(self, entry):
+        self.total_length += entry.length or 0.0
+        self.total_weight += entry.weight or 0.0
+        od = entry.od or 0.0
+        self._od_counts[od] = self._od_counts.get(od, 0) + 1
+        if od not in self._od_in_heap:
+            self._od_in_heap.add(od)
+            heapq.heappush(self._od_heap, -od)
+
+    def _uncount(self, entry):
+        self.total_length -= entry.length or 0.0
+        self.total_weight -= entry.weight or 0.0
+        od = entry.od or 0.0
+        if self._od_counts[od] == 1:
+            del self._od_counts[od]
+        else:
+            self._od_counts[od] -= 1
+
+    def insert(self, index, entry):
+        self._count(entry)
+        self.entries.insert(index, entry)
+        self._notify()
+
+    def append(self, entry):
+        self.insert(len(self.entries), entry)
+
+    def remove(self, index):
+        """Removes and returns the tool at `index`."""
+        entry = self.entries.pop(index)
+        self._uncount(entry)
+        if not self.entries:
+            self.clear()  # Drops the rounding left over in the totals
+        else:
+            self._notify()
+        return entry
+
+    def move(self, source, target):
+        """Moves the tool at `source` so it ends up at `target`."""
+        entry = self.entries.pop(source)
+        self.entries.insert(max(0, min(target, len(self.entries))), entry)
+        self._notify()
+
+    def update(self, entry, **fields):
+        """Changes fields of a tool in the string, e.g. update(entry, nominal_size="2.5\"", od=2.5)."""
+        counted = not fields.keys().isdisjoint(("od", "length", "weight"))
+        if counted:
+            self._uncount(entry)
+        for field, value in fields.items():
+            setattr(entry, field, value)
+        if counted:
+            self._count(entry)
+        self._notify()
+
+    def clear(self):
+        self.entries.clear()
+        self.total_length = 0.0
+        self.total_weight = 0.0
+        self._od_counts.clear()
+        self._od_heap.clear()
+        self._od_in_heap.clear()
+        self._notify()
+
+    def export_rows(self):
+        return [entry.export_row() for entry in self.entries]
@@ -7,6 +7,8 @@ from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtGui import QFont, QIcon, QGuiApplication
 
+from database.logic_database import warm_up as warm_up_database
+from utils.image_cache import prefetch_tool_images
 from ui.windows.ui_start_window import StartWindow
 from ui.windows.ui_video_splash import VideoSplashScreen
 from utils.path_finder import get_path
@@ -86,6 +88,8 @@ def show_trial_check_and_start_window(user_name, user_email, trial):
 
     # Initialization
     app.setFont(QFont("Roboto", 10))
+    warm_up_database()  # Tool and PCE catalogs load in the background while the splash is up
+    prefetch_tool_images()  # Then every tool image is decoded, off the GUI thread
     init_manager = InitializationManager(splash)
     init_manager.start_initialization()
 
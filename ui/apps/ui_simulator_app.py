@@ -1,5 +1,4 @@
 # ui_simulator_app.py
-import math
 
 from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QWidget, QVBoxLayout,
                              QHBoxLayout, QMessageBox)
@@ -13,6 +12,7 @@ from ui.components.simulator.ui_results_tab import PlotsTab
 from ui.components.ui_footer import FooterWidget
 from ui.components.ui_sidebar_widget import SidebarWidget
 from ui.components.ui_titlebar import CustomTitleBar
+from utils.depth_reference import minimum_curvature
 from utils.path_finder import get_icon_path
 from utils.theme_manager import toggle_theme, apply_theme
 
@@ -129,63 +129,33 @@ class WirelineSimulatorApp(QMainWindow):
 
     def initial_trajectory(self):
 
-        mds = list(range(0, 4000, 20))  # 0-1000 ft in 100 ft increments
-        tvd = []
-        north = []
-        east = []
-        inclinations = []
-        dls_list = []
-        azimuths = []
+        mds = list(range(0, 4000, 20))  # 0-4000 ft in 20 ft increments
 
         # Trajectory parameters
-        ko_point = 800  # Kickoff at 5000 ft
-        build_rate = 0.5  # 2°/100 ft
+        ko_point = 800  # Kickoff at 800 ft
+        build_rate = 0.5  # 0.5° per 20 ft station
         target_inc = 30  # Final inclination
         azimuth = 45.0  # Constant azimuth
 
-        # Initialize tracking variables WITH VERTICAL SECTION VALUES
-        current_tvd = 0.0
-        current_north = 0.0
-        current_east = 0.0
+        inclinations = []
         current_inc = 0.0
-        current_dls = 0.0
-
         for md in mds:
             if current_inc < target_inc and md > ko_point:
                 current_inc = min(current_inc + build_rate, target_inc)
-
-            # Convert angles to radians
-            inc_rad = math.radians(current_inc)
-            az_rad = math.radians(azimuth)
-
-            # Calculate true vertical depth component
-            delta_tvd = 20 * math.cos(inc_rad)
-            current_tvd += delta_tvd
-
-            # Calculate horizontal displacement
-            delta_horizontal = 20 * math.sin(inc_rad)
-            delta_north = delta_horizontal * math.cos(az_rad)
-            delta_east = delta_horizontal * math.sin(az_rad)
-            current_north += delta_north
-            current_east += delta_east
-
-            # Store values
-            tvd.append(round(current_tvd, 2))
-            north.append(round(current_north, 2))
-            east.append(round(current_east, 2))
             inclinations.append(current_inc)
-            dls_list.append(current_dls)
+        azimuths = [azimuth] * len(mds)
+        dls_list = [0.0] * len(mds)
 
-            azimuths.append(azimuth)
+        north, east, tvd = minimum_curvature(mds, inclinations, azimuths)
 
         self.trajectory_data = {
             'mds': mds,
-            'tvd': [round(x, 2) for x in tvd],  # Rounded for readability
+            'tvd': [round(float(x), 2) for x in tvd],  # Rounded for readability
             'inclinations': inclinations,
             'dls_list': dls_list,
             'azimuths': azimuths,
-            'north': [round(x, 2) for x in north],
-            'east': [round(x, 2) for x in east]
+            'north': [round(float(x), 2) for x in north],
+            'east': [round(float(x), 2) for x in east]
         }
 
         self.operation_tab.update_trajectory_view(self.trajectory_data, self.input_tab.fluid_level_input.value())
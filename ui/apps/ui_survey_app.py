@@ -1,14 +1,11 @@
 import datetime
 import gc
 import os
-import pickle
 import re
 import shutil
 import tempfile
 
-import pandas as pd
 import pyqtgraph as pg
-import openpyxl
 import numpy as np
 from PyQt6.QtCore import Qt, QTimer, QSize, QObject, QEvent, QDate, QParallelAnimationGroup, QPropertyAnimation, \
     QEasingCurve, QPoint, QTime, QRegularExpression
@@ -16,17 +13,37 @@ from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QIcon, QColor, QRegularExpr
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QPushButton, QFileDialog, QTableWidget, QTableWidgetItem, QHBoxLayout, QApplication,
     QSplitter, QGridLayout, QGroupBox, QStackedWidget, QTimeEdit, QLineEdit, QToolButton, QFrame, QDateEdit,
-    QGraphicsOpacityEffect, QDoubleSpinBox, QComboBox, QSizePolicy, QAbstractSpinBox, QMessageBox
+    QGraphicsOpacityEffect, QDoubleSpinBox, QComboBox, QSizePolicy, QAbstractSpinBox, QMessageBox, QInputDialog
 )
 
 pg.setConfigOptions(background='w', antialias=True)
 
+MAX_OVERNIGHT_GAP = datetime.timedelta(hours=6)  # Longest pause between stations treated as running past midnight
+
 # Local imports
+from features.survey.alignment import estimate_clock_offset, apply_clock_correction
+from features.survey.as2_writer import as2_output_path, write_as2_files
+from features.survey.gauge_data import load_gauge_file, to_datetime, to_plot_seconds, from_plot_seconds
+from features.survey.gauge_ingest import plot_arrays
+from features.survey.gauge_tail import GaugeTail
+from features.survey.gradients import analyse_gradients, format_gradient_summary
+from features.survey.quality import check_gauge_quality, despike, format_quality_report, has_issues
+from features.survey.resample import RESOLUTIONS, write_resampled_csv
+from features.survey.station_detection import detect_stations
+from features.survey.survey_file import (
+    write_survey, read_survey, read_legacy_survey, convert_legacy_survey, is_legacy_survey
+)
+from features.survey.survey_report import (
+    calculate_ahd_tvd, fill_interpretation_template, fill_tvd_workbook, generate_events, ordinal, station_result_rows,
+)
 from ui.components.ui_footer import FooterWidget
+from ui.components.ui_live_curve import LiveCurve
 from ui.components.ui_sidebar_widget import SidebarWidget
 from ui.components.ui_titlebar import CustomTitleBar
 from ui.windows.ui_messagebox_window import MessageBoxWindow
+from ui.windows.ui_survey_comparison_window import SurveyComparisonWindow
 from utils.path_finder import get_icon_path, get_path
+from utils.picking import AxisPicker
 from utils.styles import GROUPBOX_STYLE, MODERN_GROUPBOX_STYLE, TEMPLATE_BUTTON, ACTION_BUTTON, DELETE_BUTTON
 from utils.theme_manager import apply_theme, toggle_theme
 
@@ -351,6 +368,13 @@ class InputWidget(QWidget):
 
         station_layout.addWidget(self.station_table)
 
+        # Propose stations from the pressure plateaus of the top gauge
+        self.detect_stations_btn = self.create_button("Detect Stations", "#8e44ad", "#71368a", 32)
+        self.detect_stations_btn.setToolTip("Fill the station table from flat stretches of the top gauge pressure")
+        self.detect_stations_btn.clicked.connect(self.detect_stations_from_gauge)
+        self.detect_stations_btn.setEnabled(False)
+        station_layout.addWidget(self.detect_stations_btn)
+
         # AHD/TVD mapping
         tvd_group = QGroupBox("AHD/TVD Mapping")
         tvd_group.setStyleSheet(GROUPBOX_STYLE)
@@ -614,7 +638,7 @@ class InputWidget(QWidget):
 
         # Station type combo box with black text
         station_combo = QComboBox()
-        station_combo.addItems(["SGS", "FGS", "THP"])
+        station_combo.addItems(["SGS", "FGS", "THP", "ATM"])
         station_combo.setStyleSheet("color: black;")
         self.station_table.setCellWidget(row, 0, station_combo)
 
@@ -1009,6 +1033,7 @@ class InputWidget(QWidget):
     def get_station_timings(self):
         """Collect station timings (skip control row and Add row)"""
         stations = []
+        survey_date = self.date_edit.date().toPyDate()
         for row in range(1, self.station_table.rowCount() - 1):  # Skip control row and Add row
             station_combo = self.station_table.cellWidget(row, 0)
             depth_spin = self.station_table.cellWidget(row, 1)
@@ -1020,8 +1045,6 @@ class InputWidget(QWidget):
                     isinstance(start_time_widget, QTimeEdit) and \
                     isinstance(end_time_widget, QTimeEdit):
 
-                survey_date = self.date_edit.date().toPyDate()
-
                 # Get time from widget
                 start_time = start_time_widget.time()
                 if not start_time.isValid():
@@ -1051,6 +1074,21 @@ class InputWidget(QWidget):
                 start_dt = datetime.datetime.combine(survey_date, start_py_time)
                 end_dt = datetime.datetime.combine(end_date, end_py_time)
 
+                # A start earlier than the previous station's means the survey ran past
+                # midnight only when the next day's time follows on shortly after it;
+                # otherwise the row was entered out of order and keeps its date
+                if stations and start_dt < stations[-1]['start']:
+                    next_day = datetime.timedelta(days=1)
+                    if start_dt + next_day - stations[-1]['end'] <= MAX_OVERNIGHT_GAP:
+                        survey_date += next_day
+                        start_dt += next_day
+                        end_dt += next_day
+                    else:
+                        print(f"⚠️ Station row {row} starts before the station above it; "
+                              f"kept on {start_dt.date()} (rows out of order?)")
+                if end_dt.date() > survey_date:
+                    survey_date = end_dt.date()
+
                 duration = (end_dt - start_dt).total_seconds() / 3600.0
 
                 stations.append({
@@ -1063,6 +1101,68 @@ class InputWidget(QWidget):
 
         return stations
 
+    def detect_stations_from_gauge(self):
+        """Pre-fill the station table with stations detected in the top gauge file"""
+        file_path = self.file_types["top"]["file_path"]
+        if not file_path:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            series = load_gauge_file(file_path)
+            depth_station = "FGS" if self.fgs_toggle.isChecked() else "SGS"
+            stations = detect_stations(series, depth_station=depth_station)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            MessageBoxWindow.message_simple(self, "Detection Failed", f"Could not read the top gauge file:\n{e}",
+                                            "warning")
+            return
+        QApplication.restoreOverrideCursor()
+
+        if not stations:
+            MessageBoxWindow.message_simple(self, "No Stations Found",
+                                            "No stable pressure periods were found in the top gauge file.",
+                                            "warning")
+            return
+
+        reply = MessageBoxWindow.message_yes_no(
+            self, "Detect Stations",
+            f"{len(stations)} stations were detected.\n\n"
+            "Replace the current station table with them?",
+            QMessageBox.Icon.Question
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        self.station_table.setRowCount(0)
+        self.setup_station_table_controls()
+        self.add_station_add_row()
+
+        for station in stations:
+            self.add_station_data_row()
+            row = self.station_table.rowCount() - 2
+            combo = self.station_table.cellWidget(row, 0)
+            combo.setCurrentIndex(combo.findText(station['station']))
+            self.station_table.cellWidget(row, 2).setTime(QTime(*station['start'].timetuple()[3:6]))
+            self.station_table.cellWidget(row, 3).setTime(QTime(*station['end'].timetuple()[3:6]))
+
+            tooltip = f"{station['level']:.2f} psia, confidence {station['confidence']:.0%}"
+            for column in range(4):
+                self.station_table.cellWidget(row, column).setToolTip(tooltip)
+            if station['confidence'] < 0.6:
+                combo.setStyleSheet("color: black; background-color: #fff3cd;")
+
+        # Station times are combined with the survey date
+        first_start = stations[0]['start']
+        self.date_edit.setDate(QDate(first_start.year, first_start.month, first_start.day))
+
+        low_confidence = sum(1 for s in stations if s['confidence'] < 0.6)
+        text = (f"{len(stations)} stations were added from the top gauge.\n\n"
+                "Please enter the depth of each stop and check the times before processing.")
+        if low_confidence:
+            text += f"\n\n{low_confidence} station(s) with low confidence are highlighted."
+        MessageBoxWindow.message_simple(self, "Stations Detected", text, "check")
+
     def get_tvd_data(self):
         """Collect AHD/TVD data from table (skip control row and Add row)"""
         ahd_values = []
@@ -1518,6 +1618,7 @@ class InputWidget(QWidget):
         )
 
         self.process_btn.setEnabled(files_loaded)
+        self.detect_stations_btn.setEnabled(self.file_types["top"]["file_path"] is not None)
 
     # --- Event Handlers ---
     def dragEnterEvent(self, event: QDragEnterEvent):
@@ -1587,6 +1688,19 @@ class SurveyApp(QWidget):
         self.bdf = 0
         self.sea_level = 0
 
+        # Live tail mode: gauge files still being offloaded are re-read a few times a second
+        self.live_tails = {}
+        self.live_curves = {}
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(250)
+        self.live_timer.timeout.connect(self.poll_live_gauges)
+
+        # Plot resolution in seconds (None draws every reading)
+        self.plot_resolution = None
+
+        # Cursor readout lookups per gauge, rebuilt when the gauge or the plot changes
+        self.hover_index = {}
+
         self.groupbox_styles = {
             "Deleum": {
                 "text_color": "white",
@@ -1610,7 +1724,8 @@ class SurveyApp(QWidget):
         items = [
             (get_icon_path('save'), "Save Survey", self.save_file, "Save the current survey (Ctrl+S)"),
             (get_icon_path('load'), "Load Survey", self.open_file, "Open a survey (Ctrl+O)"),
-            (get_icon_path('export'), "Process && Export", self.process_data, "Export to Interpretation File")
+            (get_icon_path('export'), "Process && Export", self.process_data, "Export to Interpretation File"),
+            (get_icon_path('plot'), "Compare Surveys", self.open_comparison_window, "Overlay several saved surveys")
         ]
 
         self.sidebar = SidebarWidget(self, items)
@@ -1844,6 +1959,12 @@ class SurveyApp(QWidget):
         self.generate_as2_button.clicked.connect(lambda: self.generate_as2_files())
         self.generate_as2_button.setEnabled(False)
 
+        self.export_resampled_button = QPushButton("Export Resampled")
+        self.export_resampled_button.setToolTip("Save both gauges averaged to 1 s, 10 s or 1 min as CSV")
+        self.export_resampled_button.setStyleSheet(ACTION_BUTTON)
+        self.export_resampled_button.clicked.connect(self.export_resampled_data)
+        self.export_resampled_button.setEnabled(False)
+
         self.generate_tvd_button = QPushButton("Generate TVD File")
         self.generate_tvd_button.setStyleSheet(ACTION_BUTTON)
         self.generate_tvd_button.clicked.connect(lambda: self.generate_tvd_file())
@@ -1875,6 +1996,7 @@ class SurveyApp(QWidget):
 
         action_layout.addWidget(self.copy_button)
         action_layout.addWidget(self.generate_as2_button)
+        action_layout.addWidget(self.export_resampled_button)
         action_layout.addWidget(self.generate_tvd_button)
 
         # Add group boxes to the button layout
@@ -2043,9 +2165,34 @@ class SurveyApp(QWidget):
         self.copy_graphs_button.clicked.connect(self.copy_graphs)
         self.copy_graphs_button.setEnabled(False)
 
+        # Align gauge clocks button
+        self.align_clocks_btn = QPushButton("Align Clocks")
+        self.align_clocks_btn.setIcon(QIcon(get_icon_path('plot')))
+        self.align_clocks_btn.setToolTip("Estimate the clock offset between the gauges and shift the bottom gauge")
+        self.align_clocks_btn.setStyleSheet(ACTION_BUTTON)
+        self.align_clocks_btn.clicked.connect(self.align_gauge_clocks)
+        self.align_clocks_btn.setEnabled(False)
+
+        # Live mode button (follow gauge files that are still growing)
+        self.live_btn = QPushButton("Live")
+        self.live_btn.setCheckable(True)
+        self.live_btn.setToolTip("Keep reading new lines while the gauge files are being downloaded")
+        self.live_btn.setStyleSheet(ACTION_BUTTON)
+        self.live_btn.toggled.connect(self.toggle_live_mode)
+        self.live_btn.setEnabled(False)
+
+        # Plot resolution selector
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems(["Raw"] + list(RESOLUTIONS))
+        self.resolution_combo.setToolTip("Average the curves into 1 s, 10 s or 1 min bins")
+        self.resolution_combo.currentTextChanged.connect(self.change_plot_resolution)
+
         # Add to layout
+        toolbar_layout.addWidget(self.resolution_combo)
         toolbar_layout.addWidget(self.reset_zoom_btn)
         toolbar_layout.addWidget(self.copy_graphs_button)
+        toolbar_layout.addWidget(self.align_clocks_btn)
+        toolbar_layout.addWidget(self.live_btn)
 
         # Apply theme after UI is set up
         apply_theme(self, self.current_theme)
@@ -2079,8 +2226,6 @@ class SurveyApp(QWidget):
             QMessageBox.warning(self, "No TVD Data", "No AHD/TVD mapping data available.")
             return
 
-        template_path = get_path(f"assets/resources/MD_TVD_Template.xlsx")
-
         save_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save TVD Calculation File",
@@ -2092,72 +2237,7 @@ class SurveyApp(QWidget):
             return
 
         try:
-            wb = openpyxl.load_workbook(template_path)
-            sheet = wb["Calculation"]
-
-            # --------------------------------------------------
-            # Header values
-            # --------------------------------------------------
-            sheet["D2"] = self.bdf
-            sheet["D3"] = self.sea_level
-            sheet["D4"] = getattr(self, "gauge_type", "")
-
-            sheet["I2"] = self.date
-            sheet["I3"] = self.location
-            sheet["I4"] = self.well
-
-            # --------------------------------------------------
-            # Depths → Column B (starting B9)
-            # --------------------------------------------------
-            start_row = 9
-            for i, station in enumerate(self.station_timings):
-                depth = station.get("depth")
-                if depth is not None:
-                    sheet.cell(row=start_row + i, column=2).value = depth
-            # --------------------------------------------------
-            # Clear columns B–K below last depth row
-            # --------------------------------------------------
-            last_depth_row = start_row + len(self.station_timings) - 1
-
-            max_clear_row = sheet.max_row
-            for row in range(last_depth_row + 1, max_clear_row + 1):
-                for col in range(2, 11):  # B (2) to K (11)
-                    sheet.cell(row=row, column=col).value = None
-
-            # --------------------------------------------------
-            # SPM Depths → Column C (starting C31)
-            # --------------------------------------------------
-            spm_start_row = 31
-            spm_depths = getattr(self, "spm_depths", [])
-
-            if spm_depths:
-                # Read formulas from row 9 (C–K)
-                base_formulas = {}
-                for col in range(3, 11):  # C (3) to K (11)
-                    base_formulas[col] = sheet.cell(row=9, column=col).value
-
-                for i, depth in enumerate(spm_depths):
-                    row = spm_start_row + i
-
-                    # Paste SPM depth
-                    sheet.cell(row=row, column=3).value = depth  # Column C
-
-                    # Copy formulas into C–K
-                    for col in range(3, 11):
-                        sheet.cell(row=row, column=col).value = base_formulas[col]
-
-            # --------------------------------------------------
-            # AHD / TVD Mapping → Columns L & M (starting row 3)
-            # --------------------------------------------------
-            ahd_values = self.tvd_data.get("ahd_values", [])
-            tvd_values = self.tvd_data.get("tvd_values", [])
-
-            map_start_row = 3
-            for i, (ahd, tvd) in enumerate(zip(ahd_values, tvd_values)):
-                sheet.cell(row=map_start_row + i, column=12).value = ahd  # L
-                sheet.cell(row=map_start_row + i, column=13).value = tvd  # M
-
-            wb.save(save_path)
+            fill_tvd_workbook(save_path, self.report_info())
 
             QMessageBox.information(
                 self,
@@ -2173,113 +2253,18 @@ class SurveyApp(QWidget):
             )
 
     def process_sgs_txt_file(self, file_path):
-        """Process SGS text file with memory-efficient streaming"""
+        """Load an SGS/FGS gauge text file as a GaugeSeries (cached after the first parse)"""
         try:
-            # Use a more memory-efficient approach with numpy arrays
-            data_points = []
-
-            # Pre-allocate chunks to reduce reallocation
-            chunk_size = 5000  # Smaller chunks for better memory control
-            current_chunk = []
-
-            with open(file_path, 'r') as f:
-                # Find where data starts
-                header_found = False
-                data_start_line = 0
-                lines_processed = 0
-
-                # First pass: find header and count lines
-                for i, line in enumerate(f):
-                    if "Date" in line and "Time" in line and "Press" in line:
-                        header_found = True
-                        data_start_line = i + 2  # Skip header and unit line
-                        break
-
-                if not header_found:
-                    MessageBoxWindow.message_simple(self, "Error", "Could not find data headers in file", "warning")
-                    return None
-
-                # Reset file pointer and skip to data start
-                f.seek(0)
-                for _ in range(data_start_line):
-                    next(f)
-
-                # Process data in memory-efficient chunks
-                date_cache = {}  # Cache date strings to reduce memory
-
-                for line in f:
-                    try:
-                        parts = line.strip().split()
-                        if len(parts) < 4:
-                            continue
-
-                        # Parse date and time
-                        date_str = parts[0].replace("-", "/")
-                        time_str = parts[1]
-
-                        # Use caching for date parsing to reduce object creation
-                        date_key = f"{date_str}_{time_str}"
-
-                        if date_key in date_cache:
-                            date_time = date_cache[date_key]
-                        else:
-                            # Try different date formats
-                            date_time = None
-                            for fmt in ("%d/%m/%Y %H:%M:%S", "%d/%m/%y %H:%M:%S"):
-                                try:
-                                    date_time = datetime.datetime.strptime(
-                                        f"{date_str} {time_str}", fmt
-                                    )
-                                    date_cache[date_key] = date_time
-                                    break
-                                except ValueError:
-                                    continue
-
-                            if date_time is None:
-                                continue
-
-                        # Parse numeric values directly without intermediate string manipulation
-                        try:
-                            # Direct conversion without creating intermediate strings
-                            pressure = float(parts[2])
-                            temperature = float(parts[3])
-
-                            # Store as tuple (more memory efficient than list)
-                            current_chunk.append((date_time, pressure, temperature))
-                            lines_processed += 1
-
-                            # Process chunk when it reaches chunk_size
-                            if len(current_chunk) >= chunk_size:
-                                # Extend using list comprehension for efficiency
-                                data_points.extend(current_chunk)
-                                # Clear chunk and free memory
-                                current_chunk.clear()
-                                # Force garbage collection if needed
-                                if lines_processed % 50000 == 0:
-                                    gc.collect()
-
-                        except (ValueError, IndexError):
-                            continue
-
-                    except Exception:
-                        continue
-
-                # Add any remaining data
-                if current_chunk:
-                    data_points.extend(current_chunk)
+            series = load_gauge_file(file_path)
+            print('length of data points:', len(series))
 
-            # Clear cache to free memory
-            date_cache.clear()
-            print('length of data points:', len(data_points))
-
-            if len(data_points) == 0:
+            if len(series) == 0:
                 return None
+            return series
 
-            # ALWAYS return as list of tuples with Python datetime objects
-            # This ensures compatibility with timestamp() method
-            print('process_sgs_txt_file complete (return data_points)')
-            return data_points
-
+        except ValueError as e:
+            MessageBoxWindow.message_simple(self, "Error", str(e), "warning")
+            return None
         except Exception as e:
             MessageBoxWindow.message_simple(self, "Error", f"Failed to process data file:\n{str(e)}", "warning")
             return None
@@ -2296,150 +2281,35 @@ class SurveyApp(QWidget):
             self.time_label.setText(f"Start Time\t: {self.start_time.strftime('%H:%M:%S')}")
 
     def populate_station_table(self):
-        self.table_widget.setRowCount(len(self.station_timings))
-
-        # Handle different data formats
-        if isinstance(self.top_data, np.ndarray):
-            top_data = self.top_data
-        else:
-            top_data = np.array(self.top_data, dtype=object) if self.top_data else None
+        rows = station_result_rows(self.station_timings, self.top_data, self.bottom_data,
+                                   self.tvd_data, self.bdf)
+        self.table_widget.setRowCount(len(rows))
 
-        if isinstance(self.bottom_data, np.ndarray):
-            bottom_data = self.bottom_data
-        else:
-            bottom_data = np.array(self.bottom_data, dtype=object) if self.bottom_data else None
-
-        for row, station in enumerate(self.station_timings):
-            # Basic station info
-            self.table_widget.setItem(row, 0, QTableWidgetItem(station['station']))
-            self.table_widget.setItem(row, 1, QTableWidgetItem(str(station.get('depth', 'N/A'))))
-            self.table_widget.setItem(row, 2, QTableWidgetItem(station['start'].strftime("%H:%M:%S")))
-            self.table_widget.setItem(row, 3, QTableWidgetItem(station['end'].strftime("%H:%M:%S")))
-
-            # --- AHD / TVD calculation (Excel-equivalent) ---
-            depth_raw = station.get('depth')
-
-            if depth_raw is None:
-                ahd_calc, tvd_calc = None, None
-            else:
-                try:
-                    depth = float(depth_raw)
-                    ahd_list = self.tvd_data.get('ahd_values', [])
-                    tvd_list = self.tvd_data.get('tvd_values', [])
-
-                    # Create DataFrame
-                    df = pd.DataFrame({
-                        'AHD': ahd_list,
-                        'TVD': tvd_list
-                    })
-
-                    print(df)
-
-                    ahd_calc, tvd_calc = self.calculate_ahd_tvd(
-                        thf=self.bdf,
-                        depth=depth,
-                        ahd_list=ahd_list,
-                        tvd_list=tvd_list
-                    )
-                except Exception:
-                    ahd_calc, tvd_calc = None, None
-
-            # Write to table
-            self.table_widget.setItem(
-                row, 4,
-                QTableWidgetItem(f"{ahd_calc:.2f}" if ahd_calc is not None else "N/A")
-            )
-
-            self.table_widget.setItem(
-                row, 5,
-                QTableWidgetItem(f"{tvd_calc:.2f}" if tvd_calc is not None else "N/A")
-            )
-
-            # Process gauge statistics
-            for col_offset, data, gauge_name in [
-                (6, top_data, 'top'),
-                (12, bottom_data, 'bottom')
-            ]:
-                if data is None or len(data) == 0:
-                    continue
-
-                # Handle both structured arrays and object arrays
-                if hasattr(data, 'dtype') and data.dtype.names is not None:
-                    # Structured array
-                    times = data['datetime']
-                    pressures = data['pressure']
-                    temps = data['temperature']
-                else:
-                    # Object array
-                    times = data[:, 0]
-                    pressures = data[:, 1].astype(float)
-                    temps = data[:, 2].astype(float)
-
-                start_dt = np.datetime64(station['start'])
-                end_dt = np.datetime64(station['end'])
-
-                mask = (times >= start_dt) & (times <= end_dt)
-                if not np.any(mask):
-                    stats = ["N/A"] * 6
-                else:
-                    p_slice = pressures[mask]
-                    t_slice = temps[mask]
-                    stats = [
-                        np.max(p_slice), np.min(p_slice), np.median(p_slice),
-                        np.max(t_slice), np.min(t_slice), np.median(t_slice)
-                    ]
-
-                for i, stat in enumerate(stats):
-                    item = QTableWidgetItem(f"{stat:.2f}" if isinstance(stat, float) else str(stat))
-                    self.table_widget.setItem(row, col_offset + i, item)
+        for row, values in enumerate(rows):
+            for col, text in enumerate(values):
+                if text:
+                    self.table_widget.setItem(row, col, QTableWidgetItem(text))
 
         # Auto-generate events after populating table
         try:
             self.auto_generate_events()
         except Exception as e:
-            print(e)
+            # Events kept from before would carry times from readings that have since changed
+            print(f"⚠️ Could not generate events: {e}")
+            self.events = []
+            self.populate_events_table()
+            self.remove_event_btn.setEnabled(False)
 
         # Enable UI components
-        for btn in [self.copy_button, self.generate_as2_button, self.copy_graphs_button, self.process_data_button]:
+        for btn in [self.copy_button, self.generate_as2_button, self.copy_graphs_button, self.process_data_button,
+                    self.export_resampled_button]:
             btn.setEnabled(True)
 
         self.table_widget.resizeColumnsToContents()
 
     def calculate_ahd_tvd(self, thf, depth, ahd_list, tvd_list):
-        """
-        Excel-equivalent AHD/TVD calculation.
-        """
-
-        # ---- C9 ----
-        ahd_calc = thf + depth
-
-        # ---- MATCH(C9, L:L, 1) ----
-        idx = None
-        for i in range(len(ahd_list) - 1):
-            if ahd_list[i] <= ahd_calc < ahd_list[i + 1]:
-                idx = i
-                break
-
-        if idx is None:
-            raise ValueError("AHD outside mapping range")
-
-        # ---- INDEX / OFFSET equivalents ----
-        ahd_top = ahd_list[idx]
-        tvd_top = tvd_list[idx]
-
-        ahd_bottom = ahd_list[idx + 1]
-        tvd_bottom = tvd_list[idx + 1]
-
-        # ---- I9 ----
-        tvd_calc = (
-                ((tvd_bottom - tvd_top) / (ahd_bottom - ahd_top))
-                * (ahd_calc - ahd_top)
-                + tvd_top
-        )
-
-        # print(ahd_calc,tvd_calc)
-
-        return ahd_calc, tvd_calc
+        """Excel-equivalent AHD/TVD calculation (see survey_report.calculate_ahd_tvd)."""
+        return calculate_ahd_tvd(thf, depth, ahd_list, tvd_list)
 
     def process_data(self):
         """Streamlined data processing pipeline"""
@@ -2452,21 +2322,23 @@ class SurveyApp(QWidget):
             template_dir = os.path.dirname(self.template_path)
 
             # Process data and generate files
-            self.copy_statistics()
             self.paste_to_template(self.template_path)
             self.generate_tvd_file()
             self.generate_as2_files(template_dir)
 
+            summary = getattr(self, 'gradient_summary', None)
             MessageBoxWindow.message_simple(self, "Processing Complete",
                                             "Data processed successfully!\n\n"
                                             f"Template saved as: {os.path.basename(self.template_path)}\n"
-                                            f"AS2 files saved in: {template_dir}")
+                                            f"AS2 files saved in: {template_dir}"
+                                            + (f"\n\n{summary}" if summary else ""))
         except Exception as e:
             MessageBoxWindow.message_simple(self, "Processing Error", f"Failed to process data:\n{str(e)}", "warning")
 
     def process_all_files(self, top_file_path, bottom_file_path, survey_info):
         """Process files with manual data input from DualDragDropWidget"""
         try:
+            self.stop_live_mode()
             self.cleanup_memory()
             self.top_file_path = top_file_path
             self.bottom_file_path = bottom_file_path
@@ -2513,6 +2385,9 @@ class SurveyApp(QWidget):
                 # Set event date
                 self.event_date_edit.setDate(QDate(self.date))
 
+                # Data quality check before anything is plotted or summarised
+                self.run_quality_check()
+
                 # Create stacked graphs
                 self.show_stacked_graphs(top_file_path, bottom_file_path)
 
@@ -2540,6 +2415,43 @@ class SurveyApp(QWidget):
         except Exception as e:
             MessageBoxWindow.message_simple(self, "Error", f"Failed to process files:\n{str(e)}", "warning")
 
+    def run_quality_check(self):
+        """Check both gauges for bad data after loading and offer to de-spike the pressure"""
+        self.quality_reports = {}
+        summaries = []
+        for gauge, label in (("top", "Top Gauge"), ("bottom", "Bottom Gauge")):
+            data = getattr(self, f"{gauge}_data")
+            if not data:
+                continue
+            report = check_gauge_quality(data, self.station_timings)
+            self.quality_reports[gauge] = report
+            print(format_quality_report(report, label))
+            if has_issues(report):
+                summaries.append(format_quality_report(report, label))
+
+        if not summaries:
+            return
+
+        text = "\n\n".join(summaries)
+        spikes = sum(report['spikes']['count'] for report in self.quality_reports.values())
+        if not spikes:
+            MessageBoxWindow.message_simple(self, "Data Quality", text, "warning")
+            return
+
+        reply = MessageBoxWindow.message_yes_no(
+            self, "Data Quality",
+            text + "\n\nReplace the pressure spikes with a rolling median?",
+            QMessageBox.Icon.Warning
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        for gauge, report in self.quality_reports.items():
+            if report['spikes']['count']:
+                series, replaced = despike(getattr(self, f"{gauge}_data"))
+                setattr(self, f"{gauge}_data", series)
+                print(f"{gauge} gauge: replaced {replaced} spike readings")
+
     def show_stacked_graphs(self, top_file_path, bottom_file_path):
         # Clear previous graph
         while self.graph_layout.count():
@@ -2563,27 +2475,13 @@ class SurveyApp(QWidget):
         top_timestamps = top_pressures = top_temps = None
         bottom_timestamps = bottom_pressures = bottom_temps = None
 
-        # Process top data
-        if self.top_data is not None:
-            if hasattr(self.top_data, 'dtype') and self.top_data.dtype.names is not None:
-                top_timestamps = np.array([dt.timestamp() for dt in self.top_data['datetime']])
-                top_pressures = self.top_data['pressure'].astype(np.float32)
-                top_temps = self.top_data['temperature'].astype(np.float32)
-            elif isinstance(self.top_data, list) and len(self.top_data) > 0:
-                top_timestamps = np.array([dt.timestamp() for dt, _, _ in self.top_data])
-                top_pressures = np.array([p for _, p, _ in self.top_data], dtype=np.float32)
-                top_temps = np.array([t for _, _, t in self.top_data], dtype=np.float32)
-
-        # Process bottom data
-        if self.bottom_data is not None:
-            if hasattr(self.bottom_data, 'dtype') and self.bottom_data.dtype.names is not None:
-                bottom_timestamps = np.array([dt.timestamp() for dt in self.bottom_data['datetime']])
-                bottom_pressures = self.bottom_data['pressure'].astype(np.float32)
-                bottom_temps = self.bottom_data['temperature'].astype(np.float32)
-            elif isinstance(self.bottom_data, list) and len(self.bottom_data) > 0:
-                bottom_timestamps = np.array([dt.timestamp() for dt, _, _ in self.bottom_data])
-                bottom_pressures = np.array([p for _, p, _ in self.bottom_data], dtype=np.float32)
-                bottom_temps = np.array([t for _, _, t in self.bottom_data], dtype=np.float32)
+        # Very long (memory-mapped) gauges are drawn as a min/max envelope
+        if self.top_data is not None and len(self.top_data) > 0:
+            top_timestamps, top_pressures, top_temps = plot_arrays(self.top_data, interval=self.plot_resolution)
+
+        if self.bottom_data is not None and len(self.bottom_data) > 0:
+            bottom_timestamps, bottom_pressures, bottom_temps = plot_arrays(self.bottom_data,
+                                                                            interval=self.plot_resolution)
 
         # Store for later use
         self.top_timestamps = top_timestamps
@@ -2603,12 +2501,15 @@ class SurveyApp(QWidget):
                 strings = []
                 for v in values:
                     try:
-                        dt = datetime.datetime.fromtimestamp(v)
+                        dt = from_plot_seconds(v)
                         strings.append(dt.strftime("%H:%M:%S"))
                     except:
                         strings.append(str(v))
                 return strings
 
+        # Resampled curves have NaN rows at gaps, which should break the line
+        connect = 'finite' if self.plot_resolution else 'all'
+
         # Helper to create plot with secondary y-axis
         def create_plot_with_temp(timestamps, pressures, temps, title):
             plot_widget = pg.PlotWidget(axisItems={'bottom': TimeAxisItem(orientation='bottom')}, useOpenGL=True)
@@ -2624,10 +2525,11 @@ class SurveyApp(QWidget):
             pressure_curve = pg.PlotCurveItem(timestamps, pressures,
                                               pen=pg.mkPen('b', width=1.5),
                                               name='Pressure',
-                                              connect='all',
+                                              connect=connect,
                                               antialias=True,
                                               useOpenGL=True)
             plot_widget.addItem(pressure_curve)
+            plot_widget.pressure_curve = pressure_curve
 
             # Secondary y-axis for temperature
             temp_view = pg.ViewBox()
@@ -2638,10 +2540,12 @@ class SurveyApp(QWidget):
             temp_curve = pg.PlotCurveItem(timestamps, temps,
                                           pen=pg.mkPen('r', width=1.5),
                                           name='Temperature',
-                                          connect='all',
+                                          connect=connect,
                                           antialias=True,
                                           useOpenGL=True)
             temp_view.addItem(temp_curve)
+            plot_widget.temp_view = temp_view
+            plot_widget.temp_curve = temp_curve
 
             # Add temperature curve to main plot's legend
             plot_widget.getPlotItem().legend.addItem(temp_curve, temp_curve.name())
@@ -2694,8 +2598,8 @@ class SurveyApp(QWidget):
 
             for idx, station in enumerate(self.station_timings):
                 try:
-                    start_ts = station['start'].timestamp()
-                    end_ts = station['end'].timestamp()
+                    start_ts = to_plot_seconds(station['start'])
+                    end_ts = to_plot_seconds(station['end'])
                     color = colors[idx]
                     region_top = pg.LinearRegionItem(values=[start_ts, end_ts], brush=pg.mkBrush(color), movable=False)
                     region_bottom = pg.LinearRegionItem(values=[start_ts, end_ts], brush=pg.mkBrush(color),
@@ -2777,6 +2681,9 @@ class SurveyApp(QWidget):
         button_layout.setContentsMargins(0, 0, 0, 0)
         button_layout.setSpacing(5)
 
+        # Resolution selector
+        button_layout.addWidget(self.resolution_combo)
+
         # Reset Zoom button
         self.reset_zoom_btn.setEnabled(hasattr(self, 'top_plot') and self.top_plot is not None)
         button_layout.addWidget(self.reset_zoom_btn)
@@ -2785,6 +2692,16 @@ class SurveyApp(QWidget):
         self.copy_graphs_button.setEnabled(True)
         button_layout.addWidget(self.copy_graphs_button)
 
+        # Align Clocks button
+        self.align_clocks_btn.setEnabled(top_timestamps is not None and bottom_timestamps is not None)
+        button_layout.addWidget(self.align_clocks_btn)
+
+        # Live button
+        self.live_btn.setEnabled(any(
+            path and path.lower().endswith('.txt') for path in (self.top_file_path, self.bottom_file_path)
+        ))
+        button_layout.addWidget(self.live_btn)
+
         right_layout.addWidget(button_container)
 
         main_layout.addWidget(right_column, stretch=1)
@@ -2816,6 +2733,186 @@ class SurveyApp(QWidget):
                 slot=self.on_mouse_move_pyqtgraph
             )
 
+    def toggle_live_mode(self, checked):
+        """Start or stop following the gauge files while they are still being written"""
+        if not checked:
+            self.stop_live_mode()
+            return
+
+        # New readings are appended as they arrive, so live mode always draws the raw data
+        self.resolution_combo.blockSignals(True)
+        self.resolution_combo.setCurrentIndex(0)
+        self.resolution_combo.blockSignals(False)
+        self.plot_resolution = None
+
+        tails = {
+            gauge: GaugeTail(path)
+            for gauge, path in (("top", self.top_file_path), ("bottom", self.bottom_file_path))
+            if path and os.path.exists(path)
+        }
+        if not tails:
+            MessageBoxWindow.message_simple(self, "Live Mode", "The gauge .txt files could not be found.", "warning")
+            self.stop_live_mode()
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            for tail in tails.values():
+                tail.catch_up()
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.live_tails = tails
+        self.reload_live_data()
+        self.live_timer.start()
+
+    def change_plot_resolution(self, label):
+        """Redraw the graphs at the selected resolution"""
+        self.plot_resolution = RESOLUTIONS.get(label)
+        self.stop_live_mode()
+        if self.top_data or self.bottom_data:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                self.show_stacked_graphs(self.top_file_path, self.bottom_file_path)
+            finally:
+                QApplication.restoreOverrideCursor()
+
+    def export_resampled_data(self):
+        """Save both gauges resampled to a fixed interval as CSV files"""
+        if not self.top_data and not self.bottom_data:
+            MessageBoxWindow.message_simple(self, "No Data", "No gauge data available to export", "warning")
+            return
+
+        label, ok = QInputDialog.getItem(self, "Export Resampled", "Resolution:", list(RESOLUTIONS), 2, False)
+        if not ok:
+            return
+        output_dir = QFileDialog.getExistingDirectory(
+            self, "Select Output Folder", os.path.dirname(self.top_file_path or "")
+        )
+        if not output_dir:
+            return
+
+        suffix = label.replace(" ", "")
+        written = []
+        try:
+            for path, data in ((self.top_file_path, self.top_data), (self.bottom_file_path, self.bottom_data)):
+                if not data:
+                    continue
+                name = os.path.splitext(os.path.basename(path or "gauge"))[0]
+                written.append(write_resampled_csv(
+                    os.path.join(output_dir, f"{name}_{suffix}.csv"), data, RESOLUTIONS[label]
+                ))
+        except Exception as e:
+            MessageBoxWindow.message_simple(self, "Error", f"Failed to export resampled data:\n{str(e)}", "warning")
+            return
+
+        MessageBoxWindow.message_simple(
+            self, "Files Created",
+            f"Resampled data ({label}) saved in:\n{output_dir}\n\n" +
+            "\n".join(f"• {os.path.basename(path)}" for path in written),
+            "check_green"
+        )
+
+    def stop_live_mode(self):
+        """Stop polling; the data read so far stays loaded"""
+        self.live_timer.stop()
+        self.live_tails = {}
+        self.live_curves = {}
+        if self.live_btn.isChecked():
+            self.live_btn.blockSignals(True)
+            self.live_btn.setChecked(False)
+            self.live_btn.blockSignals(False)
+
+    def reload_live_data(self):
+        """Redraw everything from the live readers (start of live mode, or a replaced file)"""
+        for gauge, tail in self.live_tails.items():
+            setattr(self, f"{gauge}_data", tail.series() if tail.rows else None)
+        self.show_stacked_graphs(self.top_file_path, self.bottom_file_path)
+        self.populate_station_table()
+
+        self.live_curves = {}
+        for gauge in self.live_tails:
+            plot = getattr(self, f"{gauge}_plot", None)
+            if plot is not None and hasattr(plot, 'pressure_curve'):
+                self.live_curves[gauge] = (
+                    LiveCurve(plot, plot.pressure_curve, plot.pressure_curve.opts['pen']),
+                    LiveCurve(plot.temp_view, plot.temp_curve, plot.temp_curve.opts['pen']),
+                )
+
+    def poll_live_gauges(self):
+        """Append newly downloaded readings to the curves and refresh the affected stations"""
+        new_ranges = []
+        for gauge, tail in self.live_tails.items():
+            first, rows = tail.poll()
+            if rows == first:
+                continue
+            if first == 0 or gauge not in self.live_curves:
+                self.reload_live_data()  # First readings, or the file was replaced
+                return
+
+            series = tail.series()
+            setattr(self, f"{gauge}_data", series)
+
+            new = tail.series(first)
+            pressure_curve, temp_curve = self.live_curves[gauge]
+            pressure_curve.append(new.seconds(), new.pressures.astype(np.float32))
+            temp_curve.append(new.seconds(), new.temperatures.astype(np.float32))
+
+            # Grow the cursor readout's index with the new readings instead of rebuilding it on the next hover
+            cached = self.hover_index.get(gauge)
+            if cached is not None and not self.plot_resolution and series.is_sorted \
+                    and cached[2].extend(new.seconds()):
+                self.hover_index[gauge] = (series, len(series), cached[2], series.pressures, series.temperatures)
+            else:
+                self.hover_index.pop(gauge, None)
+
+            new_ranges.append((to_datetime(new.times.min()), to_datetime(new.times.max())))
+
+        # Only stations that overlap the new readings need their statistics again
+        for row, station in enumerate(self.station_timings):
+            if any(start <= station['end'] and end >= station['start'] for start, end in new_ranges):
+                self.recompute_station_stats(row)
+
+    def align_gauge_clocks(self):
+        """Estimate the bottom gauge clock offset against the top gauge and optionally apply it"""
+        if not self.top_data or not self.bottom_data:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            estimate = estimate_clock_offset(self.top_data, self.bottom_data, fit_drift=True)
+        except ValueError as e:
+            QApplication.restoreOverrideCursor()
+            MessageBoxWindow.message_simple(self, "Align Clocks", str(e), "warning")
+            return
+        QApplication.restoreOverrideCursor()
+
+        offset = estimate['offset']
+        if abs(offset) < 0.5 and abs(estimate['drift']) * 86400 < 0.5:
+            MessageBoxWindow.message_simple(self, "Align Clocks", "The gauge clocks are already aligned.", "check")
+            return
+
+        direction = "behind" if offset > 0 else "ahead of"
+        text = (f"Bottom gauge clock is {abs(offset):.1f} s {direction} the top gauge"
+                f" at {estimate['reference_time'].strftime('%H:%M:%S')}.\n")
+        if estimate['segments_used']:
+            text += f"Drift: {estimate['drift'] * 86400:+.1f} s/day\n"
+        text += f"Match quality: {estimate['correlation']:.0%}\n"
+        if estimate['correlation'] < 0.5:
+            text += "\nThe match is weak; please check the graphs before applying.\n"
+        text += "\nShift the bottom gauge timestamps to match the top gauge?"
+
+        reply = MessageBoxWindow.message_yes_no(self, "Align Clocks", text, QMessageBox.Icon.Question)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        self.stop_live_mode()  # Live readers would bring back the uncorrected timestamps
+        self.bottom_data = apply_clock_correction(
+            self.bottom_data, offset, estimate['drift'], estimate['reference_time']
+        )
+        self.show_stacked_graphs(self.top_file_path, self.bottom_file_path)
+        self.populate_station_table()  # Station statistics and the generated events, from the shifted readings
+
     def on_mouse_move_pyqtgraph(self, event):
         """Handle mouse movement over either top or bottom PyQtGraph plots"""
         try:
@@ -2842,30 +2939,17 @@ class SurveyApp(QWidget):
                 # Update cursor readout widget
                 if hasattr(self, 'cursor_time_label'):
                     try:
-                        dt = datetime.datetime.fromtimestamp(x_val)
+                        dt = from_plot_seconds(x_val)
                         self.cursor_time_label.setText(
                             f"Time: {dt.strftime('%H:%M:%S')}\n"
                         )
 
-                        # Top gauge
-                        if self.top_timestamps is not None:
-                            idx = np.argmin(np.abs(self.top_timestamps - x_val))
-                            if idx < len(self.top_pressures):
-                                p = self.top_pressures[idx]
-                                t = self.top_temps[idx]
-                                self.cursor_top_label.setText(
-                                    f"Top: \nP = {p:.2f} psia\nT = {t:.2f} °F\n"
-                                )
-
-                        # Bottom gauge
-                        if self.bottom_timestamps is not None:
-                            idx = np.argmin(np.abs(self.bottom_timestamps - x_val))
-                            if idx < len(self.bottom_pressures):
-                                p = self.bottom_pressures[idx]
-                                t = self.bottom_temps[idx]
-                                self.cursor_bottom_label.setText(
-                                    f"Bottom: \nP = {p:.2f} psia\nT = {t:.2f} °F"
-                                )
+                        for name, label, title, suffix in (("top", self.cursor_top_label, "Top", "\n"),
+                                                           ("bottom", self.cursor_bottom_label, "Bottom", "")):
+                            reading = self.reading_at(name, x_val)
+                            if reading is not None:
+                                p, t = reading
+                                label.setText(f"{title}: \nP = {p:.2f} psia\nT = {t:.2f} °F{suffix}")
 
                     except Exception:
                         pass
@@ -2876,35 +2960,43 @@ class SurveyApp(QWidget):
                 if hasattr(self, 'cursor_vline_bottom') and self.cursor_vline_bottom is not None:
                     self.cursor_vline_bottom.setPos(x_val)
 
-                # Convert timestamp to datetime for display
-                try:
-                    dt = datetime.datetime.fromtimestamp(x_val)
-                    time_str = dt.strftime("%H:%M:%S")
-
-                    status_lines = [f"Time: {time_str}"]
-
-                    # Top gauge data
-                    if hasattr(self, 'top_timestamps') and self.top_timestamps is not None:
-                        idx = np.argmin(np.abs(self.top_timestamps - x_val))
-                        if idx < len(self.top_pressures) and idx < len(self.top_temps):
-                            top_p = self.top_pressures[idx]
-                            top_t = self.top_temps[idx]
-                            status_lines.append(f"Top: Pressure = {top_p:.2f} psia, Temp = {top_t:.2f} °F")
-
-                    # Bottom gauge data
-                    if hasattr(self, 'bottom_timestamps') and self.bottom_timestamps is not None:
-                        idx = np.argmin(np.abs(self.bottom_timestamps - x_val))
-                        if idx < len(self.bottom_pressures) and idx < len(self.bottom_temps):
-                            bottom_p = self.bottom_pressures[idx]
-                            bottom_t = self.bottom_temps[idx]
-                            status_lines.append(f"Bottom: Pressure = {bottom_p:.2f} psia, Temp = {bottom_t:.2f} °F")
-
-                except (ValueError, IndexError):
-                    pass
-
         except Exception:
             pass
 
+    def reading_at(self, name, x_val):
+        """
+        (pressure, temperature) of a gauge nearest to plot time x_val, or None.
+
+        Without a plot resolution this is the actual reading, not a point of
+        the decimated curve; with one it is the averaged value on screen. The
+        lookup is a binary search, built once per gauge and plot.
+        """
+        if self.plot_resolution:
+            arrays = (self.top_timestamps, self.top_pressures, self.top_temps) if name == "top" else \
+                (self.bottom_timestamps, self.bottom_pressures, self.bottom_temps)
+            source = arrays[0]
+        else:
+            source = self.top_data if name == "top" else self.bottom_data
+        if source is None or len(source) == 0:
+            return None
+
+        cached = self.hover_index.get(name)
+        if cached is None or cached[0] is not source or cached[1] != len(source):
+            if self.plot_resolution:
+                picker, pressures, temperatures = AxisPicker(source), arrays[1], arrays[2]
+            else:
+                series = source.ordered()
+                picker = AxisPicker(series.seconds(), assume_sorted=True)
+                pressures, temperatures = series.pressures, series.temperatures
+            cached = (source, len(source), picker, pressures, temperatures)
+            self.hover_index[name] = cached
+
+        _, _, picker, pressures, temperatures = cached
+        index = picker.nearest(x_val)
+        if index is None:
+            return None
+        return pressures[index], temperatures[index]
+
     def on_station_time_changed(self, item: QTableWidgetItem):
         row = item.row()
         col = item.column()
@@ -2955,8 +3047,8 @@ class SurveyApp(QWidget):
             return
 
         station = self.station_timings[index]
-        start_ts = station['start'].timestamp()
-        end_ts = station['end'].timestamp()
+        start_ts = to_plot_seconds(station['start'])
+        end_ts = to_plot_seconds(station['end'])
 
         region_top, region_bottom = self.plot_regions[index]
 
@@ -3010,6 +3102,7 @@ class SurveyApp(QWidget):
 
     def show_file_upload(self):
         """Show file upload screen and reset state"""
+        self.stop_live_mode()
         self.content_stack.setCurrentIndex(0)
         # Clear current state
         self.top_file_path = None
@@ -3056,40 +3149,11 @@ class SurveyApp(QWidget):
             return
 
         station = self.station_timings[row]
-        start_dt = station['start']
-        end_dt = station['end']
-
-        start_np = np.datetime64(start_dt)
-        end_np = np.datetime64(end_dt)
 
         def compute_stats(data):
             if data is None or len(data) == 0:
                 return ["N/A"] * 6
-
-            # Structured array
-            if hasattr(data, 'dtype') and data.dtype.names is not None:
-                times = data['datetime']
-                pressures = data['pressure']
-                temps = data['temperature']
-            else:
-                # List-of-tuples format
-                data_np = np.array(data, dtype=object)
-                times = data_np[:, 0]
-                pressures = data_np[:, 1].astype(float)
-                temps = data_np[:, 2].astype(float)
-
-            mask = (times >= start_np) & (times <= end_np)
-
-            if not np.any(mask):
-                return ["N/A"] * 6
-
-            p_slice = pressures[mask]
-            t_slice = temps[mask]
-
-            return [
-                np.max(p_slice), np.min(p_slice), np.median(p_slice),
-                np.max(t_slice), np.min(t_slice), np.median(t_slice)
-            ]
+            return data.station_statistics(station['start'], station['end']) or ["N/A"] * 6
 
         # Compute new stats
         top_stats = compute_stats(self.top_data)
@@ -3158,11 +3222,7 @@ class SurveyApp(QWidget):
 
     def get_ordinal(self, n):
         """Convert integer to ordinal string (1st, 2nd, 3rd, etc.)"""
-        if 10 <= n % 100 <= 20:
-            suffix = 'th'
-        else:
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
-        return f"{n}{suffix}"
+        return ordinal(n)
 
     def copy_graphs(self):
         """Copy the current graphs to clipboard as an image"""
@@ -3202,6 +3262,7 @@ class SurveyApp(QWidget):
         self.bottom_times = None
         self.bottom_pressures = None
         self.bottom_temps = None
+        self.hover_index = {}
 
         if hasattr(self, 'current_canvas') and self.current_canvas:
             self.current_canvas.figure.clear()
@@ -3290,60 +3351,6 @@ class SurveyApp(QWidget):
             MessageBoxWindow.message_simple(self, "No Data", "No gauge data available to generate AS2 files", "warning")
             return
 
-        def generate_as2_file(input_file_path, data, output_directory=None):
-            """Generate AS2 formatted file from processed data with right-aligned columns"""
-            try:
-                # Determine output file path
-                if output_directory:
-                    # Use the provided output directory
-                    base_filename = os.path.basename(input_file_path)
-                    if base_filename.endswith('.txt'):
-                        output_filename = base_filename.replace('.txt', '.AS2')
-                    else:
-                        output_filename = base_filename + '.AS2'
-                    output_file_path = os.path.join(output_directory, output_filename)
-                else:
-                    # Use original file location
-                    if input_file_path.endswith('.txt'):
-                        output_file_path = input_file_path.replace('.txt', '.AS2')
-                    else:
-                        output_file_path = input_file_path + '.AS2'
-
-                if not data:
-                    # Create empty file if no data
-                    with open(output_file_path, 'w'):
-                        pass
-                    return output_file_path
-
-                # Create event lookup dictionary
-                event_dict = {dt.strftime("%Y-%m-%d %H:%M:%S"): desc for dt, desc in self.events}
-
-                # Calculate column widths
-                if data:
-                    max_pressure_width = max(len(f"{p:.2f}") for _, p, _ in data)
-                    max_temp_width = max(len(f"{t:.3f}") for _, _, t in data)
-                else:
-                    max_pressure_width = 10
-                    max_temp_width = 10
-
-                with open(output_file_path, 'w') as f:
-                    for dt, pressure, temperature in data:
-                        date_str = dt.strftime("%d/%m/%Y")
-                        time_str = dt.strftime("%H:%M:%S")
-                        datetime_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-
-                        temp_str = f"{temperature:.2f}".rjust(max_temp_width)
-                        pressure_str = f"{pressure:.3f}".rjust(max_pressure_width)
-
-                        event_desc = event_dict.get(datetime_str, "")
-                        line = f"{date_str}  {time_str}    {temp_str}     {pressure_str}  {event_desc}\n"
-                        f.write(line)
-
-                return output_file_path
-            except Exception as e:
-                print(f"Error generating AS2 file: {e}")
-                return None
-
         try:
             # Determine output directory
             output_directory = output_dir
@@ -3352,8 +3359,12 @@ class SurveyApp(QWidget):
             if not output_directory and hasattr(self, 'template_path') and self.template_path:
                 output_directory = os.path.dirname(self.template_path)
 
-            top_as2_path = generate_as2_file(self.top_file_path, self.top_data, output_directory)
-            bottom_as2_path = generate_as2_file(self.bottom_file_path, self.bottom_data, output_directory)
+            # Both gauges are formatted and written concurrently
+            top_as2_path, bottom_as2_path = write_as2_files(
+                [(as2_output_path(self.top_file_path, output_directory), self.top_data),
+                 (as2_output_path(self.bottom_file_path, output_directory), self.bottom_data)],
+                self.events
+            )
 
             if top_as2_path and bottom_as2_path:
                 # Show success message with file locations
@@ -3408,11 +3419,9 @@ class SurveyApp(QWidget):
                 'sea_level': self.sea_level,
                 'gauge_type': self.gauge_type if hasattr(self, 'gauge_type') else 'SGS',
                 'spm_depths': self.spm_depths if hasattr(self, 'spm_depths') else [],
-                'app_version': '1.0'
             }
 
-            with open(file_path, 'wb') as f:
-                pickle.dump(state, f)
+            write_survey(file_path, state)
 
             self.save_file_path = file_path
             MessageBoxWindow.message_simple(
@@ -3426,6 +3435,14 @@ class SurveyApp(QWidget):
                 "warning"
             )
 
+    def open_comparison_window(self):
+        """Open (or bring forward) the multi-survey comparison window"""
+        if getattr(self, "comparison_window", None) is None:
+            self.comparison_window = SurveyComparisonWindow(self)
+        self.comparison_window.show()
+        self.comparison_window.raise_()
+        self.comparison_window.activateWindow()
+
     def open_file(self):
         """Load application state from a file"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -3435,19 +3452,23 @@ class SurveyApp(QWidget):
             return
 
         try:
-            with open(file_path, 'rb') as f:
-                state = pickle.load(f)
-
-            # Validate file version
-            if state.get('app_version') != '1.0':
-                MessageBoxWindow.message_simple(
-                    self, "Version Mismatch",
-                    "This file was created with a different version of the application",
-                    "warning"
+            if is_legacy_survey(file_path):
+                reply = MessageBoxWindow.message_yes_no(
+                    self, "Convert Survey",
+                    "This survey was saved in the old format.\n\n"
+                    "Convert it to the new compact format now?\n"
+                    "(A backup of the original is kept as .bak)",
+                    QMessageBox.Icon.Question
                 )
-                return
+                if reply == QMessageBox.StandardButton.Yes:
+                    state = convert_legacy_survey(file_path)
+                else:
+                    state = read_legacy_survey(file_path)
+            else:
+                state = read_survey(file_path)
 
-            # Load state into application
+            # Load state into application (gauge arrays stay on disk until first used)
+            self.stop_live_mode()
             self.top_file_path = state.get('top_file_path')
             self.bottom_file_path = state.get('bottom_file_path')
             self.top_data = state.get('top_data')
@@ -3468,6 +3489,7 @@ class SurveyApp(QWidget):
             # Update UI
             self.content_stack.setCurrentIndex(1)  # Show results screen
             self.update_info_labels()
+            QApplication.processEvents()  # Paint metadata before the gauge arrays are decoded
             self.populate_station_table()
             self.populate_events_table()
             self.show_stacked_graphs(self.top_file_path, self.bottom_file_path)
@@ -3493,69 +3515,7 @@ class SurveyApp(QWidget):
 
     def auto_generate_events(self):
         """Auto-generate events based on processed data and station timings"""
-        self.events = []  # Clear existing events
-
-        # 1. Battery connected (earliest time from .txt file)
-        if self.top_data or self.bottom_data:
-            all_times = []
-            if self.top_data:
-                all_times.extend([d[0] for d in self.top_data])
-            if self.bottom_data:
-                all_times.extend([d[0] for d in self.bottom_data])
-            if all_times:
-                min_time = min(all_times)
-                self.events.append((min_time, "Battery Connected"))
-
-        # 2. ATM Reading (start time of ATM station)
-        atm_stations = [s for s in self.station_timings if s['station'] == 'ATM']
-        if atm_stations:
-            first_atm = atm_stations[0]
-            self.events.append((first_atm['start'], "Reading ATM"))
-
-        # 3. Open Swab Valve (pressure increase from data)
-        if self.top_data:
-            # Find first significant pressure increase
-            base_pressure = None
-            for data_point in self.top_data:
-                _, pressure, _ = data_point
-                if base_pressure is None:
-                    base_pressure = pressure
-                elif pressure > base_pressure + 0.5:  # 500 psi threshold
-                    self.events.append((data_point[0], "Open Swab Valve"))
-                    break
-
-        # 4. THP Reading and POOH events
-        thp_stations = [s for s in self.station_timings if s['station'] == 'THP']
-        non_thp_stations = [s for s in self.station_timings if s['station'] not in ['ATM', 'THP']]
-
-        for idx, thp in enumerate(thp_stations):
-            # THP Reading event
-            self.events.append((thp['start'], "Reading THP"))
-
-            # Only add POOH if it's not the last THP station
-            first = True
-            if idx < len(thp_stations) - 1:
-                if first:
-                    self.events.append((thp['end'], "RIH"))
-                    first = False
-                else:
-                    self.events.append((thp['end'], "POOH"))
-
-            # For each non-THP station after this THP
-            station_count = 0
-            for station in non_thp_stations:
-                if station['start'] > thp['end']:
-                    station_count += 1
-                    ordinal = self.get_ordinal(station_count)
-
-                    # Station start event
-                    self.events.append((
-                        station['start'],
-                        f"{ordinal} Stop at {station['depth']} ft WLD"
-                    ))
-
-                    # Station end event (POOH)
-                    self.events.append((station['end'], "POOH"))
+        self.events = generate_events(self.top_data, self.bottom_data, self.station_timings)
 
         # Update event table UI
         self.event_table.setRowCount(0)
@@ -3572,17 +3532,8 @@ class SurveyApp(QWidget):
         """Copy pressure and temperature statistics to clipboard with visual feedback"""
         clipboard = QApplication.clipboard()
 
-        # Get statistics data
-        stats_data = []
-        for row in range(self.table_widget.rowCount()):
-            row_data = []
-            for col in range(4, 18):  # Columns 5 to 18
-                item = self.table_widget.item(row, col)
-                row_data.append(item.text() if item else "")
-            stats_data.append("\t".join(row_data))
-
         # Format as tab-separated values
-        text_data = "\n".join(stats_data)
+        text_data = "\n".join("\t".join(row) for row in self.statistics_table_rows())
 
         # Set to clipboard
         clipboard.setText(text_data)
@@ -3596,158 +3547,48 @@ class SurveyApp(QWidget):
             'copy'
         )
 
-    def paste_to_template(self, template_path):
-        """Paste clipboard data to template starting at C13 with row deletion"""
-        try:
-            wb = openpyxl.load_workbook(template_path)
-            sheet = wb.active
-            clipboard = QApplication.clipboard()
-            rows = clipboard.text().split('\n')
-
-            # Count valid data rows (non-empty)
-            x = sum(1 for row in rows if row.strip())
-
-            # Calculate unused rows
-            U = 69 - x
-
-            # --- Handle SGS/FGS specific changes ---
-            if hasattr(self, 'gauge_type'):
-                if self.gauge_type == "SGS":
-                    # SGS: Change B1 to "STATIC GRADIENT SURVEY"
-                    sheet['B1'] = "STATIC GRADIENT SURVEY"
-
-                    # Hide columns X to Z
-                    for col in ['X', 'Y', 'Z']:
-                        sheet.column_dimensions[col].hidden = True
-
-                elif self.gauge_type == "FGS":
-                    # FGS: Change B1 to "FLOWING GRADIENT SURVEY"
-                    sheet['B1'] = "FLOWING GRADIENT SURVEY"
-
-                    # Make sure columns X-Z are not hidden
-                    for col in ['X', 'Y', 'Z']:
-                        sheet.column_dimensions[col].hidden = False
-
-                    # Change all cells in column B that contain "static. grad" to "flw. grad"
-                    for row in sheet.iter_rows(min_col=2, max_col=2):  # Column B is column 2
-                        cell = row[0]
-                        if cell.value and "static. grad" in str(cell.value):
-                            cell.value = str(cell.value).replace("static. grad", "flw. grad")
-
-                    # Write SPM data if available
-                    if hasattr(self, 'spm_depths') and self.spm_depths:
-                        start_row = 12
-                        # Write SPM numbers in column AB (column 28)
-                        for i, spm_num in enumerate(range(1, len(self.spm_depths) + 1)):
-                            cell = sheet.cell(row=start_row + i, column=24)  # Column AB = 28
-                            cell.value = spm_num
-
-                        # Write SPM depths in column AC (column 29)
-                        for i, depth in enumerate(self.spm_depths):
-                            cell = sheet.cell(row=start_row + i, column=25)  # Column AC = 29
-                            cell.value = float(depth)
-
-                        # Clear contents and formatting from all cells below the last SPM row in columns AB to AD
-                        last_spm_row = start_row + len(self.spm_depths)
-                        max_row = sheet.max_row
-
-                        for row in range(last_spm_row, max_row + 1):
-                            for col in [24, 25, 36]:  # Columns AB, AC, AD
-                                cell = sheet.cell(row=row, column=col)
-                                cell.value = None
-                                # Clear formatting by setting style to default
-                                cell.style = 'Normal'
-                    else:
-                        # If no SPM depths but FGS is selected, clear columns AB-AD
-                        start_row = 12
-                        max_row = sheet.max_row
-                        for row in range(start_row, max_row + 1):
-                            for col in [24, 25, 26]:
-                                cell = sheet.cell(row=row, column=col)
-                                cell.value = None
-                                cell.style = 'Normal'
-
-            # Delete unused rows if needed
-            if U > 0:
-                # Delete from top section (row 80-U to 80)
-                start_top = 82 - U
-                sheet.delete_rows(start_top, U + 1)  # +1 to include end row
-
-            # Paste data
-            for row_idx, row in enumerate(rows):
-                if not row.strip():
-                    continue
+    def statistics_table_rows(self):
+        """Columns AHD..bottom statistics of the results table, as displayed"""
+        rows = []
+        for row in range(self.table_widget.rowCount()):
+            row_data = []
+            for col in range(4, 18):  # Columns 5 to 18
+                item = self.table_widget.item(row, col)
+                row_data.append(item.text() if item else "")
+            rows.append(row_data)
+        return rows
 
-                cells = row.split('\t')[:14]  # Only process first 14 columns
-                for col_idx, cell_value in enumerate(cells):
-                    try:
-                        value = float(cell_value)
-                    except ValueError:
-                        value = cell_value
-
-                    sheet.cell(
-                        row=13 + row_idx,
-                        column=3 + col_idx,
-                        value=value
-                    )
-
-            # Update header information
-            sheet.cell(row=3, column=3, value=f": {self.location}")
-            sheet.cell(row=4, column=3, value=f": {self.well}")
-            sheet.cell(row=3, column=18, value=self.date)
-            sheet.cell(row=4, column=18, value=self.sea_level)
-            sheet.cell(row=5, column=18, value=self.bdf)
-
-            # Change the second last cell in column B to "2nd lubr."
-            # Find the last row with data (assuming data ends at row 13 + x - 1)
-            last_data_row = 14 + x - 1
-            second_last_row = last_data_row - 1
-            sheet.cell(row=second_last_row, column=2, value="2nd lubr.")
-
-            # # ------------------ CREATE PRESSURE / TEMPERATURE CHART ------------------
-            #
-            # # Define data range
-            # start_row = 14
-            # end_row = last_data_row
-            #
-            # # Create references for the data
-            # pressures = Reference(sheet, min_col=7, min_row=start_row, max_row=end_row)  # Column G
-            # depths = Reference(sheet, min_col=4, min_row=start_row, max_row=end_row)  # Column D
-            #
-            # # Create the chart
-            # chart = ScatterChart()
-            # chart.title = "Pressure vs Depth"
-            # chart.x_axis.title = "Pressure (psi)"
-            # chart.y_axis.title = "Depth (ft)"
-            #
-            # # Create an XYSeries (dedicated series for charts with x and y series)
-            # series = XYSeries()
-            # series.yVal = pressures  # Y values (vertical axis)
-            # series.xVal = depths  # X values (horizontal axis)
-            #
-            # # Customize the series appearance
-            # series.marker = Marker('circle', size=8)
-            # series.graphicalProperties.line.noFill = True
-            #
-            # # Add the series to the chart
-            # chart.series.append(series)
-            #
-            # # Add the chart to the worksheet
-            # sheet.add_chart(chart, "P5")
-            #
-            # # Save the workbook
-            # output_path = template_path.replace('.xlsx', '_filled.xlsx')
-            # wb.save(output_path)
-            # print(f"Workbook saved to: {output_path}")
-
-            wb.save(template_path)
+    def report_info(self):
+        """Survey details needed by the Excel outputs"""
+        return {
+            'location': self.location,
+            'well': self.well,
+            'date': self.date,
+            'bdf': self.bdf,
+            'sea_level': self.sea_level,
+            'gauge_type': getattr(self, 'gauge_type', 'SGS'),
+            'spm_depths': getattr(self, 'spm_depths', []),
+            'station_timings': self.station_timings,
+            'tvd_data': self.tvd_data,
+        }
+
+    def gradient_analysis(self):
+        """Station gradients, fluid segments and contacts for both gauges"""
+        return analyse_gradients(self.station_timings, {'top': self.top_data, 'bottom': self.bottom_data},
+                                 self.tvd_data, self.bdf)
 
+    def paste_to_template(self, template_path):
+        """Write the results table into the template starting at C13 with row deletion"""
+        try:
+            self.gradient_summary = None
+            analysis = self.gradient_analysis()
+            self.gradient_summary = format_gradient_summary(analysis)
+            fill_interpretation_template(template_path, self.statistics_table_rows(), self.report_info(), analysis)
         except Exception as e:
             print(f"Error in paste_to_template: {e}")
             import traceback
             traceback.print_exc()
 
-
     def set_button_success_feedback(self, button, success_text, success_icon, original_text, original_icon):
         """Set button to success state and schedule reset"""
         button.setStyleSheet(f"""
@@ -8,6 +8,7 @@ from ui.components.toolstring_editor.ui_tool_library import ToolLibrary
 from ui.components.toolstring_editor.ui_summary import SummaryWidget
 from ui.components.ui_footer import FooterWidget
 from ui.windows.ui_database_window import DatabaseWindow
+from ui.windows.ui_string_builder_window import StringBuilderWindow
 from database.file_io import save_configuration, load_configuration
 from features.editors.ts_export_manager import export_configuration
 from utils.path_finder import get_icon_path
@@ -26,6 +27,8 @@ class ToolStringEditor(BaseEditor):
             (get_icon_path('copy'), "Copy as Image", self.copy_dropzone_to_clipboard,
              "Copy current tool config as PNG (Ctrl+C)", "Ctrl+C"),
             (get_icon_path('clear'), "Clear", self.clear_tools, "Clear all tools"),  # Changed to use method
+            (get_icon_path('add'), "Build String", self.show_string_builder_window,
+             "Suggest tool strings for a job"),
             (get_icon_path('export'), "Export", lambda: export_configuration(self), "Export to Excel"),
             (get_icon_path('help'), "Help", self.show_help_window, "Open help documentation"),
             (get_icon_path('database'), "Tool Database", self.show_database_window, "Open tool database")
@@ -92,4 +95,8 @@ class ToolStringEditor(BaseEditor):
 
     def show_database_window(self):
         self.database_window = DatabaseWindow("Tool")
-        self.database_window.show()
\ No newline at end of file
+        self.database_window.show()
+
+    def show_string_builder_window(self):
+        self.string_builder_window = StringBuilderWindow(self)
+        self.string_builder_window.show()
\ No newline at end of file
@@ -1,12 +1,12 @@
 # ui/components/pce_editor/tool_widget.py
 from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout, QPushButton, QComboBox, QGraphicsDropShadowEffect
 from PyQt6.QtCore import Qt, QSignalBlocker, QPoint, QMimeData
-from PyQt6.QtGui import QPixmap, QCursor, QColor, QMouseEvent, QDrag
+from PyQt6.QtGui import QCursor, QColor, QMouseEvent, QDrag
 from pandas import factorize
 
 from database.logic_database import get_pce_data
 from features.editors.logic_image_processing import expand_and_center_images
-from utils.path_finder import get_pce_image_path
+from utils.image_cache import get_image_cache
 from utils.styles import COMBO_STYLE, COMBO_STYLE_BLACK
 
 
@@ -37,8 +37,9 @@ class ToolWidget(QWidget):
             # image (make draggable)
             self.image_label = QLabel()
             self.image_label.setCursor(QCursor(Qt.CursorShape.OpenHandCursor))
-            pixmap = QPixmap(get_pce_image_path(tool_name))
+            pixmap = get_image_cache().pixmap("PCE", tool_name)
             self.image_label.setPixmap(pixmap)
+            self.source_pixmap = pixmap  # Unexpanded image, see expand_and_center_images
             factor = 1
             width = int(round(pixmap.width() * factor))
             height = int(round(pixmap.height() * factor))
@@ -1,7 +1,6 @@
 # ui_results_tab.py
 import textwrap
 import numpy as np
-import mplcursors
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QSplitter, QApplication, QHBoxLayout)
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
@@ -10,6 +9,7 @@ import tempfile
 
 from features.simulator import plot
 from features.simulator.export import PDFExporter
+from ui.components.ui_line_hover import LineHover
 
 
 class PlotsTab(QWidget):
@@ -73,6 +73,11 @@ class PlotsTab(QWidget):
         self.incl_canvas = FigureCanvasQTAgg(Figure(figsize=(5, 6)))
         incl_widget = create_plot_widget(self.incl_canvas, "Inclination & DLS vs Depth")
 
+        # Hover tooltips (depth-indexed, so they stay quick on long trajectories)
+        self.tension_hover = LineHover(self.tension_canvas)
+        self.overpull_hover = LineHover(self.overpull_canvas)
+        self.incl_hover = LineHover(self.incl_canvas)
+
         # Info panel setup
         info_widget = QWidget()
         info_layout = QVBoxLayout(info_widget)
@@ -193,27 +198,9 @@ class PlotsTab(QWidget):
         self.rih_line = ax.lines[0]
         self.pooh_line = ax.lines[1]
 
-        cursor_rih = mplcursors.cursor(self.rih_line, hover=True)
-
-        @cursor_rih.connect("add")
-        def _(sel):
-            depth = sel.target[1]
-            if self.use_metric:
-                text = f'RIH: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} m'
-            else:
-                text = f'RIH: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} ft'
-            sel.annotation.set_text(text)
-
-        cursor_pooh = mplcursors.cursor(self.pooh_line, hover=True)
-
-        @cursor_pooh.connect("add")
-        def _(sel):
-            depth = sel.target[1]
-            if self.use_metric:
-                text = f'POOH: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} m'
-            else:
-                text = f'POOH: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} ft'
-            sel.annotation.set_text(text)
+        self.tension_hover.clear()
+        self.tension_hover.add(self.rih_line, lambda x, y: f'RIH: {x:.1f} lbs\nDepth: {y:.1f} {self.depth_unit}')
+        self.tension_hover.add(self.pooh_line, lambda x, y: f'POOH: {x:.1f} lbs\nDepth: {y:.1f} {self.depth_unit}')
 
         # Update overpull plot
         self.max_overpulls = plot.plot_overpull(
@@ -229,16 +216,9 @@ class PlotsTab(QWidget):
         # Setup overpull cursor
         ax_overpull = self.overpull_canvas.figure.axes[0]
         overpull_line = ax_overpull.lines[0]
-        cursor_overpull = mplcursors.cursor(overpull_line, hover=True)
-
-        @cursor_overpull.connect("add")
-        def _(sel):
-            depth = sel.target[1]
-            if self.use_metric:
-                text = f'Overpull: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} m'
-            else:
-                text = f'Overpull: {sel.target[0]:.1f} lbs\nDepth: {depth:.1f} ft'
-            sel.annotation.set_text(text)
+        self.overpull_hover.clear()
+        self.overpull_hover.add(overpull_line,
+                                lambda x, y: f'Overpull: {x:.1f} lbs\nDepth: {y:.1f} {self.depth_unit}')
 
         # Update inclination plot
         self.dls_values = plot.plot_inclination_dls(
@@ -251,30 +231,15 @@ class PlotsTab(QWidget):
         # Setup inclination/DLS cursors
         ax_incl = self.incl_canvas.figure.axes[0]
         incl_line = ax_incl.lines[0]
-        cursor_incl = mplcursors.cursor(incl_line, hover=True)
-
-        @cursor_incl.connect("add")
-        def _(sel):
-            depth = sel.target[1]
-            if self.use_metric:
-                text = f'Inclination: {sel.target[0]:.1f}°\nDepth: {depth:.1f} m'
-            else:
-                text = f'Inclination: {sel.target[0]:.1f}°\nDepth: {depth:.1f} ft'
-            sel.annotation.set_text(text)
+        self.incl_hover.clear()
+        self.incl_hover.add(incl_line, lambda x, y: f'Inclination: {x:.1f}°\nDepth: {y:.1f} {self.depth_unit}')
 
-        ax_dls = self.incl_canvas.figure.axes[0].twiny()
-        dls_line = ax_dls.lines[0] if ax_dls.lines else None
+        # DLS is drawn on the twin axes created by the plot
+        ax_dls = self.incl_canvas.figure.axes[1] if len(self.incl_canvas.figure.axes) > 1 else None
+        dls_line = ax_dls.lines[0] if ax_dls is not None and ax_dls.lines else None
         if dls_line:
-            cursor_dls = mplcursors.cursor(dls_line, hover=True)
-
-            @cursor_dls.connect("add")
-            def _(sel):
-                depth = sel.target[1]
-                if self.use_metric:
-                    text = f'DLS: {sel.target[0]:.1f}°/30m\nDepth: {depth:.1f} m'
-                else:
-                    text = f'DLS: {sel.target[0]:.1f}°/100ft\nDepth: {depth:.1f} ft'
-                sel.annotation.set_text(text)
+            dls_unit = '°/30m' if self.use_metric else '°/100ft'
+            self.incl_hover.add(dls_line, lambda x, y: f'DLS: {x:.1f}{dls_unit}\nDepth: {y:.1f} {self.depth_unit}')
 
         self.update_info_labels()
 
@@ -1,10 +1,12 @@
 # ui/components/toolstring_editor/tool_widget.py
-from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout, QComboBox
+from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout, QComboBox, QMenu
 from PyQt6.QtCore import Qt, QSignalBlocker, QPoint
-from PyQt6.QtGui import QPixmap, QCursor, QMouseEvent, QDrag
+from PyQt6.QtGui import QCursor, QMouseEvent, QDrag
 from database.logic_database import get_tool_data
-from utils.path_finder import get_tool_image_path
-from utils.styles import COMBO_STYLE_BLACK
+from features.toolstring.connections import get_connection_graph, is_crossover, thread_type
+from features.toolstring.model import ToolEntry, format_length, format_od, format_weight
+from utils.image_cache import get_image_cache
+from utils.styles import COMBO_STYLE_BLACK, COMBO_STYLE_MISMATCH
 
 
 class ToolWidget(QWidget):
@@ -20,6 +22,9 @@ class ToolWidget(QWidget):
             self.drop_zone = drop_zone
             self.summary_widget = summary_widget
             self.drag_start_pos = None
+            self.mismatch_state = (None, None)  # Connection mismatches shown, see show_mismatches
+            self.entry = ToolEntry(tool_name)
+            self.tool_string = None  # Set by the drop zone once the tool is added to its string
 
             # --- load DB first ---
             self.tool_data = get_tool_data(tool_name)
@@ -36,9 +41,9 @@ class ToolWidget(QWidget):
             # image (make draggable) - copied from PCE editor
             self.image_label = QLabel()
             self.image_label.setCursor(QCursor(Qt.CursorShape.OpenHandCursor))
-            image_path = get_tool_image_path(tool_name)
-            pixmap = QPixmap(image_path)
+            pixmap = get_image_cache().pixmap("Tool", tool_name)
             self.image_label.setPixmap(pixmap)
+            self.source_pixmap = pixmap  # Unexpanded image, see expand_and_center_images
 
             # Store original image size for centering
             self.original_width = pixmap.width()
@@ -71,8 +76,6 @@ class ToolWidget(QWidget):
             self.nominal_size_selector.addItems(nominal_sizes)
             self.nominal_size_selector.setStyleSheet(COMBO_STYLE_BLACK)
             self.nominal_size_selector.currentTextChanged.connect(self.update_tool_info)
-            if self.summary_widget:
-                self.nominal_size_selector.currentTextChanged.connect(self.summary_widget.update_summary)
             self.layout.addWidget(self.nominal_size_selector)
 
             # **OD Label**
@@ -108,10 +111,7 @@ class ToolWidget(QWidget):
             self.lower_connection_label.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
             self.lower_connection_label.setFixedWidth(127)
             self.lower_connection_label.setStyleSheet(COMBO_STYLE_BLACK)
-            self.lower_connection_label.currentTextChanged.connect(self.sync_top_connection)
-
-            if self.summary_widget:
-                self.lower_connection_label.currentTextChanged.connect(self.summary_widget.update_summary)
+            self.lower_connection_label.currentTextChanged.connect(self.on_lower_connection_changed)
             self.layout.addWidget(self.lower_connection_label)
 
             # Apply layout and update details
@@ -156,20 +156,21 @@ class ToolWidget(QWidget):
 
         # ---- Reset UI if no data ----
         if not size_data:
-            self.od_label.setText("N/A")
-            self.length_label.setText("N/A")
-            self.weight_label.setText("N/A")
+            self.show_dimensions(None, None, None)
             self.top_connection_label.setText("N/A")
 
             with QSignalBlocker(self.lower_connection_label):
                 self.lower_connection_label.clear()
                 self.lower_connection_label.addItem("-")
+            self.store(nominal_size=selected_size, od=None, length=None, weight=None,
+                       top_connection="N/A", lower_connection="-")
             return
 
         # ---- Dimensions ----
-        self.od_label.setText(f"{float(size_data.get('OD', 0)):.3f} in")
-        self.length_label.setText(f"{float(size_data.get('Length', 0)):.1f} ft")
-        self.weight_label.setText(f"{float(size_data.get('Weight', 0)):.1f} lbs")
+        od = float(size_data.get('OD', 0))
+        length = float(size_data.get('Length', 0))
+        weight = float(size_data.get('Weight', 0))
+        self.show_dimensions(od, length, weight)
 
         # ---- Connections ----
         lowers = [x for x in size_data.get("Lower Connections", []) if x and x != "nan"]
@@ -199,6 +200,47 @@ class ToolWidget(QWidget):
             else:
                 self.top_connection_label.setText("-")
 
+        self.store(nominal_size=selected_size, od=od, length=length, weight=weight,
+                   top_connection=self.top_connection_label.text(),
+                   lower_connection=self.lower_connection_label.currentText())
+
+    def show_dimensions(self, od, length, weight):
+        """Shows OD, length and weight (None for unknown) the way they are saved."""
+        self.od_label.setText(format_od(od))
+        self.length_label.setText(format_length(length))
+        self.weight_label.setText(format_weight(weight))
+
+    def store(self, **fields):
+        """Writes the tool's values to its entry, through the tool string once the tool is in one."""
+        if self.tool_string is not None:
+            self.tool_string.update(self.entry, **fields)
+        else:
+            for field, value in fields.items():
+                setattr(self.entry, field, value)
+
+    def restore(self, entry):
+        """Shows a saved tool (e.g. from a .bha file), keeping its saved dimensions."""
+        self.nominal_size_selector.setCurrentText(entry.nominal_size)
+        self.show_dimensions(entry.od, entry.length, entry.weight)
+        self.top_connection_label.setText(entry.top_connection)
+        self.lower_connection_label.setCurrentText(entry.lower_connection)
+        self.store(nominal_size=self.nominal_size_selector.currentText(),
+                   od=entry.od, length=entry.length, weight=entry.weight,
+                   top_connection=self.top_connection_label.text(),
+                   lower_connection=self.lower_connection_label.currentText())
+
+    def on_lower_connection_changed(self, text):
+        self.sync_top_connection()
+        self.store(lower_connection=text, top_connection=self.top_connection_label.text())
+
+    def select_lower_thread(self, connection):
+        """Selects the lower connection with the same thread type as `connection`, pin or box alike."""
+        wanted = thread_type(connection)
+        for index in range(self.lower_connection_label.count()):
+            if thread_type(self.lower_connection_label.itemText(index)) == wanted:
+                self.lower_connection_label.setCurrentIndex(index)
+                return
+
     def sync_top_connection(self):
         """Synchronizes top connection label with the selected lower connection."""
         if not getattr(self, "_sync_enabled", False):
@@ -210,6 +252,53 @@ class ToolWidget(QWidget):
             self._modify_connection(raw, side="top")
         )
 
+    def contextMenuEvent(self, event):
+        """Offers the catalog tools (and crossovers) that make up below this one."""
+        nodes = get_connection_graph().next_tools(self.lower_connection_label.currentText())
+        menu = QMenu(self)
+        add_menu = menu.addMenu("Add below")
+
+        by_category = {}
+        for node in nodes:
+            category = "Crossovers" if is_crossover(node.name) else node.category or "Other"
+            by_category.setdefault(category, []).append(node)
+
+        if not by_category:
+            add_menu.setEnabled(False)
+        index = self.drop_zone.tool_widgets.index(self) + 1 if self in self.drop_zone.tool_widgets else None
+        for category, category_nodes in by_category.items():
+            category_menu = add_menu.addMenu(category)
+            for node in category_nodes:
+                action = category_menu.addAction(f"{node.name} ({node.size})")
+                action.triggered.connect(
+                    lambda checked=False, node=node: self.drop_zone.add_tool(node.name, index, node.size)
+                )
+        menu.exec(event.globalPos())
+
+    def show_mismatches(self, above, below):
+        """Highlights connections that do not make up with the tool above / below (Mismatch or None)."""
+        state = (above and (above.upper, above.lower), below and (below.upper, below.lower))
+        if state == self.mismatch_state:
+            return
+        self.mismatch_state = state
+
+        if above:
+            self.top_connection_label.setStyleSheet("border: none; color: #d9534f; font-weight: bold;")
+            self.top_connection_label.setToolTip(f"Does not make up with {above.upper} above")
+        else:
+            self.top_connection_label.setStyleSheet("border: none; color: black;")
+            self.top_connection_label.setToolTip("")
+
+        if below:
+            tip = f"Does not make up with {below.lower} below"
+            if below.crossovers:
+                tip += "\nCrossover: " + ", ".join(sorted({node.name for node in below.crossovers}))
+            self.lower_connection_label.setStyleSheet(COMBO_STYLE_MISMATCH)
+            self.lower_connection_label.setToolTip(tip)
+        else:
+            self.lower_connection_label.setStyleSheet(COMBO_STYLE_BLACK)
+            self.lower_connection_label.setToolTip("")
+
     def _modify_connection(self, conn, side="lower"):
         """Modifies the connection name based on position and standard rules."""
         if conn.endswith("SR"):
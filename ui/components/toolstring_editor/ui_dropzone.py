@@ -4,6 +4,8 @@ from PyQt6.QtCore import Qt, QEasingCurve, QPropertyAnimation, QMimeData, QPoint
 from PyQt6.QtGui import QDrag, QPixmap
 
 from features.editors.logic_image_processing import expand_and_center_images
+from features.toolstring.connections import get_connection_graph
+from features.toolstring.model import ToolString
 from utils.screen_info import get_height
 from utils.styles import DROPZONE_STYLE, DROPZONE_HEADERS
 from utils.path_finder import get_icon_path
@@ -25,6 +27,8 @@ class DropZone(QFrame):
         self.setAcceptDrops(True)
 
         self.tool_widgets = []  # List to store tool widgets
+        self.tool_string = ToolString()  # The tools' values, in the same order as tool_widgets
+        self.tool_string.subscribe(self.check_connections)
 
         # ✅ Main Layout
         self.main_layout = QVBoxLayout(self)
@@ -215,13 +219,13 @@ class DropZone(QFrame):
                     tool = self.tool_widgets[tool_index]
                     print(f"Deleting tool: {tool.tool_name}")
                     self.tool_widgets.remove(tool)
+                    self.tool_string.remove(tool_index)
+                    tool.tool_string = None
                     self.layout.removeWidget(tool)
                     tool.setParent(None)
                     tool.deleteLater()
                     expand_and_center_images(self.tool_widgets, self.diagram_width)
                     self.update_placeholder()
-                    if self.main_window.summary_widget:
-                        self.main_window.summary_widget.update_summary()
                 self.trash_area.hide()
                 event.accept()
                 self.setStyleSheet(DROPZONE_STYLE)
@@ -267,10 +271,9 @@ class DropZone(QFrame):
 
         self.tool_widgets.insert(target_index, source_tool)
         self.layout.insertWidget(target_index, source_tool)
+        self.tool_string.move(source_index, target_index)
 
         expand_and_center_images(self.tool_widgets, self.diagram_width)
-        if self.main_window.summary_widget:
-            self.main_window.summary_widget.update_summary()
 
     def _find_drop_index(self, pos):
         """Find the index where tool should be dropped (0 = top)."""
@@ -302,35 +305,70 @@ class DropZone(QFrame):
         layout.insertWidget(insert_index, self.drop_indicator)
         self.drop_indicator.show()
 
-    def add_tool(self, tool_name):
-        """Add a new tool to the drop zone at the BOTTOM (end of list)."""
+    def add_tool(self, tool_name, index=None, nominal_size=None):
+        """Add a new tool to the drop zone at the BOTTOM (end of list), or at `index`."""
         # Import here to avoid circular imports
         from ui.components.toolstring_editor.tool_widget import ToolWidget
 
         new_tool = ToolWidget(tool_name, self, self.main_window.summary_widget)
         if new_tool.tool_data:
+            if nominal_size:
+                new_tool.nominal_size_selector.setCurrentText(nominal_size)
             # Append to the END (bottom) instead of the top
-            self.tool_widgets.append(new_tool)
-            self.layout.addWidget(new_tool)
+            self.attach_tool(new_tool, index)
             self.setStyleSheet(DROPZONE_STYLE)
             self.update_placeholder()
-            if self.main_window.summary_widget:
-                self.main_window.summary_widget.update_summary()
             expand_and_center_images(self.tool_widgets, self.diagram_width, False, 0.5)
         else:
             print(f"⚠️ ERROR: Tool '{tool_name}' not found in database!")
 
+    def load_tool_string(self, tool_string):
+        """Replaces the tools with those of a ToolString (e.g. one from the string builder), sizes and threads included."""
+        from ui.components.toolstring_editor.tool_widget import ToolWidget
+
+        self.clear_tools()
+        for entry in tool_string:
+            new_tool = ToolWidget(entry.name, self, self.main_window.summary_widget)
+            if not new_tool.tool_data:
+                print(f"⚠️ ERROR: Tool '{entry.name}' not found in database!")
+                new_tool.deleteLater()
+                continue
+            new_tool.nominal_size_selector.setCurrentText(entry.nominal_size)
+            new_tool.select_lower_thread(entry.lower_connection)
+            self.attach_tool(new_tool)
+
+        self.setStyleSheet(DROPZONE_STYLE)
+        self.update_placeholder()
+        expand_and_center_images(self.tool_widgets, self.diagram_width)
+
     def clear_tools(self):
         """Clear all tools from the drop zone."""
         for tool in self.tool_widgets:
             self.layout.removeWidget(tool)
+            tool.tool_string = None
             tool.setParent(None)
             tool.deleteLater()
         self.tool_widgets.clear()
-        if self.main_window.summary_widget:
-            self.main_window.summary_widget.update_summary()
+        self.tool_string.clear()
         self.update_placeholder()
 
+    def check_connections(self):
+        """Highlights tools whose connections do not make up with their neighbours."""
+        if len(self.tool_widgets) != len(self.tool_string):
+            return  # Mid-update; called again once widgets and tool string agree
+        mismatches = {mismatch.index: mismatch for mismatch in get_connection_graph().validate(self.tool_string)}
+        for index, tool in enumerate(self.tool_widgets):
+            tool.show_mismatches(mismatches.get(index - 1), mismatches.get(index))
+
+    def attach_tool(self, tool_widget, index=None):
+        """Puts a built ToolWidget in the drop zone and its tool string, at the bottom unless `index` is given."""
+        if index is None:
+            index = len(self.tool_widgets)
+        self.tool_widgets.insert(index, tool_widget)
+        self.layout.insertWidget(index, tool_widget)
+        self.tool_string.insert(index, tool_widget.entry)
+        tool_widget.tool_string = self.tool_string
+
     def update_placeholder(self):
         """Show or hide the placeholder text and keep it vertically centered when empty."""
         if not hasattr(self, 'placeholder_label'):
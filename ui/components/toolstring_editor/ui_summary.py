@@ -54,6 +54,8 @@ class SummaryWidget(QWidget):
 
         self.layout.setContentsMargins(0, 0, 0, 0)
 
+        if self.dropzone:
+            self.dropzone.tool_string.subscribe(self.update_summary)
         self.update_summary()
 
     def create_summary_item(self, label_text, icon_name):
@@ -86,22 +88,12 @@ class SummaryWidget(QWidget):
         return icon_label, label, value_label, metric_label
 
     def update_summary(self):
-        """Updates summary values dynamically."""
-        tool_widgets = self.dropzone.tool_widgets if self.dropzone else None
-
-        max_od = 0.0
-        total_length = 0.0
-        total_weight = 0.0
-
-        if tool_widgets is not None:
-            for tool in tool_widgets:
-                od = float(tool.od_label.text().split()[0]) if tool.od_label.text() != "N/A" else 0.0
-                length = float(tool.length_label.text().split()[0]) if tool.length_label.text() != "N/A" else 0.0
-                weight = float(tool.weight_label.text().split()[0]) if tool.weight_label.text() != "N/A" else 0.0
-
-                max_od = max(max_od, od)
-                total_length += length
-                total_weight += weight
+        """Shows the drop zone's tool string totals (called whenever the tool string changes)."""
+        tool_string = self.dropzone.tool_string if self.dropzone else None
+
+        max_od = tool_string.max_od if tool_string is not None else 0.0
+        total_length = tool_string.total_length if tool_string is not None else 0.0
+        total_weight = tool_string.total_weight if tool_string is not None else 0.0
 
         self.max_od_value.setText(f"{max_od:.3f} in")
         self.max_od_metric.setText(f"({max_od*25.4:.1f} mm)")
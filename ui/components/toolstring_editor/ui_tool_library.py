@@ -2,9 +2,11 @@ from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt6.QtGui import QCursor
 from PyQt6.QtWidgets import QPushButton, QWidget, QVBoxLayout, QLineEdit, QScrollArea, QComboBox, QLabel, QGraphicsOpacityEffect
 from ui.components.ui_draggable_button import DraggableButton
-from database.logic_database import get_tool_data, get_full_tool_database
+from database.logic_database import get_catalog, get_search_index
 from utils.styles import DARK_STYLE
 
+SEARCH_DEBOUNCE_MS = 120  # Typing pause before the list is filtered
+
 
 class ToolLibrary(QWidget):
     """Sidebar for listing available tools."""
@@ -20,9 +22,15 @@ class ToolLibrary(QWidget):
         # **Search Bar**
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Search tools...")
-        self.search_bar.textChanged.connect(self.update_tool_list)
         self.layout.addWidget(self.search_bar)
 
+        # Filter once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.update_tool_list)
+        self.search_bar.textChanged.connect(lambda text: self.search_timer.start())
+
         # --- Clear (❌) button setup ---
         self.clear_button = QPushButton("✕", self.search_bar)
         self.clear_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
@@ -72,8 +80,7 @@ class ToolLibrary(QWidget):
         # **Filter Dropdown**
         self.filter_combo = QComboBox()
         self.filter_combo.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        tool_data = get_tool_data()
-        self.filter_combo.addItems(["All Tools"] + tool_data["Category"].unique().tolist())
+        self.filter_combo.addItems(["All Tools"] + get_catalog().tool_categories)
 
         self.filter_combo.currentTextChanged.connect(self.update_tool_list)
         self.layout.addWidget(self.filter_combo)
@@ -87,6 +94,7 @@ class ToolLibrary(QWidget):
         self.tool_list_scroll.setWidget(self.tool_list_widget)
         self.tool_list_scroll.setStyleSheet("color: black; ")
         self.layout.addWidget(self.tool_list_scroll)
+        self.tool_buttons = {}  # Tool name -> button, created the first time the tool is listed
 
         # **Tool Count Label**
         self.tool_count_label = QLabel("Showing 0 tools")
@@ -107,57 +115,51 @@ class ToolLibrary(QWidget):
         self.search_bar.setFocus()
 
     def update_tool_list(self):
-        """Updates the tool list based on search input and selected category."""
+        """Shows the tools matching the search text and selected category, best matches first."""
+        self.search_timer.stop()
         selected_category = self.filter_combo.currentText()
-        search_text = self.search_bar.text().strip().lower()
-
-        full_df = get_full_tool_database().copy()
+        tools = get_search_index("Tool").search(
+            self.search_bar.text(), None if selected_category == "All Tools" else selected_category)
 
-        if selected_category != "All Tools":
-            full_df = full_df[full_df["Category"] == selected_category]
-
-        if search_text:
-            full_df = full_df[full_df["Tool Name"].str.contains(search_text, case=False, na=False)]
-
-        # Clear list
+        # Reuse the buttons already built; only tools listed for the first time get a new one
+        self.tool_list_widget.setUpdatesEnabled(False)
         while self.tool_list_layout.count():
-            item = self.tool_list_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            self.tool_list_layout.takeAt(0)
 
-        # Build unique list with description lookup
-        tool_count = 0
-        seen = set()
+        shown = set()
         new_buttons = []
-        for _, row in full_df.iterrows():
-            tool_name = str(row["Tool Name"])
-            if tool_name in seen:
-                continue
-            seen.add(tool_name)
-
-            description = None
-            if "Description" in full_df.columns:
-                desc_series = full_df.loc[full_df["Tool Name"] == tool_name, "Description"].dropna()
-                if not desc_series.empty:
-                    description = str(desc_series.iloc[0]).strip()
-
-            if not description:
-                description = self._fallback_description(tool_name, str(row.get("Category", "")))
-
-            btn = DraggableButton(tool_name, dropzone=self.drop_zone, description=description)
-            btn.setGraphicsEffect(QGraphicsOpacityEffect(btn))
-            btn.graphicsEffect().setOpacity(0)  # Start invisible
-
+        for tool_name, category, description in tools:
+            btn = self.tool_buttons.get(tool_name)
+            if btn is None:
+                btn = self.create_tool_button(tool_name, category, description)
+                self.tool_buttons[tool_name] = btn
+                new_buttons.append(btn)
             self.tool_list_layout.addWidget(btn)
-            new_buttons.append(btn)
-            tool_count += 1
+            btn.show()
+            shown.add(tool_name)
+
+        for tool_name, btn in self.tool_buttons.items():
+            if tool_name not in shown:
+                btn.hide()
 
         self.tool_list_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.tool_count_label.setText(f"Showing {tool_count} tools")
+        self.tool_list_widget.setUpdatesEnabled(True)
+        self.tool_count_label.setText(f"Showing {len(shown)} tools")
 
         # Trigger waterfall fade-in
         self.animate_buttons_fade_in(new_buttons)
 
+    def create_tool_button(self, tool_name, category, description):
+        """Builds the (initially transparent) button for one tool."""
+        description = str(description).strip() if description else None
+        if not description:
+            description = _fallback_description(self, tool_name, str(category or ""))
+
+        btn = DraggableButton(tool_name, dropzone=self.drop_zone, description=description)
+        btn.setGraphicsEffect(QGraphicsOpacityEffect(btn))
+        btn.graphicsEffect().setOpacity(0)  # Start invisible
+        return btn
+
     def animate_buttons_fade_in(self, buttons):
         """Creates a staggered waterfall fade-in animation for new tool buttons."""
         delay_interval = 80  # milliseconds between each button fade start
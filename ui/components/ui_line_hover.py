@@ -0,0 +1,83 @@
+import numpy as np
+
+from utils.picking import AxisPicker
+
+HOVER_PIXELS = 10  # How close (in screen pixels) the cursor must be to a point
+
+
+class LineHover:
+    """
+    Hover tooltips for matplotlib lines plotted against depth.
+
+    Each line gets a binary-search index over its depth axis when it is
+    added, so a mouse move costs O(log n) per line instead of a scan of
+    every point. The nearest point of the closest line (in pixels) is
+    annotated; nothing is redrawn while the annotation stays the same.
+    """
+
+    def __init__(self, canvas, tolerance=HOVER_PIXELS):
+        self.canvas = canvas
+        self.tolerance = tolerance
+        self.lines = []
+        self.annotation = None
+        self.current = None  # (line, index) being shown
+        canvas.mpl_connect("motion_notify_event", self.on_move)
+
+    def clear(self):
+        """Forget the lines, e.g. before the figure is redrawn."""
+        self.lines = []
+        self.annotation = None
+        self.current = None
+
+    def add(self, line, formatter, axis="y"):
+        """Track `line`; `formatter(x, y)` gives the tooltip text. `axis` is the line's depth axis."""
+        x = np.asarray(line.get_xdata(), dtype=np.float64)
+        y = np.asarray(line.get_ydata(), dtype=np.float64)
+        if len(x) == 0:
+            return
+        picker = AxisPicker(y if axis == "y" else x)
+        self.lines.append((line, x, y, picker, formatter, 1 if axis == "y" else 0))
+
+    def on_move(self, event):
+        best = None
+        if event.inaxes is not None:
+            for line, x, y, picker, formatter, depth_axis in self.lines:
+                if not line.get_visible() or line.axes is None:
+                    continue
+                transform = line.axes.transData
+                depth = transform.inverted().transform((event.x, event.y))[depth_axis]
+                index = picker.nearest(depth)
+                if index is None:
+                    continue
+                px, py = transform.transform((x[index], y[index]))
+                distance = np.hypot(px - event.x, py - event.y)
+                if distance <= self.tolerance and (best is None or distance < best[0]):
+                    best = (distance, line, index, formatter)
+
+        if best is None:
+            if self.annotation is not None and self.annotation.get_visible():
+                self.annotation.set_visible(False)
+                self.current = None
+                self.canvas.draw_idle()
+            return
+
+        _, line, index, formatter = best
+        if self.current == (line, index):
+            return
+        self.current = (line, index)
+
+        x, y = line.get_xdata()[index], line.get_ydata()[index]
+        if self.annotation is None or self.annotation.axes is not line.axes:
+            if self.annotation is not None:
+                self.annotation.remove()
+            self.annotation = line.axes.annotate(
+                "", xy=(0, 0),
+                xytext=(15, 15), textcoords="offset points",
+                bbox=dict(boxstyle="round", fc="w", alpha=0.9),
+                arrowprops=dict(arrowstyle="->"),
+                annotation_clip=False, zorder=10
+            )
+        self.annotation.xy = (x, y)
+        self.annotation.set_text(formatter(float(x), float(y)))
+        self.annotation.set_visible(True)
+        self.canvas.draw_idle()
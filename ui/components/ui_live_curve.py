@@ -0,0 +1,42 @@
+import numpy as np
+import pyqtgraph as pg
+
+
+class LiveCurve:
+    """
+    A pyqtgraph line that can be extended without redrawing what is already plotted.
+
+    New points are added as a short extra segment. Neighbouring segments are
+    merged only while the older one is no more than twice the size of the
+    newer one (like a binary counter), so there are O(log n) segments on
+    screen and each point is re-uploaded O(log n) times in total.
+    """
+
+    def __init__(self, container, base_item, pen):
+        self.container = container  # PlotWidget or ViewBox the curve lives in
+        self.pen = pen
+        x, y = base_item.getData()
+        x = np.empty(0) if x is None else x
+        y = np.empty(0) if y is None else y
+        self.segments = [[base_item, x, y]]
+
+    def append(self, x, y):
+        if len(x) == 0:
+            return
+        _, last_x, last_y = self.segments[-1]
+        if len(last_x):
+            # Repeat the previous point so the line stays connected
+            x = np.concatenate((last_x[-1:], x))
+            y = np.concatenate((last_y[-1:], y))
+
+        item = pg.PlotCurveItem(x, y, pen=self.pen, connect='all', antialias=True)
+        self.container.addItem(item)
+        self.segments.append([item, x, y])
+
+        while len(self.segments) > 2 and len(self.segments[-2][1]) <= 2 * len(self.segments[-1][1]):
+            newer_item, newer_x, newer_y = self.segments.pop()
+            older = self.segments[-1]
+            older[1] = np.concatenate((older[1], newer_x[1:]))
+            older[2] = np.concatenate((older[2], newer_y[1:]))
+            older[0].setData(older[1], older[2])
+            self.container.removeItem(newer_item)
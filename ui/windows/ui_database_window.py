@@ -1,6 +1,65 @@
-import pandas as pd
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem
-from database.logic_database import get_full_tool_database, get_full_pce_database
+import sqlite3
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTableView, QLabel, QPushButton, QFileDialog
+from database.logic_database import get_database
+from database.tool_store import get_tool_store
+from ui.windows.ui_messagebox_window import MessageBoxWindow
+from utils.path_finder import get_icon_path
+from utils.styles import ACTION_BUTTON
+
+PAGE_SIZE = 200  # Rows fetched from the store each time the view scrolls near the end
+
+
+class ToolStoreModel(QAbstractTableModel):
+    """
+    Read-only table model over one database of the tool store.
+
+    Rows are fetched a page at a time as the view scrolls (Qt's
+    canFetchMore/fetchMore), so opening the window does not copy the whole
+    database into widgets.
+    """
+
+    def __init__(self, store, data_type, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.data_type = data_type
+        self.headers = store.columns(data_type)
+        self.rows = []
+        self.total = store.count(data_type)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.rows[index.row()][index.column() + 1]  # Column 0 is the row id
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        after_id = self.rows[-1][0] if self.rows else 0
+        page = self.store.fetch(self.data_type, after_id, PAGE_SIZE)
+        if not page:
+            self.total = len(self.rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+        self.rows.extend(page)
+        self.endInsertRows()
 
 
 class DatabaseWindow(QWidget):
@@ -14,28 +73,46 @@ class DatabaseWindow(QWidget):
 
         layout = QVBoxLayout(self)
 
-        # ✅ Table Widget
-        self.table = QTableWidget()
+        # ✅ Table View
+        self.table = QTableView()
         layout.addWidget(self.table)
 
+        footer = QHBoxLayout()
+        self.count_label = QLabel()
+        footer.addWidget(self.count_label)
+        footer.addStretch()
+        self.export_btn = QPushButton("Export CSV")
+        self.export_btn.setIcon(QIcon(get_icon_path('export')))
+        self.export_btn.setStyleSheet(ACTION_BUTTON)
+        self.export_btn.clicked.connect(self.export_csv)
+        footer.addWidget(self.export_btn)
+        layout.addLayout(footer)
+
         # ✅ Load Data
         self.load_data()
 
     def load_data(self):
-        """Loads the tool database into the table."""
-        if self.data_type == "Tool":
-            df = get_full_tool_database()
-        elif self.data_type == "PCE":
-            df = get_full_pce_database()
-
-        # df = get_full_tool_database()  # Ensure function returns full dataframe
-        if df.empty:
+        """Attaches the table to the tool store."""
+        get_database(self.data_type)  # Fills the store from the CSV on first use
+        store = get_tool_store()
+        if store is None:
+            self.count_label.setText("Tool database unavailable")
+            self.export_btn.setEnabled(False)
             return
 
-        self.table.setRowCount(df.shape[0])
-        self.table.setColumnCount(df.shape[1])
-        self.table.setHorizontalHeaderLabels(df.columns)
+        self.model = ToolStoreModel(store, self.data_type, self)
+        self.table.setModel(self.model)
+        self.count_label.setText(f"{self.model.total} rows")
 
-        for i, row in df.iterrows():
-            for j, value in enumerate(row):
-                self.table.setItem(i, j, QTableWidgetItem(str(value)))
+    def export_csv(self):
+        """Saves the database in the CSV layout of the bundled database files."""
+        default_name = f"{self.data_type.lower()}_database.csv"
+        csv_path, _ = QFileDialog.getSaveFileName(self, "Export Database", default_name, "CSV Files (*.csv)")
+        if not csv_path:
+            return
+        try:
+            get_tool_store().export_csv(self.data_type, csv_path)
+        except (sqlite3.Error, OSError) as e:
+            MessageBoxWindow.message_simple(self, "Export Failed", f"Could not export the database:\n{e}", "warning")
+            return
+        MessageBoxWindow.message_simple(self, "Export Complete", f"Database exported to:\n{csv_path}", "check_green")
@@ -0,0 +1,141 @@
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton, QListWidget, QListWidgetItem, QComboBox,
+    QLabel, QLineEdit, QDoubleSpinBox, QSpinBox, QApplication
+)
+
+from features.toolstring.builder import Job, MAX_TOOLS, build_tool_strings
+from features.toolstring.connections import get_connection_graph
+from ui.windows.ui_messagebox_window import MessageBoxWindow
+from utils.path_finder import get_icon_path
+from utils.styles import ACTION_BUTTON
+
+ANY_CONNECTION = "(any)"
+RESULT_COUNT = 5
+
+
+class StringBuilderWindow(QWidget):
+    """Suggest tool strings for a job (restriction OD, required tools, weight above jars) and load one into the editor."""
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.WindowType.Window)
+        self.setWindowTitle("Build Tool String")
+        self.setGeometry(200, 200, 900, 520)
+
+        self.editor = editor
+        self.results = []
+        graph = get_connection_graph()
+        self.tool_names = {node.name for node in graph.nodes}
+
+        layout = QVBoxLayout(self)
+
+        # Job
+        form = QFormLayout()
+
+        self.max_od = QDoubleSpinBox()
+        self.max_od.setDecimals(3)
+        self.max_od.setRange(0.5, 10.0)
+        self.max_od.setSingleStep(0.125)
+        self.max_od.setValue(1.875)
+        self.max_od.setSuffix(" in")
+
+        self.required = QLineEdit()
+        self.required.setPlaceholderText("Tools the string must end with, top to bottom, e.g. GS")
+
+        self.weight_above_jars = QDoubleSpinBox()
+        self.weight_above_jars.setDecimals(1)
+        self.weight_above_jars.setRange(0.0, 2000.0)
+        self.weight_above_jars.setSingleStep(10.0)
+        self.weight_above_jars.setValue(60.0)
+        self.weight_above_jars.setSuffix(" lbs")
+        self.weight_above_jars.setToolTip("0 for a string without jars")
+
+        self.bottom_connection = QComboBox()
+        self.bottom_connection.addItem(ANY_CONNECTION)
+        self.bottom_connection.addItems(sorted(graph.by_lower))
+
+        self.max_tools = QSpinBox()
+        self.max_tools.setRange(2, 15)
+        self.max_tools.setValue(MAX_TOOLS)
+
+        form.addRow("Max OD", self.max_od)
+        form.addRow("Required tools", self.required)
+        form.addRow("Weight above jars", self.weight_above_jars)
+        form.addRow("Bottom connection", self.bottom_connection)
+        form.addRow("Max tools", self.max_tools)
+        layout.addLayout(form)
+
+        self.build_btn = QPushButton("Build")
+        self.build_btn.setIcon(QIcon(get_icon_path('search')))
+        self.build_btn.setStyleSheet(ACTION_BUTTON)
+        self.build_btn.clicked.connect(self.build)
+        layout.addWidget(self.build_btn)
+
+        # Results
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        self.result_list = QListWidget()
+        self.result_list.itemDoubleClicked.connect(lambda _: self.load_selected())
+        layout.addWidget(self.result_list, 1)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.load_btn = QPushButton("Load into Editor")
+        self.load_btn.setIcon(QIcon(get_icon_path('load')))
+        self.load_btn.setStyleSheet(ACTION_BUTTON)
+        self.load_btn.clicked.connect(self.load_selected)
+        buttons.addWidget(self.load_btn)
+        layout.addLayout(buttons)
+
+    def job(self):
+        required = [name.strip() for name in self.required.text().split(",") if name.strip()]
+        bottom = self.bottom_connection.currentText()
+        return Job(
+            max_od=self.max_od.value(),
+            required=required,
+            weight_above_jars=self.weight_above_jars.value(),
+            bottom_connection=None if bottom == ANY_CONNECTION else bottom,
+            max_tools=self.max_tools.value(),
+        )
+
+    def build(self):
+        job = self.job()
+        unknown = [name for name in job.required if name not in self.tool_names]
+        if unknown:
+            MessageBoxWindow.message_simple(self, "Build Tool String",
+                                            "Not in the tool database:\n" + "\n".join(unknown), "warning")
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            start = time.perf_counter()
+            self.results, complete = build_tool_strings(job, k=RESULT_COUNT)
+            elapsed = time.perf_counter() - start
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.result_list.clear()
+        for built in self.results:
+            item = QListWidgetItem(built.describe())
+            item.setToolTip(f"Weight above jars: {built.weight_above_jars:.1f} lbs")
+            self.result_list.addItem(item)
+        if self.results:
+            self.result_list.setCurrentRow(0)
+            status = f"{len(self.results)} strings in {elapsed * 1000:.0f} ms, lightest first. "
+            if not complete:
+                status += "The search ran out of time, so results may not be optimal. "
+            self.status_label.setText(status + "Double-click one to load it.")
+        elif complete:
+            self.status_label.setText("No string in the catalog fits this job.")
+        else:
+            self.status_label.setText("The search ran out of time before finding a string for this job.")
+
+    def load_selected(self):
+        row = self.result_list.currentRow()
+        if 0 <= row < len(self.results):
+            self.editor.drop_zone.load_tool_string(self.results[row].to_tool_string())
@@ -0,0 +1,249 @@
+import os
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QIcon
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem, QComboBox, QLabel,
+    QFileDialog, QApplication, QSplitter, QTableWidget, QTableWidgetItem, QHeaderView
+)
+
+from features.survey.comparison import ComparisonSurvey
+from ui.windows.ui_messagebox_window import MessageBoxWindow
+from utils.path_finder import get_icon_path
+from utils.styles import ACTION_BUTTON, DELETE_BUTTON
+
+ALIGN_MODES = ["Elapsed time", "Station depth"]
+RANGE_DEBOUNCE_MS = 150
+
+
+class SurveyComparisonWindow(QWidget):
+    """Overlay several saved surveys of the same well: P/T against elapsed time, or station readings against depth."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowFlag(Qt.WindowType.Window)
+        self.setWindowTitle("Compare Surveys")
+        self.setGeometry(150, 150, 1300, 750)
+
+        self.surveys = []
+        self.curves = []  # (survey, pressure curve, temperature curve) in elapsed-time mode
+
+        # Zooming and panning fire many range changes; redraw once they settle
+        self.range_timer = QTimer(self)
+        self.range_timer.setSingleShot(True)
+        self.range_timer.setInterval(RANGE_DEBOUNCE_MS)
+        self.range_timer.timeout.connect(self.refresh_viewport)
+
+        layout = QHBoxLayout(self)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(splitter)
+
+        # Left: survey list and options
+        controls = QWidget()
+        controls_layout = QVBoxLayout(controls)
+        controls_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.add_btn = QPushButton("Add Surveys")
+        self.add_btn.setIcon(QIcon(get_icon_path('load')))
+        self.add_btn.setStyleSheet(ACTION_BUTTON)
+        self.add_btn.clicked.connect(self.add_surveys)
+
+        self.remove_btn = QPushButton("Remove")
+        self.remove_btn.setIcon(QIcon(get_icon_path('delete')))
+        self.remove_btn.setStyleSheet(DELETE_BUTTON)
+        self.remove_btn.clicked.connect(self.remove_selected)
+
+        self.survey_list = QListWidget()
+        self.survey_list.itemChanged.connect(lambda _: self.redraw())
+
+        self.align_combo = QComboBox()
+        self.align_combo.addItems(ALIGN_MODES)
+        self.align_combo.currentIndexChanged.connect(lambda _: self.redraw())
+
+        self.gauge_combo = QComboBox()
+        self.gauge_combo.addItems(["Top Gauge", "Bottom Gauge"])
+        self.gauge_combo.currentIndexChanged.connect(lambda _: self.redraw())
+
+        controls_layout.addWidget(self.add_btn)
+        controls_layout.addWidget(self.remove_btn)
+        controls_layout.addWidget(self.survey_list, 1)
+        controls_layout.addWidget(QLabel("Align by"))
+        controls_layout.addWidget(self.align_combo)
+        controls_layout.addWidget(QLabel("Gauge"))
+        controls_layout.addWidget(self.gauge_combo)
+
+        # Gradient table (depth mode)
+        self.gradient_table = QTableWidget(0, 3)
+        self.gradient_table.setHorizontalHeaderLabels(["Survey", "Mid TVD (ft)", "psi/ft"])
+        self.gradient_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.gradient_table.verticalHeader().setVisible(False)
+        controls_layout.addWidget(self.gradient_table, 1)
+        splitter.addWidget(controls)
+
+        # Right: plots
+        self.plot_area = pg.GraphicsLayoutWidget()
+        self.plot_area.setBackground('w')
+        splitter.addWidget(self.plot_area)
+        splitter.setSizes([300, 1000])
+
+    # --------------------------------------------------
+    # Survey list
+    # --------------------------------------------------
+    @property
+    def gauge(self):
+        return "top" if self.gauge_combo.currentIndex() == 0 else "bottom"
+
+    def color_for(self, index):
+        color = QColor()
+        color.setHsv(int(360 * index / max(len(self.surveys), 1)) % 360, 220, 200)
+        return color
+
+    def add_surveys(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Add Surveys", "", "Survey Files (*.survey)")
+        if not file_paths:
+            return
+
+        failed = []
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            for file_path in file_paths:
+                if any(survey.file_path == file_path for survey in self.surveys):
+                    continue
+                try:
+                    self.surveys.append(ComparisonSurvey(file_path))
+                except Exception as e:
+                    failed.append(f"{os.path.basename(file_path)}: {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.refresh_list()
+        self.redraw()
+        if failed:
+            MessageBoxWindow.message_simple(self, "Compare Surveys", "Could not open:\n" + "\n".join(failed),
+                                            "warning")
+
+    def remove_selected(self):
+        row = self.survey_list.currentRow()
+        if 0 <= row < len(self.surveys):
+            del self.surveys[row]
+            self.refresh_list()
+            self.redraw()
+
+    def refresh_list(self):
+        self.survey_list.blockSignals(True)
+        self.survey_list.clear()
+        for index, survey in enumerate(self.surveys):
+            item = QListWidgetItem(survey.label)
+            item.setToolTip(survey.file_path)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            item.setForeground(self.color_for(index))
+            self.survey_list.addItem(item)
+        self.survey_list.blockSignals(False)
+
+    def visible_surveys(self):
+        return [
+            (index, survey) for index, survey in enumerate(self.surveys)
+            if self.survey_list.item(index) is not None
+            and self.survey_list.item(index).checkState() == Qt.CheckState.Checked
+        ]
+
+    # --------------------------------------------------
+    # Plots
+    # --------------------------------------------------
+    def redraw(self):
+        self.range_timer.stop()
+        self.plot_area.clear()
+        self.curves = []
+        self.gradient_table.setRowCount(0)
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            if self.align_combo.currentText() == "Station depth":
+                self.draw_depth_plots()
+            else:
+                self.draw_elapsed_plots()
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    def draw_elapsed_plots(self):
+        """Pressure and temperature against hours since each survey's first station"""
+        pressure_plot = self.plot_area.addPlot(row=0, col=0, title="Pressure")
+        temperature_plot = self.plot_area.addPlot(row=1, col=0, title="Temperature")
+        temperature_plot.setXLink(pressure_plot)
+        pressure_plot.setLabel('left', 'Pressure', units='psia')
+        temperature_plot.setLabel('left', 'Temperature', units='°F')
+        temperature_plot.setLabel('bottom', 'Elapsed time (h)')
+        for plot in (pressure_plot, temperature_plot):
+            plot.showGrid(x=True, y=True, alpha=0.3)
+        pressure_plot.addLegend()
+
+        for index, survey in self.visible_surveys():
+            overview = survey.overview(self.gauge)
+            if overview is None:
+                continue
+            hours, pressures, temperatures = overview
+            pen = pg.mkPen(self.color_for(index), width=1.5)
+            pressure_curve = pressure_plot.plot(hours, pressures, pen=pen, name=survey.label, connect='finite')
+            temperature_curve = temperature_plot.plot(hours, temperatures, pen=pen, connect='finite')
+            self.curves.append((survey, pressure_curve, temperature_curve))
+
+        self.elapsed_plot = pressure_plot
+        pressure_plot.sigXRangeChanged.connect(lambda *_: self.range_timer.start())
+
+    def refresh_viewport(self):
+        """Reload each curve for the visible time range only, at screen resolution"""
+        if not self.curves:
+            return
+        start, end = self.elapsed_plot.viewRange()[0]
+        for survey, pressure_curve, temperature_curve in self.curves:
+            data = survey.viewport(self.gauge, start, end)
+            if data is None:
+                data = survey.overview(self.gauge)
+            hours, pressures, temperatures = data
+            pressure_curve.setData(hours, pressures, connect='finite')
+            temperature_curve.setData(hours, temperatures, connect='finite')
+
+    def draw_depth_plots(self):
+        """Station median pressure/temperature and the gradients between stations against depth"""
+        plots = [
+            self.plot_area.addPlot(row=0, col=0, title="Pressure"),
+            self.plot_area.addPlot(row=0, col=1, title="Temperature"),
+            self.plot_area.addPlot(row=0, col=2, title="Gradient"),
+        ]
+        for plot, label, units in zip(plots, ("Pressure", "Temperature", "Gradient"), ("psia", "°F", "psi/ft")):
+            plot.setLabel('bottom', label, units=units)
+            plot.setLabel('left', 'TVD', units='ft')
+            plot.invertY(True)
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            if plot is not plots[0]:
+                plot.setYLink(plots[0])
+        plots[0].addLegend()
+
+        rows = []
+        for index, survey in self.visible_surveys():
+            color = self.color_for(index)
+            pen = pg.mkPen(color, width=1.5)
+            points = survey.station_points(self.gauge)
+            if not points:
+                continue
+            points.sort(key=lambda point: point["depth"])
+            depths = np.array([point["depth"] for point in points])
+            plots[0].plot([point["pressure"] for point in points], depths, pen=pen, symbol='o',
+                          symbolBrush=color, name=survey.label)
+            plots[1].plot([point["temperature"] for point in points], depths, pen=pen, symbol='o',
+                          symbolBrush=color)
+
+            gradients = survey.gradients(self.gauge)
+            if gradients:
+                mids, values = zip(*gradients)
+                plots[2].plot(values, mids, pen=pen, symbol='s', symbolBrush=color)
+            rows.extend((survey.label, mid, value) for mid, value in gradients)
+
+        self.gradient_table.setRowCount(len(rows))
+        for row, (label, mid, value) in enumerate(rows):
+            self.gradient_table.setItem(row, 0, QTableWidgetItem(label))
+            self.gradient_table.setItem(row, 1, QTableWidgetItem(f"{mid:.1f}"))
+            self.gradient_table.setItem(row, 2, QTableWidgetItem(f"{value:.4f}"))
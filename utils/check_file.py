@@ -2,13 +2,20 @@ import os
 
 
 def is_file_open(file_path):
-    """Check if the specific Excel file is open."""
+    """Check if another program (e.g. Excel) has the file open: its Office/LibreOffice lock file, or a write lock."""
+    if not os.path.exists(file_path):
+        return False
+
+    folder, name = os.path.split(os.path.abspath(file_path))
+    for lock_name in (f"~${name}", f".~lock.{name}#"):
+        if os.path.exists(os.path.join(folder, lock_name)):
+            return True
+
     try:
-        import win32com.client
-        excel = win32com.client.Dispatch("Excel.Application")
-        for wb in excel.Workbooks:
-            if os.path.abspath(wb.FullName) == os.path.abspath(file_path):
-                return True  # File is open
-    except Exception as e:
+        with open(file_path, "r+b"):
+            pass
+    except PermissionError:
+        return True  # Windows refuses to open a file Excel has locked
+    except OSError as e:
         print(f"⚠️ Could not check file status: {e}")
-    return False
\ No newline at end of file
+    return False
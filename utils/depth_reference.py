@@ -0,0 +1,217 @@
+# depth_reference.py
+from functools import lru_cache
+
+import numpy as np
+
+LINEAR = "linear"
+MINIMUM_CURVATURE = "minimum_curvature"
+METHODS = (LINEAR, MINIMUM_CURVATURE)
+EXTRAPOLATION = ("raise", "clip", "linear", "nan")  # Policies for depths outside the survey
+SMALL_DOGLEG = 1e-9  # Radians; straighter segments are treated as straight lines
+
+
+def _tangents(inclinations, azimuths):
+    """Unit direction vectors (north, east, down) from inclinations and azimuths in degrees."""
+    inc = np.radians(inclinations)
+    azi = np.radians(azimuths)
+    return np.stack([np.sin(inc) * np.cos(azi), np.sin(inc) * np.sin(azi), np.cos(inc)], axis=-1)
+
+
+def _arc_factors(t1, t2, fraction):
+    """
+    Weights (w1, w2) so that w1 * t1 + w2 * t2 is the displacement, per unit
+    of segment length, after `fraction` of a circular arc from t1 to t2.
+    """
+    dogleg = np.arccos(np.clip(np.sum(t1 * t2, axis=-1), -1.0, 1.0))
+    curved = dogleg > SMALL_DOGLEG
+    safe = np.where(curved, dogleg, 1.0)
+    phi = fraction * safe
+    scale = 1.0 / (safe * np.sin(safe))
+    w1 = np.where(curved, scale * (np.cos(safe - phi) - np.cos(safe)), fraction)
+    w2 = np.where(curved, scale * (1.0 - np.cos(phi)), 0.0)
+    return w1, w2
+
+
+def minimum_curvature(mds, inclinations, azimuths=None):
+    """
+    (north, east, tvd) of every survey station by the minimum-curvature
+    method. The first station is reached in a straight line from surface
+    along its own inclination. Azimuths default to a single plane.
+    """
+    mds = np.asarray(mds, dtype=np.float64)
+    if len(mds) != len(inclinations) or (azimuths is not None and len(azimuths) != len(mds)):
+        raise ValueError("MD and Inclination data must be the same length")
+    if len(mds) == 0:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    tangents = _tangents(np.asarray(inclinations, dtype=np.float64),
+                         np.zeros(len(mds)) if azimuths is None else np.asarray(azimuths, dtype=np.float64))
+    w1, w2 = _arc_factors(tangents[:-1], tangents[1:], 1.0)
+    steps = np.diff(mds)[:, None] * (w1[:, None] * tangents[:-1] + w2[:, None] * tangents[1:])
+    positions = np.vstack([mds[0] * tangents[0], steps]).cumsum(axis=0)
+    return positions[:, 0], positions[:, 1], positions[:, 2]
+
+
+def inclinations_from_tvd(mds, tvds):
+    """Average inclination (degrees) over each interval, reported at its lower station; 0 at the first."""
+    mds = np.asarray(mds, dtype=np.float64)
+    tvds = np.asarray(tvds, dtype=np.float64)
+    if len(mds) == 0:
+        return np.empty(0)
+    delta_md = np.diff(mds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.clip(np.diff(tvds) / delta_md, -1.0, 1.0)
+    angles = np.where(delta_md == 0, 0.0, np.degrees(np.arccos(ratio)))
+    return np.concatenate(([0.0], angles))
+
+
+class DepthReference:
+    """
+    A validated MD (or AHD) to TVD mapping built from survey stations.
+
+    Stations are sorted and checked once; every conversion is then a
+    `searchsorted` over the station depths plus arithmetic on whole arrays.
+    `method` is LINEAR (straight between stations) or MINIMUM_CURVATURE
+    (along the circular arc between stations, which needs inclinations).
+    `extrapolate` says what happens to depths outside the survey: "raise",
+    "clip" to the end stations, "linear" along the end segment or tangent,
+    or "nan".
+    """
+
+    def __init__(self, mds, tvds=None, inclinations=None, azimuths=None, method=LINEAR, extrapolate="raise"):
+        if method not in METHODS:
+            raise ValueError(f"Unknown interpolation method '{method}'")
+        if extrapolate not in EXTRAPOLATION:
+            raise ValueError(f"Unknown extrapolation policy '{extrapolate}'")
+        if tvds is None and inclinations is None:
+            raise ValueError("A depth reference needs TVD or inclination values")
+        if method == MINIMUM_CURVATURE and inclinations is None:
+            raise ValueError("Minimum curvature needs inclination values")
+
+        mds = np.asarray(mds, dtype=np.float64)
+        columns = [np.asarray(values, dtype=np.float64) if values is not None else None
+                   for values in (tvds, inclinations, azimuths)]
+        if any(values is not None and len(values) != len(mds) for values in columns):
+            raise ValueError("Depth reference columns must be the same length")
+        if len(mds) < 2:
+            raise ValueError("At least 2 survey points required")
+
+        valid = np.isfinite(mds)
+        for values in columns:
+            if values is not None:
+                valid &= np.isfinite(values)
+        order = np.argsort(mds[valid], kind="stable")
+        mds = mds[valid][order]
+        tvds, inclinations, azimuths = [values[valid][order] if values is not None else None for values in columns]
+        if len(mds) < 2:
+            raise ValueError("At least 2 survey points required")
+
+        # Repeated stations must agree; keep the first of each
+        repeated = np.diff(mds) == 0
+        if repeated.any():
+            if tvds is not None and np.any(np.diff(tvds)[repeated] != 0):
+                raise ValueError(f"Conflicting TVD values at MD {mds[1:][repeated][0]:g}")
+            keep = np.concatenate(([True], ~repeated))
+            mds = mds[keep]
+            tvds, inclinations, azimuths = [values[keep] if values is not None else None
+                                            for values in (tvds, inclinations, azimuths)]
+            if len(mds) < 2:
+                raise ValueError("At least 2 survey points required")
+
+        if inclinations is not None and azimuths is None:
+            azimuths = np.zeros(len(mds))
+        if tvds is None:
+            tvds = minimum_curvature(mds, inclinations, azimuths)[2]
+
+        self.mds = mds
+        self.tvds = tvds
+        self.inclinations = inclinations
+        self.azimuths = azimuths
+        self.method = method
+        self.extrapolate = extrapolate
+        self._slopes = np.diff(tvds) / np.diff(mds)
+        self._tangents = None
+        if inclinations is not None:
+            # Per-segment arc constants, so a conversion costs two cosines per depth
+            self._tangents = _tangents(inclinations, azimuths)
+            t1, t2 = self._tangents[:-1], self._tangents[1:]
+            dogleg = np.arccos(np.clip(np.sum(t1 * t2, axis=-1), -1.0, 1.0))
+            self._curved = dogleg > SMALL_DOGLEG
+            self._dogleg = np.where(self._curved, dogleg, 1.0)
+            self._arc_scale = np.diff(mds) / (self._dogleg * np.sin(self._dogleg))
+
+    def __len__(self):
+        return len(self.mds)
+
+    @property
+    def md_range(self):
+        return float(self.mds[0]), float(self.mds[-1])
+
+    def _outside(self, values, stations, policy):
+        """Apply the extrapolation policy; returns (values to evaluate, out-of-range mask)."""
+        outside = (values < stations[0]) | (values > stations[-1])
+        if not outside.any():
+            return values, outside
+        if policy == "raise":
+            raise ValueError(f"Depth outside mapping range ({stations[0]:g} – {stations[-1]:g} ft)")
+        if policy == "clip":
+            return np.clip(values, stations[0], stations[-1]), np.zeros_like(outside)
+        return values, outside
+
+    def to_tvd(self, mds):
+        """TVD at one depth or an array of depths (same shape as the input)."""
+        values = np.asarray(mds, dtype=np.float64)
+        flat = np.atleast_1d(values).ravel()
+        flat, outside = self._outside(flat, self.mds, self.extrapolate)
+
+        index = np.clip(np.searchsorted(self.mds, flat, side="right") - 1, 0, len(self.mds) - 2)
+        offset = flat - self.mds[index]
+        if self.method == LINEAR:
+            result = self.tvds[index] + self._slopes[index] * offset
+        else:
+            down = self._tangents[:, 2]
+            dogleg = self._dogleg[index]
+            phi = np.clip(offset / (self.mds[index + 1] - self.mds[index]), 0.0, 1.0) * dogleg
+            arc = self._arc_scale[index] * ((np.cos(dogleg - phi) - np.cos(dogleg)) * down[index]
+                                            + (1.0 - np.cos(phi)) * down[index + 1])
+            result = self.tvds[index] + np.where(self._curved[index], arc, offset * down[index])
+            if outside.any():
+                # Straight on along the end tangents
+                above = flat < self.mds[0]
+                below = flat > self.mds[-1]
+                result[above] = self.tvds[0] + (flat[above] - self.mds[0]) * self._tangents[0, 2]
+                result[below] = self.tvds[-1] + (flat[below] - self.mds[-1]) * self._tangents[-1, 2]
+
+        if self.extrapolate == "nan":
+            result[outside] = np.nan
+        return result.reshape(values.shape) if values.ndim else float(result[0])
+
+    def to_md(self, tvds):
+        """
+        MD at one TVD or an array of TVDs, interpolated linearly between
+        stations. Only defined while TVD keeps increasing with MD.
+        """
+        if np.any(np.diff(self.tvds) <= 0):
+            raise ValueError("TVD does not increase along the well; MD is not unique")
+        values = np.asarray(tvds, dtype=np.float64)
+        flat = np.atleast_1d(values).ravel()
+        flat, outside = self._outside(flat, self.tvds, self.extrapolate)
+
+        index = np.clip(np.searchsorted(self.tvds, flat, side="right") - 1, 0, len(self.tvds) - 2)
+        result = self.mds[index] + (flat - self.tvds[index]) / self._slopes[index]
+        if self.extrapolate == "nan":
+            result[outside] = np.nan
+        return result.reshape(values.shape) if values.ndim else float(result[0])
+
+
+@lru_cache(maxsize=32)
+def _cached_reference(mds, tvds, extrapolate):
+    return DepthReference(mds, tvds, extrapolate=extrapolate)
+
+
+def get_depth_reference(mds, tvds, extrapolate="raise"):
+    """
+    Linear MD/TVD reference for a station table, built and validated once
+    per distinct table and reused by later calls.
+    """
+    return _cached_reference(tuple(float(v) for v in mds), tuple(float(v) for v in tvds), extrapolate)
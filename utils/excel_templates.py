@@ -0,0 +1,122 @@
+# excel_templates.py
+import os
+import pickle
+import threading
+
+import openpyxl
+from openpyxl.cell.cell import MergedCell
+
+from utils.path_finder import get_resource_path
+
+
+def _prune_blank_cells(sheet):
+    """
+    Drop cells that have neither a value nor a style. Templates saved by
+    Excel carry tens of thousands of them; they render exactly like missing
+    cells but make every row operation and save walk over them.
+    """
+    blank = [key for key, cell in sheet._cells.items()
+             if cell.value is None and not cell.has_style and not isinstance(cell, MergedCell)]
+    for key in blank:
+        del sheet._cells[key]
+
+
+class TemplateService:
+    """
+    Bundled Excel templates, parsed once per session.
+
+    The parsed workbook is kept as a pickled snapshot; `open()` returns a
+    fresh in-memory copy of it, which is several times cheaper than
+    reading the .xlsx again. A template is re-read if its file changes.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+
+    def _snapshot(self, path):
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._snapshots.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            wb = openpyxl.load_workbook(path)
+            for sheet in wb.worksheets:
+                _prune_blank_cells(sheet)
+            snapshot = pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+            self._snapshots[path] = (mtime, snapshot)
+            return snapshot
+
+    def open(self, name):
+        """Editable copy of a template (a file name in assets/resources, or a full path)."""
+        path = name if os.path.isabs(name) else get_resource_path(name)
+        return pickle.loads(self._snapshot(path))
+
+    def preload(self, *names):
+        """Parse templates ahead of time (e.g. while the user is still entering data)."""
+        for name in names:
+            self._snapshot(name if os.path.isabs(name) else get_resource_path(name))
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+
+_service = None
+
+
+def get_template_service():
+    """The session-wide template service."""
+    global _service
+    if _service is None:
+        _service = TemplateService()
+    return _service
+
+
+def write_block(sheet, first_row, first_col, rows):
+    """
+    Write a 2-D block of values with its top-left corner at (first_row,
+    first_col). None leaves the template's cell as it is.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    width = max(len(row) for row in rows)
+    target = sheet.iter_rows(min_row=first_row, max_row=first_row + len(rows) - 1,
+                             min_col=first_col, max_col=first_col + width - 1)
+    for values, cells in zip(rows, target):
+        for value, cell in zip(values, cells):
+            if value is not None:
+                cell.value = value
+
+
+def clear_block(sheet, min_row, max_row, min_col, max_col, reset_style=False):
+    """
+    Clear values (and optionally formatting) in a range. Only cells that
+    exist are touched, so clearing to the bottom of a sheet costs nothing
+    for the empty part. Merged-cell placeholders are left alone.
+    """
+    for (row, col) in [key for key in sheet._cells
+                       if min_row <= key[0] <= max_row and min_col <= key[1] <= max_col]:
+        cell = sheet._cells[(row, col)]
+        if isinstance(cell, MergedCell):
+            continue
+        cell.value = None
+        if reset_style:
+            cell.style = 'Normal'
+
+
+def stream_workbook(path, sheets):
+    """
+    Write plain tables with openpyxl's write-only (streaming) mode:
+    `sheets` maps sheet titles to iterables of rows. Memory stays flat
+    however many rows are written.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    for title, rows in sheets.items():
+        sheet = wb.create_sheet(title)
+        for row in rows:
+            sheet.append(list(row))
+    wb.save(path)
+    return path
@@ -0,0 +1,115 @@
+# image_cache.py
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+from utils.path_finder import get_pce_image_path, get_tool_image_path
+
+MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes of decoded images kept in memory
+IMAGE_PATHS = {"Tool": get_tool_image_path, "PCE": get_pce_image_path}
+
+
+class ImageCache:
+    """
+    Decoded tool images shared by the whole process, keyed by
+    (database, tool name, width); a width of None keeps the file's size.
+
+    Images are held as QImage so they can be decoded and scaled off the GUI
+    thread; an entry's QPixmap is made the first time the GUI asks for it
+    and kept alongside. Least recently used entries are dropped once the
+    decoded size passes the memory budget.
+    """
+
+    def __init__(self, budget=MEMORY_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.entries = OrderedDict()  # key -> [QImage, QPixmap or None, bytes]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    @staticmethod
+    def _load(data_type, tool_name, width):
+        image = QImage(IMAGE_PATHS[data_type](tool_name))
+        if width and not image.isNull() and image.width() != width:
+            image = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+        return image
+
+    def _entry(self, data_type, tool_name, width):
+        key = (data_type, tool_name, width)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+
+        image = self._load(data_type, tool_name, width)  # Decoded outside the lock
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = [image, None, image.sizeInBytes()]
+                self.entries[key] = entry
+                self.used += entry[2]
+                self._evict()
+            return entry
+
+    def _evict(self):
+        while self.used > self.budget and len(self.entries) > 1:
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.used -= size
+
+    def image(self, data_type, tool_name, width=None):
+        """Tool image as a QImage (safe from any thread)."""
+        return self._entry(data_type, tool_name, width)[0]
+
+    def pixmap(self, data_type, tool_name, width=None):
+        """Tool image as a QPixmap (GUI thread only)."""
+        key = (data_type, tool_name, width)
+        entry = self._entry(data_type, tool_name, width)
+        if entry[1] is None:
+            entry[1] = QPixmap.fromImage(entry[0])
+            with self._lock:
+                if self.entries.get(key) is entry:
+                    self.used += entry[2]  # The pixmap holds its own copy of the pixels
+                    entry[2] *= 2
+                    self._evict()
+        return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.used = 0
+
+
+_image_cache = ImageCache()
+_prefetch_thread = None
+
+
+def get_image_cache():
+    return _image_cache
+
+
+def prefetch_tool_images():
+    """Decode every catalog tool's image in a background thread so widgets never wait on the disk."""
+    global _prefetch_thread
+    if _prefetch_thread is not None:
+        return
+
+    def prefetch():
+        from database.logic_database import get_catalog
+        try:
+            catalog = get_catalog()
+            for data_type, listing in (("Tool", catalog.tool_listing), ("PCE", catalog.pce_listing)):
+                for tool_name in listing["Tool Name"].unique():
+                    _image_cache.image(data_type, tool_name)
+        except Exception as e:
+            print(f"⚠️ Tool image prefetch failed: {e}")
+
+    _prefetch_thread = threading.Thread(target=prefetch, name="tool-image-prefetch", daemon=True)
+    _prefetch_thread.start()
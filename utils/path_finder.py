@@ -1,5 +1,6 @@
 import os
 import sys
+from functools import lru_cache
 
 def get_path(relative_path):
     """Get absolute path to resource, working for development and PyInstaller."""
@@ -19,29 +20,38 @@ def get_icon_path(name):
 def get_resource_path(name):
     return get_path(os.path.join("assets", "resources", name))
 
-def get_tool_image_path(name):
+@lru_cache(maxsize=None)
+def _image_files(folder):
+    """{lowercased file name: file name} of an assets image folder, listed once per run."""
+    try:
+        return {file_name.lower(): file_name for file_name in os.listdir(get_path(os.path.join("assets", folder)))}
+    except OSError:
+        return {}
 
+def _image_path(folder, name):
     if "X-Over" in name:
         name = "X-Over"  # Normalize X-Over naming
     name = name.replace('"','').replace("'","")
-    image_path = get_path(os.path.join("assets", "images", f"{name}.png"))
+    file_name = _image_files(folder).get(f"{name}.png".lower())
 
-    if os.path.exists(image_path):
-        return image_path
+    if file_name:
+        return get_path(os.path.join("assets", folder, file_name))
     else:
         return get_path(os.path.join("assets", "images", "Dummy Image.png"))
 
+def get_tool_image_path(name):
+    return _image_path("images", name)
+
 def get_pce_image_path(name):
 
     try:
-        if "X-Over" in name:
-            name = "X-Over"  # Normalize X-Over naming
-        name = name.replace('"','').replace("'","")
-        image_path = get_path(os.path.join("assets", "pce_images", f"{name}.png"))
-
-        if os.path.exists(image_path):
-            return image_path
-        else:
-            return get_path(os.path.join("assets", "images", "Dummy Image.png"))
+        return _image_path("pce_images", name)
     except Exception as e:
         print(e)
+
+def get_cache_dir(name):
+    """Per-user writable cache folder, created on first use."""
+    base_path = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_path = os.path.join(base_path, "DeleumToolStringEditor", name)
+    os.makedirs(cache_path, exist_ok=True)
+    return cache_path
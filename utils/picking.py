@@ -0,0 +1,176 @@
+# picking.py
+import numpy as np
+
+LEAF_SIZE = 128  # Points per leaf of a PointPicker tree
+
+
+class AxisPicker:
+    """
+    Nearest sample along one axis (time, depth) by binary search.
+
+    Values are sorted once when the picker is built (free when they already
+    are); each lookup is then a `searchsorted`, O(log n) however long the
+    series. Lookups return indices into the original, unsorted array.
+    NaN samples are never picked.
+    """
+
+    def __init__(self, values, assume_sorted=False):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        finite = np.isfinite(values)
+        self._index = None
+        self._buffer = None  # Spare capacity for extend()
+        if not finite.all():
+            self._index = np.flatnonzero(finite)
+            values = values[finite]
+        if not assume_sorted and len(values) > 1 and np.any(values[1:] < values[:-1]):
+            order = np.argsort(values, kind="stable")
+            values = values[order]
+            self._index = order if self._index is None else self._index[order]
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def extend(self, values):
+        """
+        Append samples that carry on past the end of the axis, in place
+        (amortised O(len(values)): the storage grows geometrically).
+
+        Only possible while the picker holds every sample in its original
+        order and the new ones are finite and in order; returns False
+        otherwise, and the picker should be rebuilt.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return True
+        if self._index is not None or not np.isfinite(values).all() or np.any(values[1:] < values[:-1]) \
+                or (len(self.values) and values[0] < self.values[-1]):
+            return False
+        count = len(self.values)
+        needed = count + len(values)
+        if self._buffer is None or needed > len(self._buffer):
+            buffer = np.empty(max(needed, 2 * count), dtype=np.float64)
+            buffer[:count] = self.values
+            self._buffer = buffer
+        self._buffer[count:needed] = values
+        self.values = self._buffer[:needed]
+        return True
+
+    def _original(self, positions):
+        return positions if self._index is None else self._index[positions]
+
+    def nearest_many(self, targets):
+        """Index of the nearest sample for every target (an int array, same shape as `targets`)."""
+        targets = np.asarray(targets, dtype=np.float64)
+        if len(self.values) == 0:
+            raise ValueError("Nothing to pick from")
+        right = np.minimum(np.searchsorted(self.values, targets), len(self.values) - 1)
+        left = np.maximum(right - 1, 0)
+        closer_left = np.abs(targets - self.values[left]) <= np.abs(self.values[right] - targets)
+        return self._original(np.where(closer_left, left, right))
+
+    def nearest(self, target, max_distance=None):
+        """Index of the sample nearest to `target`, or None if there is none within `max_distance`."""
+        if len(self.values) == 0 or not np.isfinite(target):
+            return None
+        position = int(np.searchsorted(self.values, target))
+        candidates = [p for p in (position - 1, position) if 0 <= p < len(self.values)]
+        best = min(candidates, key=lambda p: abs(self.values[p] - target))
+        if max_distance is not None and abs(self.values[best] - target) > max_distance:
+            return None
+        return int(self._original(best))
+
+    def between(self, low, high):
+        """Indices of the samples with low <= value <= high, in axis order."""
+        start = np.searchsorted(self.values, low, side="left")
+        stop = np.searchsorted(self.values, high, side="right")
+        return self._original(np.arange(start, stop))
+
+
+class PointPicker:
+    """
+    Nearest point of a 2-D scatter, through a k-d tree.
+
+    The points are split at the median of their wider axis, over and over,
+    until each leaf holds a few dozen; every node keeps the bounding box of
+    its points. A lookup walks the nearer branch first and skips any box
+    that is further away than the best point found so far, so it reads a
+    handful of leaves whatever the shape of the data (a cloud, a single
+    well path). `scale` stretches each axis before distances are measured,
+    for axes in different units.
+    """
+
+    def __init__(self, x, y, scale=(1.0, 1.0)):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if len(x) != len(y):
+            raise ValueError("x and y must be the same length")
+        self.scale = (float(scale[0]), float(scale[1]))
+        self._index = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        self.x = x[self._index] * self.scale[0]
+        self.y = y[self._index] * self.scale[1]
+
+        # Nodes in build order: (start, stop) into the reordered points, child ids, bounding box
+        self._ranges, self._children, self._boxes = [], [], []
+        pending = [(0, len(self.x), None, None)] if len(self.x) else []
+        while pending:
+            start, stop, parent, side = pending.pop()
+            node = len(self._ranges)
+            if parent is not None:
+                self._children[parent][side] = node
+            xs, ys = self.x[start:stop], self.y[start:stop]
+            box = (float(xs.min()), float(xs.max()), float(ys.min()), float(ys.max()))
+            self._ranges.append((start, stop))
+            self._boxes.append(box)
+            self._children.append([None, None])
+            if stop - start <= LEAF_SIZE:
+                continue
+            middle = (stop - start) // 2
+            order = np.argpartition(xs if box[1] - box[0] >= box[3] - box[2] else ys, middle)
+            self.x[start:stop], self.y[start:stop] = xs[order], ys[order]
+            self._index[start:stop] = self._index[start:stop][order]
+            pending.append((start, start + middle, node, 0))
+            pending.append((start + middle, stop, node, 1))
+
+    def __len__(self):
+        return len(self.x)
+
+    def _box_distance(self, node, x, y):
+        """Squared distance from (x, y) to the bounding box of a node (0 inside it)."""
+        x_low, x_high, y_low, y_high = self._boxes[node]
+        dx = x_low - x if x < x_low else (x - x_high if x > x_high else 0.0)
+        dy = y_low - y if y < y_low else (y - y_high if y > y_high else 0.0)
+        return dx * dx + dy * dy
+
+    def nearest(self, x, y, max_distance=None):
+        """
+        Index of the point nearest to (x, y), or None if there is none
+        within `max_distance` (measured after scaling).
+        """
+        if len(self.x) == 0 or not (np.isfinite(x) and np.isfinite(y)):
+            return None
+        x, y = float(x) * self.scale[0], float(y) * self.scale[1]
+
+        best = None
+        best_distance = np.inf if max_distance is None else float(max_distance) ** 2
+        pending = [(0.0, 0)]
+        while pending:
+            reach, node = pending.pop()
+            if reach > best_distance:
+                continue
+            left, right = self._children[node]
+            if left is None:
+                start, stop = self._ranges[node]
+                distances = (self.x[start:stop] - x) ** 2 + (self.y[start:stop] - y) ** 2
+                position = int(np.argmin(distances))
+                if distances[position] <= best_distance:
+                    best, best_distance = start + position, float(distances[position])
+                continue
+            # Push the far child first so the near one is searched first
+            near, far = (left, self._box_distance(left, x, y)), (right, self._box_distance(right, x, y))
+            if far[1] < near[1]:
+                near, far = far, near
+            pending.append((far[1], far[0]))
+            pending.append((near[1], near[0]))
+
+        return None if best is None else int(self._index[best])
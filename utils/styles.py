@@ -357,6 +357,14 @@ COMBO_STYLE_BLACK = f"""
             }}
             """
 
+# Lower connection that does not make up with the tool below
+COMBO_STYLE_MISMATCH = COMBO_STYLE_BLACK + """
+            QComboBox {
+                border: 1px solid #d9534f;
+                color: #d9534f;
+            }
+            """
+
 SIDEBAR_STYLE = """
             #sidebar {
                 background-color: #1e1e2f;